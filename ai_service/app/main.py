@@ -1,12 +1,27 @@
+import os
+import time
 import joblib
 import pandas as pd
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from contextlib import asynccontextmanager
+from prometheus_client import CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess, CONTENT_TYPE_LATEST
 from .schemas import RiskPredictionInput, RiskPredictionOutput
 
 # Global variable to hold the loaded model
 ml_model = None
 
+# --- Prometheus Metrics ---
+HTTP_REQUEST_LATENCY = Histogram(
+    "ai_http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route", "status"])
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "ai_http_requests_in_progress", "HTTP requests currently being served.", ["method"],
+    multiprocess_mode="livesum")
+MODEL_INFERENCE_LATENCY = Histogram(
+    "ai_model_inference_duration_seconds", "Time spent in model.predict_proba.", ["model"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+MODEL_LOADED = Gauge("ai_model_loaded", "Whether the ML model is loaded (1) or not (0) in every worker.", ["model"],
+                     multiprocess_mode="livemin")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,9 +33,11 @@ async def lifespan(app: FastAPI):
     except FileNotFoundError:
         print("Error: Model file not found. Make sure you've run create_mock_model.py")
         ml_model = None
+    MODEL_LOADED.labels(model="cardiovascular_risk").set(1 if ml_model is not None else 0)
     yield
     # Clean up resources if needed during shutdown
     ml_model = None
+    MODEL_LOADED.labels(model="cardiovascular_risk").set(0)
     print("ML model unloaded.")
 
 
@@ -32,6 +49,32 @@ app = FastAPI(
 )
 
 
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    HTTP_REQUESTS_IN_PROGRESS.labels(method=request.method).inc()
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=request.method).dec()
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_LATENCY.labels(method=request.method, route=route, status=str(status_code)).observe(
+            time.perf_counter() - start_time)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint. Aggregates every gunicorn worker when PROMETHEUS_MULTIPROC_DIR is set."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/", tags=["Health Check"])
 async def read_root():
     return {"status": "AI Inference Service is running."}
@@ -55,7 +98,8 @@ async def predict_risk(input_data: RiskPredictionInput):
         # 2. Make a prediction
         # model.predict_proba returns probabilities for each class [class_0, class_1]
         # We want the probability of the positive class (risk event).
-        prediction_proba = ml_model.predict_proba(input_df)[0][1]
+        with MODEL_INFERENCE_LATENCY.labels(model="cardiovascular_risk").time():
+            prediction_proba = ml_model.predict_proba(input_df)[0][1]
 
         # 3. Post-process the output
         risk_probability = float(prediction_proba)
@@ -0,0 +1,24 @@
+"""
+Gunicorn server hooks.
+
+Each worker keeps its own Prometheus samples. When PROMETHEUS_MULTIPROC_DIR is set, workers write them to
+files in that directory and /metrics merges them; these hooks keep the directory in step with the workers.
+"""
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+
+def on_starting(server):
+    """Starts each boot with an empty metrics directory, so samples from a previous run are not reported."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drops the live gauge samples of a worker that has exited."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+# --- Add the project root to the Python path ---
+# This allows us to import from `main` to access models and schemas
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from main import (
+    Appointment, AppointmentForPatient, AppointmentStatus, Patient, PatientInfoForPhysician, Physician,
+    PhysicianPublicProfile, User, UserRole, FastJSONResponse, construct_from_orm, physician_public_profile,
+    serialize_orm
+)
+
+
+# --- Sample Data ---
+# Transient ORM objects with their relationships populated, as the endpoints see them after joinedload.
+def make_physician(i: int) -> Physician:
+    physician = Physician(
+        id=str(uuid.uuid4()), user_id=str(uuid.uuid4()), first_name="Ada", last_name=f"Okafor{i}",
+        specialty="Cardiology", medical_license_number=f"LIC-{i:06d}", is_verified=True,
+        address="12 Marina Road, Lagos", latitude=6.45, longitude=3.39,
+        availability_schedule=json.dumps({"monday": ["09:00", "10:00", "11:00"], "friday": ["14:00", "15:00"]})
+    )
+    physician.user = User(id=physician.user_id, email=f"doctor{i}@example.com", role=UserRole.PHYSICIAN)
+    return physician
+
+
+def make_appointments(count: int) -> List[Appointment]:
+    start = datetime(2026, 1, 1, 9)
+    appointments = []
+    for i in range(count):
+        appointment = Appointment(
+            id=str(uuid.uuid4()), appointment_time=start + timedelta(hours=i), duration_minutes=30,
+            status=AppointmentStatus.COMPLETED, consultation_notes="Follow up in two weeks.",
+            telemedicine_link=f"https://meet.example.com/{i}"
+        )
+        appointment.physician = make_physician(i)
+        appointments.append(appointment)
+    return appointments
+
+
+def make_patients(count: int) -> List[Patient]:
+    patients = []
+    for i in range(count):
+        patient = Patient(
+            id=str(uuid.uuid4()), user_id=str(uuid.uuid4()), first_name="Chidi", last_name=f"Eze{i}",
+            date_of_birth=datetime(1985, 5, 17), gender="male", blood_group="O+", address="Abuja",
+            allergies="penicillin", past_illnesses="hypertension", current_medications="lisinopril"
+        )
+        patient.user = User(id=patient.user_id, email=f"patient{i}@example.com", phone_number="+2348000000000",
+                            role=UserRole.PATIENT)
+        patients.append(patient)
+    return patients
+
+
+# --- Serialization Paths ---
+def fastapi_default_render(schema, response) -> bytes:
+    """What FastAPI does with a returned list of models: validate against response_model, dump, json.dumps."""
+    adapter = TypeAdapter(schema)
+    content = adapter.dump_python(adapter.validate_python(response), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def before_appointments(appointments):
+    response = []
+    for appt in appointments:
+        physician_profile = PhysicianPublicProfile(
+            **{**appt.physician.__dict__, "availability_schedule": json.loads(appt.physician.availability_schedule)},
+            email=appt.physician.user.email
+        )
+        # `physician` is in __dict__ once the relationship is loaded, so it has to be dropped first
+        fields = {key: value for key, value in appt.__dict__.items() if key != "physician"}
+        response.append(AppointmentForPatient(**fields, physician=physician_profile))
+    return fastapi_default_render(List[AppointmentForPatient], response)
+
+
+def after_appointments(appointments):
+    response = [construct_from_orm(AppointmentForPatient, appt, physician=physician_public_profile(appt.physician))
+                for appt in appointments]
+    return serialize_orm(List[AppointmentForPatient], response, validated=True)
+
+
+def before_patients(patients):
+    response = [PatientInfoForPhysician(**patient.__dict__, email=patient.user.email,
+                                        phone_number=patient.user.phone_number) for patient in patients]
+    return fastapi_default_render(List[PatientInfoForPhysician], response)
+
+
+def after_patients(patients):
+    response = [construct_from_orm(PatientInfoForPhysician, patient) for patient in patients]
+    return serialize_orm(List[PatientInfoForPhysician], response, validated=True)
+
+
+def before_geo(physicians):
+    response = []
+    for physician in physicians:
+        fields = {**physician.__dict__, "availability_schedule": json.loads(physician.availability_schedule)}
+        response.append(PhysicianPublicProfile(**fields, email=physician.user.email, distance_km=1.5))
+    return fastapi_default_render(List[PhysicianPublicProfile], response)
+
+
+def after_geo(physicians):
+    response = [physician_public_profile(physician, distance_km=1.5) for physician in physicians]
+    return serialize_orm(List[PhysicianPublicProfile], response, validated=True)
+
+
+def measure(func, data, repeat: int) -> float:
+    """Best-of-`repeat` wall time in milliseconds."""
+    func(data)  # Warm up schema caches
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serialization time per 1k items, before and after the fast path.")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    appointments = make_appointments(args.items)
+    patients = make_patients(args.items)
+    physicians = [appointment.physician for appointment in appointments]
+    dict_payload = [{"id": i, "title": f"Tip {i}", "tags": ["a", "b"], "score": i / 3} for i in range(args.items)]
+
+    cases = [
+        ("get_patient_appointments", before_appointments, after_appointments, appointments),
+        ("get_my_patients", before_patients, after_patients, patients),
+        ("search_physicians_geospatial", before_geo, after_geo, physicians),
+        ("dict payload render (json vs orjson)",
+         lambda data: json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(),
+         lambda data: FastJSONResponse(data).body, dict_payload),
+    ]
+
+    scale = 1000 / args.items
+    print(f"Serialization time per 1k items ({args.items} items, best of {args.repeat}):")
+    print(f"  {'endpoint':<40}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, before, after, data in cases:
+        assert json.loads(before(data)) == json.loads(after(data)), f"{name}: outputs differ"
+        before_ms = measure(before, data, args.repeat) * scale
+        after_ms = measure(after, data, args.repeat) * scale
+        print(f"  {name:<40}{before_ms:>12.2f}{after_ms:>12.2f}{before_ms / after_ms:>9.1f}x")
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# --- Add the project root to the Python path ---
+# This allows us to import from `main` to access the storage backends
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from main import InMemoryUploadFile, LocalStorageManager
+
+
+# --- Upload ---
+async def upload_all(storage: LocalStorageManager, payloads) -> list:
+    """Uploads every payload concurrently, as parallel document uploads would."""
+    uploads = [
+        storage.upload_file(InMemoryUploadFile(io.BytesIO(payload), f"bench_{i}.bin", "application/octet-stream"),
+                            user_id="bench", document_type="benchmark")
+        for i, payload in enumerate(payloads)
+    ]
+    return await asyncio.gather(*uploads)
+
+
+# --- Download ---
+def read_copied(storage: LocalStorageManager, path: str) -> str:
+    with open(storage.resolve_path(path), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_mapped(storage: LocalStorageManager, path: str) -> str:
+    contents = storage.read_file(path)
+    try:
+        return hashlib.sha256(contents).hexdigest()
+    finally:
+        if hasattr(contents, "close"):
+            contents.close()
+
+
+def measure(func, storage, paths, repeat: int) -> float:
+    """Best-of-`repeat` wall time in seconds for reading every path once."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for path in paths:
+            func(storage, path)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload and download throughput of the local storage backend.")
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--size-mb", type=float, default=8.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--root", help="Storage directory (defaults to a temporary directory)")
+    args = parser.parse_args()
+
+    root = args.root or tempfile.mkdtemp(prefix="dortmed_storage_bench_")
+    storage = LocalStorageManager(root=root, base_url="http://localhost:8000")
+    size = int(args.size_mb * 1024 * 1024)
+    payloads = [os.urandom(size) for _ in range(args.files)]
+    total_mb = args.files * size / (1024 * 1024)
+
+    try:
+        started = time.perf_counter()
+        results = asyncio.run(upload_all(storage, payloads))
+        upload_seconds = time.perf_counter() - started
+        paths = [result["file_path"] for result in results]
+        for result, payload in zip(results, payloads):
+            assert result["sha256"] == hashlib.sha256(payload).hexdigest(), "upload checksum mismatch"
+            assert read_mapped(storage, result["file_path"]) == result["sha256"], "mapped read mismatch"
+
+        copied_seconds = measure(read_copied, storage, paths, args.repeat)
+        mapped_seconds = measure(read_mapped, storage, paths, args.repeat)
+
+        print(f"Local storage throughput ({args.files} files x {args.size_mb:g} MB, reads best of {args.repeat}):")
+        print(f"  {'operation':<34}{'seconds':>10}{'MB/s':>10}")
+        for name, seconds in (("upload (chunked, worker threads)", upload_seconds),
+                              ("read + sha256, copied into heap", copied_seconds),
+                              ("read + sha256, memory-mapped", mapped_seconds)):
+            print(f"  {name:<34}{seconds:>10.3f}{total_mb / seconds:>10.1f}")
+    finally:
+        if not args.root:
+            shutil.rmtree(root, ignore_errors=True)
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, and_, or_
+from sqlalchemy.orm import sessionmaker
+
+# --- Add the project root to the Python path ---
+# This allows us to import from `main` to access models and services
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from main import (
+    AppSettings, BillingRun, DocumentType, InMemoryUploadFile, MedicalDocument, Patient, Payment,
+    StorageManager, Subscription, SUBSCRIPTION_PLANS, User, create_storage_manager, invoice_pdf_context,
+    pdf_renderer, statement_pdf_context, track_queries
+)
+
+# Load settings to get the database URL
+settings = AppSettings()
+
+# --- Standalone Database Connection for Billing Runs ---
+engine = create_engine(settings.DATABASE_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# --- Chunk Loaders ---
+def load_invoice_chunk(db, run: BillingRun, chunk_size: int):
+    """Next batch of completed payments after the run's (payment_date, id) cursor, with billing details."""
+    query = (
+        db.query(Payment, User.email, Patient.id, Subscription.plan)
+        .join(User, User.id == Payment.user_id)
+        .outerjoin(Patient, Patient.user_id == Payment.user_id)
+        .outerjoin(Subscription, Subscription.id == Payment.subscription_id)
+        .filter(Payment.status == "completed",
+                Payment.payment_date >= run.period_start, Payment.payment_date < run.period_end)
+    )
+    if run.cursor_id:
+        query = query.filter(or_(
+            Payment.payment_date > run.cursor_date,
+            and_(Payment.payment_date == run.cursor_date, Payment.id > run.cursor_id)
+        ))
+    return query.order_by(Payment.payment_date, Payment.id).limit(chunk_size).all()
+
+
+def load_statement_chunk(db, run: BillingRun, chunk_size: int):
+    """Next batch of users with completed payments in the period, each with their payments."""
+    in_period = and_(Payment.status == "completed",
+                     Payment.payment_date >= run.period_start, Payment.payment_date < run.period_end)
+    query = (
+        db.query(User.id, User.email, Patient.id)
+        .join(Payment, Payment.user_id == User.id)
+        .outerjoin(Patient, Patient.user_id == User.id)
+        .filter(in_period)
+    )
+    if run.cursor_id:
+        query = query.filter(User.id > run.cursor_id)
+    users = query.group_by(User.id, User.email, Patient.id).order_by(User.id).limit(chunk_size).all()
+    if not users:
+        return []
+
+    payments_by_user = {user_id: [] for user_id, _, _ in users}
+    payments = (
+        db.query(Payment)
+        .filter(in_period, Payment.user_id.in_(list(payments_by_user)))
+        .order_by(Payment.user_id, Payment.payment_date, Payment.id)
+        .all()
+    )
+    for payment in payments:
+        payments_by_user[payment.user_id].append(payment)
+    return [(user_id, email, patient_id, payments_by_user[user_id]) for user_id, email, patient_id in users]
+
+
+# --- Job Builders ---
+def build_invoice_jobs(rows):
+    """Returns (render jobs, skipped count, new cursor) for a chunk of invoice rows."""
+    jobs, skipped = [], 0
+    for payment, email, patient_id, plan in rows:
+        if not patient_id:
+            skipped += 1  # Documents are attached to patient records
+            continue
+        plan_name = SUBSCRIPTION_PLANS[plan].name if plan in SUBSCRIPTION_PLANS else "Subscription"
+        jobs.append({
+            "user_id": payment.user_id,
+            "patient_id": patient_id,
+            "context": invoice_pdf_context(payment, email, plan_name),
+            "file_name": f"Invoice_{payment.id[:8]}_{payment.user_id[:4]}.pdf",
+            "description": f"Invoice for {plan_name} Subscription",
+        })
+    last_payment = rows[-1][0]
+    return jobs, skipped, (last_payment.payment_date, last_payment.id)
+
+
+def build_statement_jobs(rows, run: BillingRun):
+    period = f"{run.period_start:%Y-%m-%d} to {run.period_end - timedelta(days=1):%Y-%m-%d}"
+    jobs, skipped = [], 0
+    for user_id, email, patient_id, payments in rows:
+        if not patient_id:
+            skipped += 1
+            continue
+        jobs.append({
+            "user_id": user_id,
+            "patient_id": patient_id,
+            "context": statement_pdf_context(email, period, payments),
+            "file_name": f"Statement_{run.period_start:%Y%m}_{user_id[:4]}.pdf",
+            "description": f"Account statement for {period}",
+        })
+    return jobs, skipped, (None, rows[-1][0])
+
+
+async def render_and_store(storage: StorageManager, kind: str, job: dict) -> dict:
+    renderer = "invoice" if kind == "invoices" else "statement"
+    pdf_bytes = await pdf_renderer.render(renderer, job["context"])
+    upload_result = await storage.upload_file(
+        file=InMemoryUploadFile(io.BytesIO(pdf_bytes), job["file_name"]),
+        user_id=job["user_id"],
+        document_type=renderer
+    )
+    return {
+        "id": str(uuid.uuid4()),
+        "patient_id": job["patient_id"],
+        "document_type": DocumentType.OTHER,
+        "file_name": job["file_name"],
+        "file_path": upload_result["file_path"],
+        "file_url": "",
+        "upload_date": datetime.utcnow(),
+        "description": job["description"],
+    }
+
+
+# --- The Core Job Function ---
+async def run_billing(kind: str, period_start: datetime, period_end: datetime, storage: StorageManager,
+                      run_id: str = None, chunk_size: int = None) -> BillingRun:
+    """
+    Generates invoices (one per completed payment) or statements (one per paying user) for a period.
+    Rows are streamed in keyset-ordered chunks; each chunk is rendered in parallel on the PDF pool,
+    uploaded, and its MedicalDocument rows inserted in one batch together with the run's checkpoint.
+    Passing `run_id` resumes an interrupted run from its last committed chunk.
+    """
+    chunk_size = chunk_size or settings.BILLING_CHUNK_SIZE
+    db = SessionLocal()
+    run = None
+    try:
+        if run_id:
+            run = db.query(BillingRun).filter(BillingRun.id == run_id).first()
+            if not run:
+                raise ValueError(f"Billing run {run_id} not found.")
+            if run.status == "completed":
+                print(f"Billing run {run.id} already completed.")
+                return run
+            run.status = "running"
+        else:
+            run = BillingRun(kind=kind, period_start=period_start, period_end=period_end)
+            db.add(run)
+        db.commit()
+        print(f"[{datetime.now()}] Billing run {run.id} ({run.kind}, {run.period_start:%Y-%m-%d} to "
+              f"{run.period_end:%Y-%m-%d}) {'resumed' if run_id else 'started'} with "
+              f"{run.documents_created} documents already created.")
+
+        run_started = time.perf_counter()
+        run_documents = 0
+        with track_queries() as query_stats:
+            while True:
+                chunk_started = time.perf_counter()
+                if run.kind == "invoices":
+                    rows = load_invoice_chunk(db, run, chunk_size)
+                    if not rows:
+                        break
+                    jobs, skipped, cursor = build_invoice_jobs(rows)
+                else:
+                    rows = load_statement_chunk(db, run, chunk_size)
+                    if not rows:
+                        break
+                    jobs, skipped, cursor = build_statement_jobs(rows, run)
+
+                documents = await asyncio.gather(*[render_and_store(storage, run.kind, job) for job in jobs])
+                if documents:
+                    db.execute(insert(MedicalDocument), documents)
+
+                # The checkpoint commits with the documents, so a resumed run never duplicates a chunk
+                run.cursor_date, run.cursor_id = cursor
+                run.documents_created += len(documents)
+                run.skipped += skipped
+                db.commit()
+
+                run_documents += len(documents)
+                chunk_elapsed = time.perf_counter() - chunk_started
+                print(f"  Chunk of {len(rows)}: {len(documents)} documents, {skipped} skipped in "
+                      f"{chunk_elapsed:.2f}s ({len(documents) / chunk_elapsed:.1f} docs/s).")
+
+        run.status = "completed"
+        run.completed_at = datetime.utcnow()
+        db.commit()
+
+        elapsed = time.perf_counter() - run_started
+        print(f"Billing run {run.id} completed: {run_documents} documents in {elapsed:.2f}s "
+              f"({run_documents / elapsed if elapsed else 0:.1f} docs/s), {run.skipped} skipped, "
+              f"{query_stats.count} queries.")
+        return run
+    except Exception:
+        db.rollback()
+        if run is not None and run.id:
+            run.status = "failed"
+            db.commit()
+            print(f"Billing run {run.id} failed; resume it with --resume {run.id}.")
+        raise
+    finally:
+        db.close()
+
+
+def parse_period(args):
+    if args.month:
+        start = datetime.strptime(args.month, "%Y-%m")
+        end = (start + timedelta(days=32)).replace(day=1)
+        return start, end
+    if args.start and args.end:
+        return datetime.strptime(args.start, "%Y-%m-%d"), datetime.strptime(args.end, "%Y-%m-%d")
+    if not args.resume:
+        sys.exit("Provide --month or both --start and --end.")
+    return None, None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk invoice and statement generation.")
+    parser.add_argument("kind", choices=["invoices", "statements"])
+    parser.add_argument("--month", help="Billing month, YYYY-MM")
+    parser.add_argument("--start", help="Period start date, YYYY-MM-DD (inclusive)")
+    parser.add_argument("--end", help="Period end date, YYYY-MM-DD (exclusive)")
+    parser.add_argument("--resume", help="ID of an interrupted billing run to continue")
+    parser.add_argument("--chunk-size", type=int, default=settings.BILLING_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    # Ensure Firebase is initialized when documents are stored in Firebase Storage
+    import firebase_admin
+    from firebase_admin import credentials
+
+    if settings.STORAGE_BACKEND == "firebase" and not firebase_admin._apps:
+        if os.path.exists(settings.FIREBASE_CREDENTIALS_PATH):
+            cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
+            firebase_admin.initialize_app(cred, {'storageBucket': settings.FIREBASE_STORAGE_BUCKET})
+            print("Firebase initialized for billing.")
+        else:
+            print(f"FATAL: Firebase credentials not found at: {settings.FIREBASE_CREDENTIALS_PATH}")
+            sys.exit(1)
+
+    period_start, period_end = parse_period(args)
+    try:
+        asyncio.run(run_billing(args.kind, period_start, period_end, create_storage_manager(),
+                                run_id=args.resume, chunk_size=args.chunk_size))
+    finally:
+        pdf_renderer.shutdown()
@@ -5,6 +5,7 @@
 #              including API endpoints, database models, authentication, and business logic.
 # =================================================================================================
 import hashlib
+import gzip
 import hmac
 # I. CORE IMPORTS & INITIAL SETUP
 # =================================================================================================
@@ -12,20 +13,38 @@ import hmac
 
 import os
 import json
+import base64
+import csv
+import mmap
 import logging
+import logging.handlers
 import asyncio
 import enum
 import re
+import atexit
+import queue
 import secrets
+try:
+    import fcntl
+except ImportError:  # Windows: audit journal ownership falls back to PID liveness checks
+    fcntl = None
 import uuid
 import math
+import time
 from sqlalchemy.sql import func
 from sqlalchemy.sql.functions import func
 import io
 import httpx
-from datetime import datetime, timedelta, timezone
+import orjson
+from urllib.parse import quote
+from datetime import datetime, date, timedelta, timezone
 from typing import List, Optional, Dict, Any, Union
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+import threading
 from itertools import combinations
 from firebase_admin import auth
 # Third-party Imports
@@ -44,10 +63,11 @@ from fastapi import (
     APIRouter,
     WebSocket, WebSocketDisconnect
 )
-from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 # Pydantic for data validation and settings management
@@ -56,7 +76,8 @@ from pydantic import (
     EmailStr,
     Field,
     validator,
-    ValidationError
+    ValidationError,
+    TypeAdapter
 )
 from pydantic_settings import BaseSettings
 
@@ -65,9 +86,11 @@ from sqlalchemy import (
     create_engine,
     Column,
     Integer,
+    BigInteger,
     String,
     Boolean,
     DateTime,
+    Date,
     ForeignKey,
     Text,
     Enum as SQLAlchemyEnum,
@@ -76,12 +99,24 @@ from sqlalchemy import (
     event,
     Interval,
     or_,
-    text, case
+    and_,
+    Index,
+    UniqueConstraint,
+    update,
+    insert,
+    delete,
+    select,
+    extract,
+    text, case, cast
 )
-from sqlalchemy.orm import sessionmaker, Session, relationship, joinedload, declarative_base
+from sqlalchemy.orm import (
+    sessionmaker, Session, relationship, joinedload, declarative_base, column_property, defer, undefer
+)
+from sqlalchemy.orm.attributes import get_history
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.engine import Engine
-from sqlalchemy.dialects.postgresql import INTERVAL
+from sqlalchemy.dialects.postgresql import INTERVAL, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # Firebase for Authentication and Cloud Storage
 import firebase_admin
@@ -102,13 +137,15 @@ from twilio.jwt.access_token.grants import VideoGrant
 
 import pyotp
 import qrcode
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+)
 from cryptography.fernet import Fernet
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
+import pdf_rendering
 from fastapi.responses import StreamingResponse
 from functools import wraps
+from abc import ABC, abstractmethod
 import random
 
 
@@ -150,6 +187,69 @@ class AppSettings(BaseSettings):
     PAYSTACK_SECRET_KEY: str = "YOUR_PAYSTACK_SECRET_KEY"
     # ----------------------------
 
+    # --- SQL instrumentation ---
+    SQL_QUERY_BUDGET: int = 25  # Requests issuing more queries than this are flagged in DEBUG mode
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = 5  # Same statement shape this many times hints at an N+1
+    SQL_SERVER_TIMING: bool = False  # Expose DB timings to clients through the Server-Timing header
+
+    # --- Analytics ---
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300  # Series that include today
+    ANALYTICS_HISTORICAL_CACHE_TTL_SECONDS: int = 86400  # Series that end before today
+    ANALYTICS_MAX_RANGE_DAYS: int = 3660
+    USER_COUNT_CACHE_TTL_SECONDS: int = 60
+    LEDGER_EXPORT_BATCH_SIZE: int = 1000  # Rows fetched and written per chunk of the payment ledger export
+
+    # --- HTTP response cache ---
+    HTTP_CACHE_MAX_ENTRIES: int = 2048
+    # Seconds each cached namespace is served from memory and may be reused by clients (max-age)
+    HTTP_CACHE_TTL_SECONDS: Dict[str, int] = {"blog": 60, "plans": 3600, "medical_tips": 3600, "hospitals": 300,
+                                              "resources": 300}
+
+    # --- Wellness ---
+    WELLNESS_CATALOG_TTL_SECONDS: int = 600  # Bounds staleness in workers that did not handle an admin write
+
+    # --- Vitals ---
+    VITALS_BATCH_MAX_POINTS: int = 10000  # Per bulk ingestion request
+    VITALS_INSERT_CHUNK_SIZE: int = 1000  # Rows per multi-row INSERT
+
+    # --- Audit logging ---
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_QUEUE_MAX_SIZE: int = 100000  # Beyond this backlog non-durable entries are dropped (and counted)
+    AUDIT_JOURNAL_DIR: str = "./audit_journal"  # fsynced journal for durable entries
+    AUDIT_RETENTION_MONTHS: int = 12  # Whole months kept in the database; older months are archived
+    AUDIT_ARCHIVE_DIR: str = "./audit_archive"
+    AUDIT_ARCHIVE_BATCH_SIZE: int = 5000  # Rows streamed to the archive and deleted per batch
+    USER_COUNT_ESTIMATE_THRESHOLD: int = 100000  # Above this, PostgreSQL planner estimates replace COUNT(*)
+
+    # --- Storage ---
+    STORAGE_BACKEND: str = "firebase"  # "firebase" or "local"
+    LOCAL_STORAGE_PATH: str = "./storage"
+    PUBLIC_API_URL: str = "http://localhost:8000"  # Base URL used in locally signed download links
+    SIGNED_URL_EXPIRATION_MINUTES: int = 60
+    SIGNED_URL_REFRESH_MARGIN_SECONDS: int = 300  # Re-sign cached URLs this long before they expire
+    SIGNED_URL_CACHE_SIZE: int = 10000
+    STORAGE_SIGNING_WORKERS: int = 8
+    STORAGE_UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024  # Resumable upload chunk; must be a multiple of 256 KiB
+    MAX_CONCURRENT_UPLOADS: int = 8
+
+    # --- PDF rendering ---
+    PDF_RENDER_WORKERS: int = 2  # Renderer processes; 0 renders on the thread pool instead
+    BILLING_CHUNK_SIZE: int = 200  # Payments (or users, for statements) per billing run batch
+
+    # --- Payment webhooks ---
+    PAYMENT_EVENT_POLL_SECONDS: float = 5.0
+    PAYMENT_EVENT_BATCH_SIZE: int = 20
+    PAYMENT_EVENT_MAX_ATTEMPTS: int = 5
+    PAYMENT_EVENT_CLAIM_TIMEOUT_SECONDS: int = 300  # Events stuck in "processing" this long are retried
+    PAYMENT_EVENT_RETRY_BASE_SECONDS: int = 30  # Delay before the first retry, doubled for each further attempt
+    PAYMENT_EVENT_RETRY_MAX_SECONDS: int = 3600
+
+    # --- Request logging ---
+    LOG_FILE: str = "dortmed_app.log"
+    # Fraction of successful requests logged per route template; errors are always logged.
+    LOG_SAMPLE_RATES: Dict[str, float] = {"/metrics": 0.0, "/api/health": 0.1}
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -160,13 +260,49 @@ settings = AppSettings()
 # =================================================================================================
 # III. LOGGING CONFIGURATION
 # =================================================================================================
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Renders each record as one JSON object per line, merging any structured `context` passed via `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        entry.update(getattr(record, "context", None) or {})
+        return json.dumps(entry, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the id of the request being served, captured on the emitting thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id.get()
+        return True
+
+
 logging.basicConfig(level=logging.INFO if not settings.DEBUG else logging.DEBUG)
 logger = logging.getLogger(__name__)
-handler = logging.FileHandler("dortmed_app.log")
+
+# Records are handed to an in-memory queue on the hot path; a background listener thread
+# owns the file handler, so request handlers never block on disk I/O.
+handler = logging.FileHandler(settings.LOG_FILE)
 handler.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+handler.setFormatter(JsonLogFormatter())
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setLevel(logging.INFO)
+queue_handler.addFilter(RequestIdFilter())
+logger.addHandler(queue_handler)
+log_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 # =================================================================================================
 # IV. LIFESPAN MANAGEMENT & APPLICATION INSTANTIATION
@@ -253,6 +389,28 @@ async def create_initial_data():
         db.commit()
         logger.info("Feature flag seeding process complete.")
 
+        # --- 3. Back-fill Practice Analytics Rollups ---
+        if not db.query(PhysicianDailyStats.id).first() and (
+                db.query(Appointment.id).filter(Appointment.status == AppointmentStatus.COMPLETED).first()
+                or db.query(AppointmentFeedback.id).first()):
+            rows = rebuild_physician_daily_stats(db)
+            logger.info(f"Back-filled {rows} physician daily stats rows.")
+
+        # --- 4. Seed Platform KPI Counters ---
+        if db.query(PlatformCounter).count() < len(KPI_COUNTER_NAMES):
+            reconcile_platform_counters(db)
+            logger.info("Platform KPI counters seeded.")
+
+        # --- 5. Back-fill Condition/Specialty/Service Tags ---
+        if not db.query(Tag.id).first() and any(db.query(model.id).first() for model in TAGGED_COLUMNS):
+            rows = rebuild_tags(db)
+            logger.info(f"Back-filled tags for {rows} tagged columns.")
+
+        # --- 6. Back-fill Vital Aggregates ---
+        if not db.query(PatientVitalAggregate.id).first() and db.query(PatientVital.id).first():
+            buckets = rebuild_vital_aggregates(db)
+            logger.info(f"Back-filled {buckets} patient vital aggregate buckets.")
+
     except Exception as e:
         logger.error(f"An error occurred during initial data seeding: {e}", exc_info=True)
         db.rollback()  # Rollback any partial changes on error
@@ -319,8 +477,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.critical(f"DB table creation failed: {e}", exc_info=True)
 
+    payment_event_worker.start()
+    audit_writer.start()
+
+    db = SessionLocal()
+    try:
+        wellness_catalog.load(db)
+        logger.info("Wellness catalog loaded.")
+    except Exception as e:
+        logger.error(f"Failed to preload the wellness catalog; it will load on first use: {e}", exc_info=True)
+    finally:
+        db.close()
+
     yield
     logger.info(f"Shutting down {settings.APP_NAME}...")
+    await payment_event_worker.stop()
+    audit_writer.stop()
+    pdf_renderer.shutdown()
 
 
 app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan, docs_url="/api/docs",
@@ -338,14 +511,215 @@ app.add_middleware(
 )
 
 
+# --- Prometheus Metrics ---
+# Under gunicorn every worker keeps its own samples. With PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py),
+# workers write them to shared files and /metrics aggregates all of them; gauges declare how to combine.
+if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+    # Also imported outside gunicorn (scheduler.py), where no server hook has created the directory.
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+HTTP_REQUEST_LATENCY = Histogram(
+    "dortmed_http_request_duration_seconds", "HTTP request latency by route template.",
+    ["method", "route", "status"])
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "dortmed_http_requests_in_progress", "HTTP requests currently being served.", ["method"],
+    multiprocess_mode="livesum")
+DB_QUERIES_PER_REQUEST = Histogram(
+    "dortmed_db_queries_per_request", "SQL statements issued per HTTP request.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500))
+DB_POOL_CONNECTIONS = Gauge(
+    "dortmed_db_pool_connections", "Database connection pool usage, summed over workers.", ["state"],
+    multiprocess_mode="livesum")
+UPSTREAM_REQUEST_LATENCY = Histogram(
+    "dortmed_upstream_request_duration_seconds", "Latency of calls to upstream services.",
+    ["service", "outcome"])
+OCR_REQUESTS_IN_FLIGHT = Gauge(
+    "dortmed_ocr_requests_in_flight", "Lab result images currently waiting on the OCR service.",
+    multiprocess_mode="livesum")
+
+
+@asynccontextmanager
+async def observe_upstream(service: str):
+    """Times a call to an upstream service (AI, OCR, Paystack) and records its outcome."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        UPSTREAM_REQUEST_LATENCY.labels(service=service, outcome=outcome).observe(time.perf_counter() - start)
+
+
+def get_route_template(request: Request) -> str:
+    """Returns the matched route's path template so metrics are not labelled with raw ids."""
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+# --- SQL Query Instrumentation ---
+_SQL_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SQL_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SQL_PARAM_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*,?)+\)")
+_SQL_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_statement(statement: str) -> str:
+    """
+    Reduces a SQL statement to its shape so that the same query issued with different
+    parameters (the signature of an N+1 loop) collapses into a single fingerprint.
+    """
+    fingerprint = _SQL_STRING_LITERAL.sub("?", statement)
+    fingerprint = _SQL_NUMBER_LITERAL.sub("?", fingerprint)
+    fingerprint = _SQL_PARAM_LIST.sub("(?)", fingerprint)
+    return _SQL_WHITESPACE.sub(" ", fingerprint).strip()
+
+
+class QueryStats:
+    """Accumulates the SQL activity of a single unit of work (an HTTP request or a scheduled job)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints: Dict[str, int] = {}
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        fingerprint = fingerprint_statement(statement)
+        self.fingerprints[fingerprint] = self.fingerprints.get(fingerprint, 0) + 1
+
+    def repeated_statements(self, threshold: int) -> List[tuple]:
+        """Returns (fingerprint, count) pairs issued at least `threshold` times, most frequent first."""
+        repeated = [(fp, count) for fp, count in self.fingerprints.items() if count >= threshold]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries():
+    """Collects SQL statistics for every query executed inside the block on the current context."""
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    start_times = conn.info.get("query_start_time")
+    if stats is None or not start_times:
+        return
+    stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+def should_log_request(route: str, status_code: int) -> bool:
+    """Applies per-route sampling to successful requests; failures are always logged."""
+    if status_code >= 400:
+        return True
+    rate = settings.LOG_SAMPLE_RATES.get(route, 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = datetime.now()
-    response = await call_next(request)
-    process_time = (datetime.now() - start_time).total_seconds()
-    logger.info(
-        f"{request.method} {request.url.path} - Status: {response.status_code} - Processed in: {process_time:.4f}s")
-    return response
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    request_id_token = current_request_id.set(request_id)
+    start_time = time.perf_counter()
+    try:
+        with track_queries() as query_stats:
+            response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        route = get_route_template(request)
+        response.headers["X-Request-ID"] = request_id
+
+        if should_log_request(route, response.status_code):
+            logger.info(
+                f"{request.method} {request.url.path} - Status: {response.status_code} - Processed in: {process_time:.4f}s",
+                extra={"context": {
+                    "event": "http_request",
+                    "method": request.method,
+                    "path": request.url.path,
+                    "route": route,
+                    "status": response.status_code,
+                    "duration_ms": round(process_time * 1000, 2),
+                    "db_queries": query_stats.count,
+                    "db_time_ms": round(query_stats.total_time * 1000, 2),
+                }})
+        DB_QUERIES_PER_REQUEST.observe(query_stats.count)
+
+        repeated = query_stats.repeated_statements(settings.SQL_REPEATED_STATEMENT_THRESHOLD)
+        if settings.DEBUG and (query_stats.count > settings.SQL_QUERY_BUDGET or repeated):
+            logger.warning(
+                f"Query budget check for {request.method} {route}: {query_stats.count} queries "
+                f"(budget {settings.SQL_QUERY_BUDGET}).",
+                extra={"context": {
+                    "event": "query_budget",
+                    "route": route,
+                    "db_queries": query_stats.count,
+                    "query_budget": settings.SQL_QUERY_BUDGET,
+                    "repeated_statements": [
+                        {"count": count, "statement": fingerprint[:200]} for fingerprint, count in repeated[:3]
+                    ],
+                }})
+
+        if settings.SQL_SERVER_TIMING:
+            response.headers.append(
+                "Server-Timing",
+                f'db;dur={query_stats.total_time * 1000:.2f};desc="{query_stats.count} queries", '
+                f'app;dur={process_time * 1000:.2f}')
+        return response
+    finally:
+        current_request_id.reset(request_id_token)
+
+
+def record_pool_usage():
+    """Publishes this worker's connection pool usage."""
+    pool = getattr(engine, "pool", None)
+    for state, reader in (("checked_out", "checkedout"), ("idle", "checkedin"),
+                          ("overflow", "overflow"), ("size", "size")):
+        if pool is not None and hasattr(pool, reader):
+            DB_POOL_CONNECTIONS.labels(state=state).set(getattr(pool, reader)())
+
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    HTTP_REQUESTS_IN_PROGRESS.labels(method=request.method).inc()
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=request.method).dec()
+        HTTP_REQUEST_LATENCY.labels(
+            method=request.method, route=get_route_template(request), status=str(status_code)
+        ).observe(time.perf_counter() - start_time)
+        record_pool_usage()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus scrape endpoint. Aggregates every gunicorn worker when PROMETHEUS_MULTIPROC_DIR is set;
+    otherwise only the worker that served the scrape is reported.
+    """
+    record_pool_usage()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 # =================================================================================================
@@ -362,6 +736,18 @@ def get_db():
 DbSession = Depends(get_db)
 
 
+def upsert_statement(bind, table, values, conflict_columns: List[str], update_set=None):
+    """
+    INSERT ... ON CONFLICT on PostgreSQL and SQLite. `update_set(excluded)` returns the column
+    updates applied to a row that already exists; without it conflicting rows are left untouched.
+    """
+    dialect_insert = postgresql_insert if bind.dialect.name == "postgresql" else sqlite_insert
+    statement = dialect_insert(table).values(values)
+    if update_set is None:
+        return statement.on_conflict_do_nothing(index_elements=conflict_columns)
+    return statement.on_conflict_do_update(index_elements=conflict_columns, set_=update_set(statement.excluded))
+
+
 # =================================================================================================
 # VII. ENUMS & CONSTANTS
 # =================================================================================================
@@ -405,6 +791,8 @@ class DocumentType(str, enum.Enum):
 # =================================================================================================
 class User(Base):
     __tablename__ = "users"
+    # Serves registration range scans and keyset pagination on (created_at, id)
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
     id = Column(String, primary_key=True)  # This will store the Firebase UID
     email = Column(String, unique=True, index=True, nullable=False)
     phone_number = Column(String, unique=True, index=True, nullable=True)
@@ -422,6 +810,12 @@ class User(Base):
     subscription = relationship("Subscription", back_populates="user", uselist=False, cascade="all, delete-orphan")
 
 
+# Case-insensitive email prefix search in the admin user list. Emails are stored as submitted, so the
+# search runs on lower(email); text_pattern_ops keeps LIKE 'prefix%' indexable under any collation.
+Index("ix_users_email_lower", func.lower(User.email).label("email_lower"),
+      postgresql_ops={"email_lower": "text_pattern_ops"})
+
+
 class Patient(Base):
     __tablename__ = "patients"
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -444,6 +838,15 @@ class Patient(Base):
     documents = relationship("MedicalDocument", back_populates="patient", cascade="all, delete-orphan")
     has_completed_tour = Column(Boolean, default=False)
 
+    # Contact details live on the user; exposed here so schemas can read them with from_attributes
+    @property
+    def email(self) -> Optional[str]:
+        return self.user.email if self.user else None
+
+    @property
+    def phone_number(self) -> Optional[str]:
+        return self.user.phone_number if self.user else None
+
 class Physician(Base):
     __tablename__ = "physicians"
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -464,6 +867,10 @@ class Physician(Base):
     user = relationship("User", back_populates="physician_profile")
     appointments = relationship("Appointment", back_populates="physician", foreign_keys="[Appointment.physician_id]")
 
+    @property
+    def email(self) -> Optional[str]:
+        return self.user.email if self.user else None
+
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
@@ -480,6 +887,8 @@ class Subscription(Base):
 
 class Payment(Base):
     __tablename__ = "payments"
+    # Serves newest-first listings (scanned backwards) and date-range ledger exports
+    __table_args__ = (Index("ix_payments_payment_date_id", "payment_date", "id"),)
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     subscription_id = Column(String, ForeignKey("subscriptions.id"), nullable=True)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -490,6 +899,28 @@ class Payment(Base):
     gateway_transaction_id = Column(String, unique=True, nullable=False)
     payment_date = Column(DateTime, default=datetime.utcnow)
     subscription = relationship("Subscription", back_populates="payments")
+    user = relationship("User")
+
+
+class PaymentEvent(Base):
+    """
+    Raw payment gateway webhook events, stored before any processing. The unique (event, reference)
+    pair makes gateway retries no-ops; `PaymentEventWorker` processes pending rows.
+    """
+    __tablename__ = "payment_events"
+    __table_args__ = (UniqueConstraint("event", "reference", name="uq_payment_events_event_reference"),)
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    gateway = Column(SQLAlchemyEnum(PaymentGateway), nullable=False)
+    event = Column(String, nullable=False)
+    reference = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    status = Column(String, default="pending", nullable=False, index=True)  # pending, processing, processed, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    received_at = Column(DateTime, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=True)  # Failed events are not retried before this time
+    processed_at = Column(DateTime, nullable=True)
 
 
 class Appointment(Base):
@@ -545,8 +976,8 @@ class FCMDevice(Base):
 class Conversation(Base):
     __tablename__ = "conversations"
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    patient_id = Column(String, ForeignKey("patients.id"), nullable=False)
-    physician_id = Column(String, ForeignKey("physicians.id"), nullable=False)
+    patient_id = Column(String, ForeignKey("patients.id"), nullable=False, index=True)
+    physician_id = Column(String, ForeignKey("physicians.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
@@ -568,6 +999,12 @@ class Message(Base):
     conversation = relationship("Conversation", back_populates="messages")
     sender = relationship("User")
 
+    # Chat history is always read per conversation in timestamp order, so the
+    # composite index lets keyset pagination seek straight to the cursor.
+    __table_args__ = (
+        Index("ix_messages_conversation_timestamp", "conversation_id", "timestamp", "id"),
+    )
+
 
 class Hospital(Base):
     __tablename__ = "hospitals"
@@ -578,8 +1015,8 @@ class Hospital(Base):
     country = Column(String, index=True)
     phone_number = Column(String)
     website = Column(String, nullable=True)
-    specialties = Column(Text, nullable=True)  # Stored as a comma-separated string
-    services = Column(Text, nullable=True)  # Stored as a comma-separated string
+    specialties = Column(Text, nullable=True)  # Stored as a comma-separated string; queried through HospitalTag
+    services = Column(Text, nullable=True)  # Stored as a comma-separated string; queried through HospitalTag
 
     # Geographic coordinates for mapping
     latitude = Column(Float, nullable=False)
@@ -593,11 +1030,16 @@ class Hospital(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Serve the filtered, newest-first shapes of the audit trail (see `get_audit_logs`)
+        Index("ix_audit_logs_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_audit_logs_action_timestamp", "action", "timestamp"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     user_id = Column(String, ForeignKey("users.id"),
                      nullable=True)  # User performing the action (can be null for system actions)
-    action = Column(String, nullable=False, index=True)  # e.g., "USER_LOGIN", "VIEW_PATIENT_RECORD"
+    action = Column(String, nullable=False)  # e.g., "USER_LOGIN", "VIEW_PATIENT_RECORD"
     target_type = Column(String, nullable=True)  # e.g., "Patient", "Appointment"
     target_id = Column(String, nullable=True)
     details = Column(Text, nullable=True)  # JSON string with extra context, e.g., IP address
@@ -605,6 +1047,36 @@ class AuditLog(Base):
 
     user = relationship("User")
 
+
+class AuditArchive(Base):
+    """A month of audit logs moved out of `audit_logs` into a gzipped NDJSON file by `archive_audit_logs`."""
+    __tablename__ = "audit_archives"
+    id = Column(Integer, primary_key=True, index=True)
+    month = Column(Date, nullable=False, index=True)  # First day of the archived month
+    file_path = Column(String, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    first_log_id = Column(Integer, nullable=False)
+    last_log_id = Column(Integer, nullable=False)
+    sha256 = Column(String, nullable=False)  # Of the compressed file
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BillingRun(Base):
+    """Progress of a bulk invoice/statement run. The cursor columns make interrupted runs resumable."""
+    __tablename__ = "billing_runs"
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String, nullable=False)  # "invoices" or "statements"
+    period_start = Column(DateTime, nullable=False)
+    period_end = Column(DateTime, nullable=False)
+    status = Column(String, default="running", nullable=False)  # running, completed, failed
+    cursor_date = Column(DateTime, nullable=True)  # Last Payment.payment_date processed (invoices)
+    cursor_id = Column(String, nullable=True)  # Last Payment.id (invoices) or User.id (statements) processed
+    documents_created = Column(Integer, default=0, nullable=False)
+    skipped = Column(Integer, default=0, nullable=False)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
 # =================================================================================================
 # IX. PYDANTIC SCHEMAS
 # =================================================================================================
@@ -698,6 +1170,17 @@ class PhysicianCreate(PhysicianBase):
     longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 
+def validate_availability_schedule(v):
+    """Checks a {day: ["HH:MM-HH:MM", ...]} schedule before it is stored."""
+    if v is None: return v
+    for day, slots in v.items():
+        if not isinstance(slots, list): raise ValueError("Slots must be a list")
+        for slot in slots:
+            if not re.match(r'^\d{2}:\d{2}-\d{2}:\d{2}$', slot) or slot.split('-')[0] >= slot.split('-')[1]:
+                raise ValueError(f"Invalid time slot format or range: {slot}")
+    return v
+
+
 class PhysicianUpdate(BaseModel):
     specialty: Optional[str] = None;
     board_certifications: Optional[str] = None;
@@ -764,13 +1247,7 @@ class PhysicianProfileUpdate(BaseModel):
 
     @validator('availability_schedule')
     def validate_schedule(cls, v):
-        if v is None: return v
-        for day, slots in v.items():
-            if not isinstance(slots, list): raise ValueError("Slots must be a list")
-            for slot in slots:
-                if not re.match(r'^\d{2}:\d{2}-\d{2}:\d{2}$', slot) or slot.split('-')[0] >= slot.split('-')[1]:
-                    raise ValueError(f"Invalid time slot format or range: {slot}")
-        return v
+        return validate_availability_schedule(v)
 
 
 class PhysicianPublicProfile(PhysicianInDB):
@@ -837,6 +1314,8 @@ class PaginatedUsersResponse(BaseModel):
     size: int;
     pages: int;
     items: List[UserAdminView]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the following page
+    total_is_estimate: bool = False
 
 
 class UserStatusUpdate(BaseModel):
@@ -974,8 +1453,12 @@ class FeatureFlag(Base):
     is_enabled_for_ultimate = Column(Boolean, default=True)
 
 
+BLOG_EXCERPT_LENGTH = 280
+
+
 class BlogPost(Base):
     __tablename__ = "blog_posts"
+    __table_args__ = (Index("ix_blog_posts_created_at_id", "created_at", "id"),)  # Newest-first listing
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
@@ -983,6 +1466,10 @@ class BlogPost(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Leading slice of the content computed by the database, so listings never load the full text.
+    # One character beyond the limit is read to tell whether the post continues.
+    excerpt = column_property(func.substr(content, 1, BLOG_EXCERPT_LENGTH + 1), deferred=True)
+
     author = relationship("User")
 
 class Exercise(Base):
@@ -991,16 +1478,17 @@ class Exercise(Base):
     name = Column(String, unique=True, nullable=False)
     description = Column(Text)
     video_url = Column(String, nullable=True) # Link to a demonstration video
-    # Target conditions can be a comma-separated string, e.g., "hypertension,general_wellness,post_surgery"
-    target_conditions = Column(String, index=True)
+    # Target conditions can be a comma-separated string, e.g., "hypertension,general_wellness,post_surgery".
+    # Queried through ExerciseTag, kept in sync by `maintain_tags`.
+    target_conditions = Column(String)
 
 class Supplement(Base):
     __tablename__ = "supplements"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     description = Column(Text)
-    # Conditions where this supplement might be recommended
-    target_conditions = Column(String, index=True)
+    # Conditions where this supplement might be recommended (comma-separated; queried through SupplementTag)
+    target_conditions = Column(String)
 
 
 class AppointmentFeedback(Base):
@@ -1017,6 +1505,226 @@ class AppointmentFeedback(Base):
 
     appointment = relationship("Appointment")
 
+
+class PhysicianDailyStats(Base):
+    """
+    Per-physician daily rollup behind the practice analytics. Kept current by
+    `maintain_physician_daily_stats` in the same transaction as appointment and feedback writes.
+    """
+    __tablename__ = "physician_daily_stats"
+    __table_args__ = (UniqueConstraint("physician_id", "day", name="uq_physician_daily_stats_physician_day"),)
+    id = Column(Integer, primary_key=True, index=True)
+    physician_id = Column(String, ForeignKey("physicians.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    completed_consultations = Column(Integer, default=0, nullable=False)
+    duration_minutes_sum = Column(Integer, default=0, nullable=False)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    rating_count = Column(Integer, default=0, nullable=False)
+
+
+def appointment_contribution(physician_id, appointment_time, status, duration_minutes):
+    """Rollup key and (consultations, duration) an appointment adds, or None if it is not completed."""
+    if status != AppointmentStatus.COMPLETED or not physician_id or not appointment_time:
+        return None
+    return (physician_id, appointment_time.date()), (1, duration_minutes or 0)
+
+
+@event.listens_for(Session, "before_flush")
+def maintain_physician_daily_stats(session, flush_context, instances):
+    """Applies the rollup deltas for pending Appointment/AppointmentFeedback changes in the same flush."""
+    deltas = defaultdict(lambda: [0, 0, 0, 0])  # consultations, duration, rating sum, rating count
+
+    def apply(contribution, sign):
+        if contribution:
+            key, (consultations, duration) = contribution
+            deltas[key][0] += sign * consultations
+            deltas[key][1] += sign * duration
+
+    changed_appointments = [obj for obj in session.dirty if isinstance(obj, Appointment) and session.is_modified(obj)]
+    changed_feedback = [obj for obj in session.dirty
+                        if isinstance(obj, AppointmentFeedback) and session.is_modified(obj)]
+    deleted_appointments = [obj for obj in session.deleted if isinstance(obj, Appointment)]
+    deleted_feedback = [obj for obj in session.deleted if isinstance(obj, AppointmentFeedback)]
+    new_objects = [obj for obj in session.new if isinstance(obj, (Appointment, AppointmentFeedback))]
+    if not (changed_appointments or changed_feedback or deleted_appointments or deleted_feedback or new_objects):
+        return
+
+    with session.no_autoflush:
+        # Stored values are read back because expired attributes carry no change history
+        stored_appointments = {}
+        if changed_appointments or deleted_appointments:
+            stored_appointments = {row[0]: row[1:] for row in session.query(
+                Appointment.id, Appointment.physician_id, Appointment.appointment_time, Appointment.status,
+                Appointment.duration_minutes
+            ).filter(Appointment.id.in_([obj.id for obj in changed_appointments + deleted_appointments])).all()}
+        stored_feedback = {}
+        if changed_feedback or deleted_feedback:
+            stored_feedback = {row[0]: row[1:] for row in session.query(
+                AppointmentFeedback.id, AppointmentFeedback.physician_id, AppointmentFeedback.created_at,
+                AppointmentFeedback.rating
+            ).filter(AppointmentFeedback.id.in_([obj.id for obj in changed_feedback + deleted_feedback])).all()}
+
+        for obj in changed_appointments + deleted_appointments:
+            if obj.id in stored_appointments:
+                apply(appointment_contribution(*stored_appointments[obj.id]), -1)
+        for obj in changed_appointments:
+            apply(appointment_contribution(obj.physician_id, obj.appointment_time, obj.status, obj.duration_minutes), 1)
+        for obj in changed_feedback + deleted_feedback:
+            if obj.id in stored_feedback:
+                physician_id, created_at, rating = stored_feedback[obj.id]
+                deltas[(physician_id, created_at.date())][2] -= rating
+                deltas[(physician_id, created_at.date())][3] -= 1
+        for obj in changed_feedback + new_objects:
+            if isinstance(obj, Appointment):
+                apply(appointment_contribution(obj.physician_id, obj.appointment_time, obj.status,
+                                               obj.duration_minutes), 1)
+            else:
+                key = (obj.physician_id, (obj.created_at or datetime.utcnow()).date())
+                deltas[key][2] += obj.rating
+                deltas[key][3] += 1
+
+        rows = [
+            {"physician_id": physician_id, "day": day, "completed_consultations": consultations,
+             "duration_minutes_sum": duration, "rating_sum": rating_sum, "rating_count": rating_count}
+            for (physician_id, day), (consultations, duration, rating_sum, rating_count) in deltas.items()
+            if any((consultations, duration, rating_sum, rating_count))
+        ]
+        if rows:
+            # One upsert adding the deltas in SQL, so concurrent transactions neither lose updates
+            # nor collide when both create the first row of a day
+            connection = session.connection()
+            table = PhysicianDailyStats.__table__
+            counters = ("completed_consultations", "duration_minutes_sum", "rating_sum", "rating_count")
+            connection.execute(upsert_statement(
+                connection, table, rows, ["physician_id", "day"],
+                lambda excluded: {name: table.c[name] + excluded[name] for name in counters}))
+
+
+def rebuild_physician_daily_stats(db: Session):
+    """Recomputes every rollup row from appointments and feedback (initial back-fill or repair)."""
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    completed = db.query(Appointment.physician_id, Appointment.appointment_time, Appointment.duration_minutes).filter(
+        Appointment.status == AppointmentStatus.COMPLETED).yield_per(1000)
+    for physician_id, appointment_time, duration_minutes in completed:
+        key = (physician_id, appointment_time.date())
+        totals[key][0] += 1
+        totals[key][1] += duration_minutes or 0
+    feedback = db.query(AppointmentFeedback.physician_id, AppointmentFeedback.created_at,
+                        AppointmentFeedback.rating).yield_per(1000)
+    for physician_id, created_at, rating in feedback:
+        key = (physician_id, created_at.date())
+        totals[key][2] += rating
+        totals[key][3] += 1
+
+    db.query(PhysicianDailyStats).delete()
+    db.add_all([
+        PhysicianDailyStats(physician_id=physician_id, day=day, completed_consultations=values[0],
+                            duration_minutes_sum=values[1], rating_sum=values[2], rating_count=values[3])
+        for (physician_id, day), values in totals.items()
+    ])
+    db.commit()
+    return len(totals)
+
+
+class PlatformCounter(Base):
+    """
+    Named platform-wide KPI values behind the admin dashboard. Kept current by
+    `maintain_platform_counters` and corrected periodically by `reconcile_platform_counters`.
+    """
+    __tablename__ = "platform_counters"
+    name = Column(String, primary_key=True)  # e.g. "active_users", "monthly_recurring_revenue"
+    value = Column(Float, default=0.0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def user_counters(is_active) -> Dict[str, float]:
+    return {"active_users": 1 if is_active in (True, None) else 0}  # None means the column default (active)
+
+
+def physician_counters(is_verified) -> Dict[str, float]:
+    return {"verified_physicians": 1 if is_verified else 0, "pending_verifications": 0 if is_verified else 1}
+
+
+def subscription_counters(plan, is_active) -> Dict[str, float]:
+    paid = is_active in (True, None) and plan in SUBSCRIPTION_PLANS
+    return {"monthly_recurring_revenue": SUBSCRIPTION_PLANS[plan].price_monthly / 100.0 if paid else 0.0}
+
+
+KPI_COUNTER_NAMES = ("active_users", "verified_physicians", "pending_verifications", "monthly_recurring_revenue")
+
+# Tracked model -> (columns read back for stored rows, function mapping those values to counter contributions)
+COUNTED_MODELS = {
+    User: ((User.is_active,), user_counters),
+    Physician: ((Physician.is_verified,), physician_counters),
+    Subscription: ((Subscription.plan, Subscription.is_active), subscription_counters),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def maintain_platform_counters(session, flush_context, instances):
+    """Applies KPI counter deltas for pending user, physician and subscription changes in the same flush."""
+    deltas = defaultdict(float)
+
+    def apply(contributions, sign):
+        for name, amount in contributions.items():
+            deltas[name] += sign * amount
+
+    for model, (columns, contributions) in COUNTED_MODELS.items():
+        new = [obj for obj in session.new if isinstance(obj, model)]
+        changed = [obj for obj in session.dirty if isinstance(obj, model) and session.is_modified(obj)]
+        deleted = [obj for obj in session.deleted if isinstance(obj, model)]
+        attributes = [column.key for column in columns]
+        for obj in new + changed:
+            apply(contributions(*(getattr(obj, attribute) for attribute in attributes)), 1)
+        if changed or deleted:
+            # Stored values are read back because expired attributes carry no change history
+            with session.no_autoflush:
+                stored = session.query(model.id, *columns).filter(
+                    model.id.in_([obj.id for obj in changed + deleted])).all()
+            for row in stored:
+                apply(contributions(*row[1:]), -1)
+
+    with session.no_autoflush:
+        for name, delta in deltas.items():
+            if not delta:
+                continue
+            counter = session.get(PlatformCounter, name)
+            if counter is None:
+                continue  # Counters are created by reconciliation; until then the dashboard reconciles itself
+            # SQL-side increment, so concurrent transactions cannot lose each other's updates
+            counter.value = PlatformCounter.value + delta
+
+
+def reconcile_platform_counters(db: Session) -> Dict[str, float]:
+    """
+    Recomputes every KPI counter with full aggregate queries and overwrites the stored values.
+    Returns the drift that was corrected, per counter.
+    """
+    # Lock the counter rows (PostgreSQL) before recounting: writers that committed earlier are in the
+    # recount, and writers still in flight wait for this transaction, then apply their increment on top
+    stored = {counter.name: counter for counter in db.query(PlatformCounter).with_for_update().all()}
+    price_case = case(
+        *[(Subscription.plan == plan, details.price_monthly / 100.0) for plan, details in SUBSCRIPTION_PLANS.items()],
+        else_=0.0  # Freemium plans and any others contribute $0 to MRR
+    )
+    actual = {
+        "active_users": db.query(User).filter(User.is_active == True).count(),
+        "verified_physicians": db.query(Physician).filter(Physician.is_verified == True).count(),
+        "pending_verifications": db.query(Physician).filter(Physician.is_verified == False).count(),
+        "monthly_recurring_revenue": db.query(func.sum(price_case)).filter(Subscription.is_active == True).scalar() or 0.0,
+    }
+    drift = {}
+    for name, value in actual.items():
+        counter = stored.get(name)
+        if counter is None:
+            db.add(PlatformCounter(name=name, value=value))
+            drift[name] = value
+        elif abs(counter.value - value) > 1e-6:
+            drift[name] = value - counter.value
+            counter.value = value
+    db.commit()
+    return drift
+
 # --- New Pydantic Schemas for Blog ---
 class BlogPostBase(BaseModel):
     title: str
@@ -1036,6 +1744,23 @@ class BlogPostOut(BlogPostBase):
     class Config: from_attributes = True
 
 
+class BlogPostSummary(BaseModel):
+    id: int
+    title: str
+    excerpt: str
+    author_email: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class PaginatedBlogPosts(BaseModel):
+    total: int
+    page: int
+    size: int
+    pages: int
+    items: List[BlogPostSummary]
+
+
 class Meal(Base):
     """Represents a single food item or a small meal component."""
     __tablename__ = "meals"
@@ -1044,8 +1769,8 @@ class Meal(Base):
     # e.g., 'breakfast', 'lunch', 'dinner', 'snack'
     meal_type = Column(String, index=True)
     # e.g., 'diabetes', 'hypertension', 'general_wellness'
-    # Can be a comma-separated list of conditions it's suitable for.
-    suitable_for_conditions = Column(String, index=True)
+    # Can be a comma-separated list of conditions it's suitable for (queried through MealTag).
+    suitable_for_conditions = Column(String)
     calories = Column(Integer, nullable=True)
     description = Column(Text, nullable=True)
 
@@ -1062,6 +1787,125 @@ class MealPlanTemplate(Base):
     structure = Column(Text)
 
 
+# --- Tagging ---
+class Tag(Base):
+    """A normalized (trimmed, lowercase) condition, specialty or service name, shared by the *_tags tables."""
+    __tablename__ = "tags"
+    __table_args__ = (UniqueConstraint("kind", "name", name="uq_tags_kind_name"),)
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # "condition", "specialty" or "service"
+    name = Column(String, nullable=False)
+
+
+# Association tables. The primary key serves entity -> tags; the (tag_id, entity) index serves tag -> entities.
+class ExerciseTag(Base):
+    __tablename__ = "exercise_tags"
+    __table_args__ = (Index("ix_exercise_tags_tag_id_exercise_id", "tag_id", "exercise_id"),)
+    exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+
+class SupplementTag(Base):
+    __tablename__ = "supplement_tags"
+    __table_args__ = (Index("ix_supplement_tags_tag_id_supplement_id", "tag_id", "supplement_id"),)
+    supplement_id = Column(Integer, ForeignKey("supplements.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+
+class MealTag(Base):
+    __tablename__ = "meal_tags"
+    __table_args__ = (Index("ix_meal_tags_tag_id_meal_id", "tag_id", "meal_id"),)
+    meal_id = Column(Integer, ForeignKey("meals.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+
+class HospitalTag(Base):
+    __tablename__ = "hospital_tags"
+    __table_args__ = (Index("ix_hospital_tags_tag_id_hospital_id", "tag_id", "hospital_id"),)
+    hospital_id = Column(String, ForeignKey("hospitals.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+
+# Comma-separated source column -> (tag kind, association model, association key column), per tagged model.
+# The string columns stay as the submitted text returned by the API; the tag tables are what queries use.
+TAGGED_COLUMNS = {
+    Exercise: [("target_conditions", "condition", ExerciseTag, ExerciseTag.exercise_id)],
+    Supplement: [("target_conditions", "condition", SupplementTag, SupplementTag.supplement_id)],
+    Meal: [("suitable_for_conditions", "condition", MealTag, MealTag.meal_id)],
+    Hospital: [("specialties", "specialty", HospitalTag, HospitalTag.hospital_id),
+               ("services", "service", HospitalTag, HospitalTag.hospital_id)],
+}
+
+
+def parse_tags(value: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(tag.strip().lower() for tag in (value or "").split(",") if tag.strip()))
+
+
+def tag_ids(connection, kind: str, names) -> Dict[str, int]:
+    """Ids for the given tag names of one kind, creating any that do not exist yet."""
+    names = set(names)
+    if not names:
+        return {}
+    tags = Tag.__table__
+    lookup = select(tags.c.name, tags.c.id).where(tags.c.kind == kind, tags.c.name.in_(names))
+    ids = dict(connection.execute(lookup).all())
+    missing = names - ids.keys()
+    if missing:
+        # A concurrent flush may create the same names first; its rows are picked up by the re-select
+        new_tags = [{"kind": kind, "name": name} for name in sorted(missing)]
+        connection.execute(upsert_statement(connection, tags, new_tags, ["kind", "name"]))
+        ids = dict(connection.execute(lookup).all())
+    return ids
+
+
+def replace_tags(connection, changes):
+    """
+    Rewrites the tag associations for (column spec, entity id, comma-separated value) changes in bulk:
+    one delete per spec and chunk of entities, then one multi-row insert per spec.
+    """
+    by_spec = defaultdict(dict)
+    for spec, entity_id, value in changes:
+        by_spec[spec][entity_id] = parse_tags(value)
+    for (_, kind, association, key_column), tags_by_entity in by_spec.items():
+        entity_ids = list(tags_by_entity)
+        kind_tag_ids = select(Tag.__table__.c.id).where(Tag.__table__.c.kind == kind)
+        for i in range(0, len(entity_ids), 500):
+            connection.execute(delete(association.__table__).where(
+                key_column.in_(entity_ids[i:i + 500]), association.__table__.c.tag_id.in_(kind_tag_ids)))
+        ids = tag_ids(connection, kind, (name for names in tags_by_entity.values() for name in names))
+        rows = [{key_column.key: entity_id, "tag_id": ids[name]}
+                for entity_id, names in tags_by_entity.items() for name in names]
+        if rows:
+            connection.execute(insert(association.__table__), rows)
+
+
+@event.listens_for(Session, "after_flush")
+def maintain_tags(session, flush_context, *args):
+    """Keeps the tag tables in step with the comma-separated columns of flushed rows, in the same transaction."""
+    changes = []
+    for obj in list(session.new) + list(session.dirty):
+        for spec in TAGGED_COLUMNS.get(type(obj), ()):
+            if obj in session.new or get_history(obj, spec[0]).has_changes():
+                changes.append((spec, obj.id, getattr(obj, spec[0])))
+    for obj in session.deleted:
+        for spec in TAGGED_COLUMNS.get(type(obj), ()):
+            changes.append((spec, obj.id, None))
+    if changes:
+        # Core statements on the flush's connection; ORM queries here would trigger a nested autoflush
+        replace_tags(session.connection(), changes)
+
+
+def rebuild_tags(db: Session) -> int:
+    """Back-fills every tag association from the comma-separated columns (initial migration or repair)."""
+    changes = []
+    for model, specs in TAGGED_COLUMNS.items():
+        for spec in specs:
+            changes.extend((spec, entity_id, value) for entity_id, value in db.query(model.id, getattr(model, spec[0])))
+    replace_tags(db.connection(), changes)
+    db.commit()
+    return len(changes)
+
+
 class PatientVital(Base):
     """
     Stores time-series health data for a patient. This table can be populated
@@ -1069,20 +1913,132 @@ class PatientVital(Base):
     It serves as the data source for patient health trend charts.
     """
     __tablename__ = "patient_vitals"
+    __table_args__ = (
+        # Every read is one patient's series of one vital type over a time range
+        Index("ix_patient_vitals_patient_type_timestamp", "patient_id", "vital_type", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    patient_id = Column(String, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False, index=True)
+    patient_id = Column(String, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
     # The type of vital sign being measured.
     # e.g., "systolic_bp", "diastolic_bp", "blood_glucose", "weight_kg", "heart_rate_bpm"
-    vital_type = Column(String, nullable=False, index=True)
+    vital_type = Column(String, nullable=False)
     # The numeric value of the vital sign.
     value = Column(Float, nullable=False)
     # The timestamp when the measurement was taken.
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     # Relationship to the Patient model.
     patient = relationship("Patient")
 
 
+class PatientVitalAggregate(Base):
+    """
+    Hourly and daily rollups of PatientVital per (patient, vital type), maintained by `ingest_vitals`
+    in the same transaction as the raw points. Dashboard alerts read these instead of raw series.
+    """
+    __tablename__ = "patient_vital_aggregates"
+    __table_args__ = (
+        UniqueConstraint("patient_id", "vital_type", "granularity", "bucket_start",
+                         name="uq_patient_vital_aggregates_bucket"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    patient_id = Column(String, ForeignKey("patients.id", ondelete="CASCADE"), nullable=False)
+    vital_type = Column(String, nullable=False)
+    granularity = Column(String, nullable=False)  # "hour" or "day"
+    bucket_start = Column(DateTime, nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+    value_sum = Column(Float, default=0.0, nullable=False)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+
+    @property
+    def average(self) -> float:
+        return self.value_sum / self.count if self.count else 0.0
+
+
+VITAL_AGGREGATE_GRANULARITIES = ("hour", "day")
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Converts an aware datetime to the naive UTC used by the DateTime columns; naive values are taken as UTC."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def vital_bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def summarize_vitals(rows) -> Dict[tuple, list]:
+    """Folds (patient_id, vital_type, value, timestamp) rows into [count, sum, min, max] per aggregate bucket."""
+    summaries = {}
+    for patient_id, vital_type, value, timestamp in rows:
+        for granularity in VITAL_AGGREGATE_GRANULARITIES:
+            key = (patient_id, vital_type, granularity, vital_bucket_start(timestamp, granularity))
+            summary = summaries.get(key)
+            if summary is None:
+                summaries[key] = [1, value, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[2] = min(summary[2], value)
+                summary[3] = max(summary[3], value)
+    return summaries
+
+
+def ingest_vitals(db: Session, patient_id: str, points: List[Dict[str, Any]]) -> int:
+    """
+    Inserts a patient's vital points and folds them into the hourly/daily aggregates in the caller's
+    transaction. The touched buckets are updated with one upsert, however many points they receive.
+    """
+    now = datetime.utcnow()
+    rows = []
+    for point in points:
+        timestamp = naive_utc(point.get("timestamp") or now)
+        rows.append({"patient_id": patient_id, "vital_type": point["vital_type"], "value": point["value"],
+                     "timestamp": timestamp})
+    for i in range(0, len(rows), settings.VITALS_INSERT_CHUNK_SIZE):
+        db.execute(insert(PatientVital), rows[i:i + settings.VITALS_INSERT_CHUNK_SIZE])
+
+    summaries = summarize_vitals((row["patient_id"], row["vital_type"], row["value"], row["timestamp"]) for row in rows)
+    buckets = [
+        {"patient_id": key[0], "vital_type": key[1], "granularity": key[2], "bucket_start": key[3],
+         "count": count, "value_sum": value_sum, "min_value": low, "max_value": high}
+        for key, (count, value_sum, low, high) in summaries.items()
+    ]
+    # Combined in SQL, so concurrent ingestion for the same bucket neither loses points nor collides on insert
+    table = PatientVitalAggregate.__table__
+    combine = lambda excluded: {
+        "count": table.c.count + excluded.count,
+        "value_sum": table.c.value_sum + excluded.value_sum,
+        "min_value": case((table.c.min_value > excluded.min_value, excluded.min_value), else_=table.c.min_value),
+        "max_value": case((table.c.max_value < excluded.max_value, excluded.max_value), else_=table.c.max_value),
+    }
+    for i in range(0, len(buckets), settings.VITALS_INSERT_CHUNK_SIZE):
+        db.execute(upsert_statement(db.get_bind(), table, buckets[i:i + settings.VITALS_INSERT_CHUNK_SIZE],
+                                    ["patient_id", "vital_type", "granularity", "bucket_start"], combine))
+    return len(rows)
+
+
+def rebuild_vital_aggregates(db: Session) -> int:
+    """Recomputes every vital aggregate from the raw points (initial back-fill or repair)."""
+    rows = db.query(PatientVital.patient_id, PatientVital.vital_type, PatientVital.value,
+                    PatientVital.timestamp).yield_per(1000)
+    summaries = summarize_vitals(rows)
+    db.query(PatientVitalAggregate).delete()
+    db.add_all([
+        PatientVitalAggregate(patient_id=patient_id, vital_type=vital_type, granularity=granularity,
+                              bucket_start=bucket_start, count=count, value_sum=value_sum, min_value=low,
+                              max_value=high)
+        for (patient_id, vital_type, granularity, bucket_start), (count, value_sum, low, high) in summaries.items()
+    ])
+    db.commit()
+    return len(summaries)
+
+
 class ProfessionalResource(Base):
     """
     Stores a curated list of professional development resources for physicians,
@@ -1123,8 +2079,10 @@ class PaystackService:
     async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.request(method, f"{self.base_url}{endpoint}", json=data, headers=self.headers)
-                response.raise_for_status()
+                async with observe_upstream("paystack"):
+                    response = await client.request(method, f"{self.base_url}{endpoint}", json=data,
+                                                    headers=self.headers)
+                    response.raise_for_status()
                 return response.json()
             except httpx.HTTPStatusError as e:
                 logger.error(f"Paystack API error: {e.response.status_code} - {e.response.text}")
@@ -1281,52 +2239,526 @@ class PasswordManager:
         return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
-class FirebaseStorageManager:
-    def __init__(self, bucket_name: str):
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a per-entry time-to-live."""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# --- Fast JSON Serialization ---
+class FastJSONResponse(JSONResponse):
+    """
+    Opt-in response class (`response_class=FastJSONResponse`) rendered with orjson. Content that is
+    already serialized (bytes from `serialize_orm`) is sent as is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+_json_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def json_adapter(schema) -> TypeAdapter:
+    adapter = _json_adapters.get(schema)
+    if adapter is None:
+        adapter = _json_adapters[schema] = TypeAdapter(schema)
+    return adapter
+
+
+def serialize_orm(schema, data, validated: bool = False) -> bytes:
+    """
+    Validates ORM objects (or anything attribute-shaped) against `schema` once, reading attributes
+    directly instead of copying `__dict__`, and serializes the result to JSON bytes in pydantic-core.
+    """
+    adapter = json_adapter(schema)
+    return adapter.dump_json(data if validated else adapter.validate_python(data, from_attributes=True))
+
+
+def orm_json_response(schema, data, validated: bool = False, status_code: int = 200) -> FastJSONResponse:
+    """Response for `data` as `schema`, skipping FastAPI's second response_model validation pass."""
+    return FastJSONResponse(serialize_orm(schema, data, validated), status_code=status_code)
+
+
+def construct_from_orm(model, obj, **values):
+    """
+    Builds `model` from an ORM object without validation, for rows that were validated when they were
+    written (re-running EmailStr checks alone dominates the cost of large lists). Fields are read off
+    the object and nested models are built the same way; `values` override individual fields.
+    """
+    for name, field in model.model_fields.items():
+        if name in values or not hasattr(obj, name):
+            continue
+        value = getattr(obj, name)
+        if value is not None and isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel):
+            value = construct_from_orm(field.annotation, value)
+        values[name] = value
+    return model.model_construct(**values)
+
+
+def physician_public_profile(physician: Physician, **values) -> PhysicianPublicProfile:
+    """
+    Public profile built with `construct_from_orm`. The schedule is stored as raw JSON text, so it is
+    still validated against its declared shape; a malformed one is left out rather than served.
+    """
+    schedule = None
+    if physician.availability_schedule:
         try:
-            self.bucket = storage.bucket(bucket_name)
-        except Exception as e:
-            logger.error(f"Failed to init Firebase Storage bucket '{bucket_name}': {e}", exc_info=True);
-            self.bucket = None
+            schedule = json_adapter(Dict[str, List[str]]).validate_json(physician.availability_schedule)
+        except ValueError:
+            logger.warning(f"Ignoring malformed availability schedule of physician {physician.id}.")
+    return construct_from_orm(PhysicianPublicProfile, physician, availability_schedule=schedule, **values)
 
-    async def upload_file(self, file: UploadFile, user_id: str, doc_type: str) -> Dict[str, str]:
-        if not self.bucket: raise HTTPException(500, "Firebase Storage not configured.")
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses for read-mostly endpoints. Each entry is keyed by namespace,
+    the namespace's version, path and query string, and lives for the route's TTL. Writes call
+    `invalidate(namespace)` to bump the version; other worker processes catch up when their entries
+    expire. Responses carry an ETag and Cache-Control, and matching If-None-Match requests get a 304.
+    """
+
+    def __init__(self, max_size: int, ttls: Dict[str, int]):
+        self.ttls = ttls
+        self._entries = TTLCache(max_size=max_size)
+        self._versions: Dict[str, int] = defaultdict(int)
+
+    def invalidate(self, namespace: str):
+        self._versions[namespace] += 1
+
+    def serve(self, request: Request, namespace: str, response_model, build, public: bool = True) -> Response:
+        """Returns the cached response for the request, or builds, serializes and caches it with `build()`."""
+        ttl = self.ttls.get(namespace, 60)
+        key = (namespace, self._versions[namespace], request.url.path, str(request.url.query))
+        entry = self._entries.get(key)
+        if entry is None:
+            body = serialize_orm(response_model, build())
+            entry = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+            self._entries.set(key, entry, ttl)
+
+        body, etag = entry
+        headers = {"ETag": etag, "Cache-Control": f"{'public' if public else 'private'}, max-age={ttl}"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in
+                              [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(max_size=settings.HTTP_CACHE_MAX_ENTRIES, ttls=settings.HTTP_CACHE_TTL_SECONDS)
+
+
+class ChecksumReader:
+    """
+    Wraps a binary file object so that bytes are hashed (SHA-256) and progress is reported
+    as the storage client pulls them, instead of reading the whole file up front.
+    """
+
+    def __init__(self, raw, total_size: Optional[int] = None, on_progress=None):
+        self.raw = raw
+        self.total_size = total_size
+        self.on_progress = on_progress
+        self.bytes_read = 0
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        if chunk:
+            self._digest.update(chunk)
+            self.bytes_read += len(chunk)
+            if self.on_progress:
+                self.on_progress(self.bytes_read, self.total_size)
+        return chunk
+
+    def tell(self) -> int:
+        return self.raw.tell()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        position = self.raw.seek(offset, whence)
+        if position != self.bytes_read:
+            # A retried chunk rewound the stream: rebuild the digest up to the new position
+            self.raw.seek(0)
+            self._digest = hashlib.sha256()
+            self.bytes_read = 0
+            while self.bytes_read < position:
+                chunk = self.raw.read(min(settings.STORAGE_UPLOAD_CHUNK_SIZE, position - self.bytes_read))
+                if not chunk:
+                    break
+                self._digest.update(chunk)
+                self.bytes_read += len(chunk)
+        return position
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+
+def get_stream_size(raw) -> int:
+    """Returns the size of a seekable binary stream and rewinds it to the start."""
+    raw.seek(0, io.SEEK_END)
+    size = raw.tell()
+    raw.seek(0)
+    return size
+
+
+class StorageManager(ABC):
+    """
+    Storage interface used by the document, prescription and invoice flows. Subclasses provide
+    the raw object operations; this base class owns streaming uploads, the signed URL cache and
+    parallel signing so every backend behaves the same way.
+    """
+
+    def __init__(self):
+        # Signed URLs keyed by path, reused until shortly before they expire (LRU bounded)
+        self._url_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._url_cache_lock = threading.Lock()
+        # Paths recently written by this process, which are known to exist without a round trip
+        self._known_paths = TTLCache(max_size=settings.SIGNED_URL_CACHE_SIZE)
+        self._signing_pool = ThreadPoolExecutor(max_workers=settings.STORAGE_SIGNING_WORKERS,
+                                                thread_name_prefix="url-signing")
+        self._upload_slots = asyncio.Semaphore(settings.MAX_CONCURRENT_UPLOADS)
+
+    # --- Backend primitives (blocking; called from worker threads) ---
+    @abstractmethod
+    def _ensure_ready(self):
+        """Raises an HTTPException if the backend cannot be used."""
+
+    @abstractmethod
+    def _write_stream(self, reader: ChecksumReader, path: str, content_type: str, size: int):
+        """Writes the stream to `path`."""
+
+    @abstractmethod
+    def _exists(self, path: str) -> bool:
+        """Checks whether an object exists at `path`."""
+
+    @abstractmethod
+    def _sign_url(self, path: str, expiration_minutes: int) -> str:
+        """Creates a time-limited GET URL for `path`."""
+
+    @abstractmethod
+    def _delete(self, path: str) -> bool:
+        """Deletes the object at `path`, returning whether it existed."""
+
+    @abstractmethod
+    def read_file(self, path: str):
+        """Returns the object's contents as a bytes-like object (blocking)."""
+
+    # --- Shared behaviour ---
+    async def upload_file(self, file: UploadFile, user_id: str, document_type: str,
+                          on_progress=None) -> Dict[str, Any]:
+        """
+        Streams the file to storage from a worker thread using chunked writes, so memory per
+        upload is bounded by the chunk size and the event loop is never blocked.
+        The number of uploads in flight is capped by MAX_CONCURRENT_UPLOADS.
+        `on_progress(bytes_sent, total_bytes)` is invoked from the worker thread as bytes stream.
+        """
+        self._ensure_ready()
         try:
             filename = f"{uuid.uuid4()}_{file.filename}"
-            path = f"users/{user_id}/{doc_type}/{filename}"
-            blob = self.bucket.blob(path)
-            contents = await file.read()
+            path = f"users/{user_id}/{document_type}/{filename}"
             content_type = file.content_type or mimetypes.guess_type(file.filename)[0] or "application/octet-stream"
-            blob.upload_from_string(contents, content_type=content_type)
-            logger.info(f"File '{filename}' uploaded to '{path}'.")
-            return {"file_path": path, "file_name": file.filename}
+            size = get_stream_size(file.file)
+            reader = ChecksumReader(file.file, total_size=size, on_progress=on_progress)
+
+            start_time = time.perf_counter()
+            async with self._upload_slots:
+                await run_in_threadpool(self._write_stream, reader, path, content_type, size)
+            elapsed = time.perf_counter() - start_time
+
+            self._known_paths.set(path, True, settings.SIGNED_URL_EXPIRATION_MINUTES * 60)
+            logger.info(f"File '{filename}' uploaded to '{path}' ({size} bytes in {elapsed:.3f}s).")
+            return {"file_path": path, "file_name": file.filename, "size": size, "sha256": reader.sha256}
         except Exception as e:
-            logger.error(f"Firebase upload failed: {e}", exc_info=True);
+            logger.error(f"Storage upload failed: {e}", exc_info=True);
             raise HTTPException(500, "Could not upload file.")
 
-    def get_download_url(self, path: str, expiration_minutes: int = 60) -> str:
-        if not self.bucket: raise HTTPException(500, "Firebase Storage not configured.")
+    def _get_cached_url(self, path: str) -> Optional[str]:
+        with self._url_cache_lock:
+            cached = self._url_cache.get(path)
+            if not cached:
+                return None
+            url, refresh_after = cached
+            if time.monotonic() >= refresh_after:
+                del self._url_cache[path]
+                return None
+            self._url_cache.move_to_end(path)
+            return url
+
+    def _cache_url(self, path: str, url: str, expiration_minutes: int):
+        refresh_after = time.monotonic() + expiration_minutes * 60 - settings.SIGNED_URL_REFRESH_MARGIN_SECONDS
+        with self._url_cache_lock:
+            self._url_cache[path] = (url, refresh_after)
+            self._url_cache.move_to_end(path)
+            while len(self._url_cache) > settings.SIGNED_URL_CACHE_SIZE:
+                self._url_cache.popitem(last=False)
+
+    def _invalidate(self, path: str):
+        with self._url_cache_lock:
+            self._url_cache.pop(path, None)
+        self._known_paths.discard(path)
+
+    def get_download_url(self, path: str, expiration_minutes: int = settings.SIGNED_URL_EXPIRATION_MINUTES,
+                         verify_exists: bool = True) -> str:
+        """
+        Returns a signed GET URL for the path, served from the cache while still fresh.
+        The existence probe is skipped for paths uploaded by this process or when the caller
+        already knows the object exists (e.g. the path comes from a MedicalDocument row).
+        """
+        self._ensure_ready()
+        cached = self._get_cached_url(path)
+        if cached:
+            return cached
         try:
-            blob = self.bucket.blob(path)
-            if not blob.exists(): return None
-            return blob.generate_signed_url(version="v4", expiration=timedelta(minutes=expiration_minutes),
-                                            method="GET")
+            if verify_exists and not self._known_paths.get(path) and not self._exists(path): return None
+            url = self._sign_url(path, expiration_minutes)
+            self._cache_url(path, url, expiration_minutes)
+            return url
         except Exception as e:
             logger.error(f"Failed to generate signed URL for '{path}': {e}", exc_info=True);
             raise HTTPException(500, "Could not get file URL.")
 
+    async def get_download_urls(self, paths: List[str], verify_exists: bool = True) -> Dict[str, Optional[str]]:
+        """Resolves signed URLs for many paths, signing cache misses in parallel on the signing pool."""
+        urls = {path: self._get_cached_url(path) for path in set(paths)}
+        misses = [path for path, url in urls.items() if url is None]
+        if misses:
+            loop = asyncio.get_running_loop()
+            signed = await asyncio.gather(*[
+                loop.run_in_executor(self._signing_pool, lambda p=path: self.get_download_url(
+                    p, verify_exists=verify_exists))
+                for path in misses
+            ])
+            urls.update(zip(misses, signed))
+        return urls
+
     def delete_file(self, path: str) -> bool:
-        if not self.bucket: return False
         try:
-            blob = self.bucket.blob(path)
-            if blob.exists(): blob.delete(); logger.info(f"File '{path}' deleted."); return True
+            self._ensure_ready()
+            self._invalidate(path)
+            if self._delete(path): logger.info(f"File '{path}' deleted."); return True
             return False
         except Exception as e:
             logger.error(f"Failed to delete file '{path}': {e}", exc_info=True);
             return False
 
 
-storage_manager = FirebaseStorageManager(bucket_name=settings.FIREBASE_STORAGE_BUCKET)
+class FirebaseStorageManager(StorageManager):
+    def __init__(self, bucket_name: str):
+        super().__init__()
+        try:
+            self.bucket = storage.bucket(bucket_name)
+        except Exception as e:
+            logger.error(f"Failed to init Firebase Storage bucket '{bucket_name}': {e}", exc_info=True);
+            self.bucket = None
+
+    def _ensure_ready(self):
+        if not self.bucket: raise HTTPException(500, "Firebase Storage not configured.")
+
+    def _write_stream(self, reader: ChecksumReader, path: str, content_type: str, size: int):
+        # Files larger than the chunk size go through GCS resumable uploads, one chunk in memory at a time
+        blob = self.bucket.blob(path, chunk_size=settings.STORAGE_UPLOAD_CHUNK_SIZE)
+        blob.upload_from_file(reader, size=size, content_type=content_type, rewind=False)
+
+    def _exists(self, path: str) -> bool:
+        return self.bucket.blob(path).exists()
+
+    def _sign_url(self, path: str, expiration_minutes: int) -> str:
+        return self.bucket.blob(path).generate_signed_url(version="v4", expiration=timedelta(minutes=expiration_minutes),
+                                                          method="GET")
+
+    def _delete(self, path: str) -> bool:
+        blob = self.bucket.blob(path)
+        if blob.exists(): blob.delete(); return True
+        return False
+
+    def read_file(self, path: str) -> bytes:
+        self._ensure_ready()
+        return self.bucket.blob(path).download_as_bytes()
+
+
+class LocalStorageManager(StorageManager):
+    """
+    Stores objects under a local directory. Used for development, offline runs of the document
+    endpoints and storage benchmarks. Download URLs point at `/api/storage/local/...` and carry an
+    HMAC signature and expiry, so they behave like cloud signed URLs.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        super().__init__()
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _ensure_ready(self):
+        pass
+
+    def resolve_path(self, path: str) -> str:
+        """Maps a storage path to a file under the root, rejecting anything that escapes it."""
+        full_path = os.path.abspath(os.path.join(self.root, path))
+        if os.path.commonpath([self.root, full_path]) != self.root:
+            raise HTTPException(status_code=400, detail="Invalid storage path.")
+        return full_path
+
+    def _write_stream(self, reader: ChecksumReader, path: str, content_type: str, size: int):
+        full_path = self.resolve_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # Write to a temporary sibling and rename, so readers never observe a partial file
+        temp_path = f"{full_path}.part"
+        try:
+            with open(temp_path, "wb") as destination:
+                while True:
+                    chunk = reader.read(settings.STORAGE_UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    destination.write(chunk)
+            os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _exists(self, path: str) -> bool:
+        return os.path.isfile(self.resolve_path(path))
+
+    def sign(self, path: str, expires: int) -> str:
+        message = f"{path}:{expires}".encode("utf-8")
+        return hmac.new(settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+    def verify_signature(self, path: str, expires: int, signature: str) -> bool:
+        if expires < int(time.time()):
+            return False
+        return hmac.compare_digest(self.sign(path, expires), signature)
+
+    def _sign_url(self, path: str, expiration_minutes: int) -> str:
+        # The signature covers the raw path; the URL carries it percent-encoded, since it contains the
+        # uploaded file name, and the router decodes it again before `serve_local_file` verifies it
+        expires = int(time.time()) + expiration_minutes * 60
+        return (f"{self.base_url}/api/storage/local/{quote(path)}"
+                f"?expires={expires}&signature={self.sign(path, expires)}")
+
+    def _delete(self, path: str) -> bool:
+        full_path = self.resolve_path(path)
+        if os.path.isfile(full_path): os.remove(full_path); return True
+        return False
+
+    def read_file(self, path: str):
+        """
+        Memory-maps the file, so large objects are paged in on demand instead of copied into the heap.
+        The caller closes the returned map.
+        """
+        with open(self.resolve_path(path), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def create_storage_manager() -> StorageManager:
+    """Builds the storage backend selected by STORAGE_BACKEND."""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageManager(root=settings.LOCAL_STORAGE_PATH, base_url=settings.PUBLIC_API_URL)
+    return FirebaseStorageManager(bucket_name=settings.FIREBASE_STORAGE_BUCKET)
+
+
+storage_manager = create_storage_manager()
+
+
+class InMemoryUploadFile:
+    """Adapts an in-memory buffer (e.g. a generated PDF) to the UploadFile interface used by storage."""
+
+    def __init__(self, file: io.BytesIO, filename: str, content_type: str = "application/pdf"):
+        self.file = file
+        self.filename = filename
+        self.content_type = content_type
+
+    async def read(self):
+        return self.file.read()
+
+    @property
+    def size(self):
+        return self.file.getbuffer().nbytes
+
+
+# --- PDF Rendering Service ---
+class PdfRenderService:
+    """
+    Renders PDFs in a pool of worker processes so reportlab never runs on the event loop. Workers
+    preload fonts and page templates once (`pdf_rendering.init_worker`). `submit` schedules
+    fire-and-forget jobs such as invoice generation and returns immediately.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._jobs = set()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # "spawn" keeps workers free of the parent's threads, sockets and DB connections
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"),
+                                                 initializer=pdf_rendering.init_worker)
+            return self._pool
+
+    async def render(self, kind: str, context: Dict[str, Any]) -> bytes:
+        if self.max_workers <= 0:
+            return await run_in_threadpool(pdf_rendering.render, kind, context)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), pdf_rendering.render, kind, context)
+
+    def submit(self, job) -> asyncio.Task:
+        """Runs a background coroutine, keeping a reference until it finishes and logging failures."""
+        task = asyncio.create_task(job)
+        self._jobs.add(task)
+        task.add_done_callback(self._job_done)
+        return task
+
+    def _job_done(self, task: asyncio.Task):
+        self._jobs.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"PDF job failed: {task.exception()}", exc_info=task.exception())
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+pdf_renderer = PdfRenderService(max_workers=settings.PDF_RENDER_WORKERS)
 
 
 def is_slot_available(physician_id: str, start: datetime, duration: int, db: Session) -> bool:
@@ -1534,14 +2966,23 @@ class MessageOut(BaseModel):
     sender_id: str
     content: str
     timestamp: datetime
+    is_read: bool = False
     class Config: from_attributes = True
 
 class ConversationOut(BaseModel):
     id: str
     patient: PatientInfoForPhysician # Reuse existing schema
     physician: PhysicianPublicProfile # Reuse existing schema
+    last_message: Optional[MessageOut] = None
+    unread_count: int = 0 # Messages addressed to the current user that are still unread
     class Config: from_attributes = True
 
+class MarkReadRequest(BaseModel):
+    up_to_message_id: str # Every message up to and including this one is marked as read
+
+class MarkReadResponse(BaseModel):
+    updated: int
+
 class AppointmentRescheduleRequest(BaseModel):
     new_appointment_time: datetime
 
@@ -1657,6 +3098,9 @@ class TimeSeriesDataPoint(BaseModel):
     count: int
 
 class UserGrowthData(BaseModel):
+    start: Optional[date] = None
+    end: Optional[date] = None
+    bucket: str = "day"
     data: List[TimeSeriesDataPoint]
 
 
@@ -1675,11 +3119,15 @@ class MealPlanTemplateCreate(BaseModel):
 
 class VitalDataPoint(BaseModel):
     timestamp: datetime
-    value: float
+    value: float  # The average over the bucket when the series is downsampled
+    min: Optional[float] = None
+    max: Optional[float] = None
+    class Config: from_attributes = True
 
 class PatientVitalsOut(BaseModel):
     vital_type: str
     data_points: List[VitalDataPoint]
+    bucket_seconds: Optional[int] = None  # Set when data points are per-bucket aggregates
 
 class ProfessionalResourceOut(BaseModel):
     title: str
@@ -1702,35 +3150,369 @@ class AuditLogOut(BaseModel):
     class Config: from_attributes = True
 
 
-class AuditLogger:
-    def __init__(self, db: Session):
-        self.db = db
+class AuditLogPage(BaseModel):
+    items: List[AuditLogOut]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the following (older) page
 
-    def log(
+
+class AuditArchiveOut(BaseModel):
+    id: int
+    month: date
+    file_path: str
+    row_count: int
+    first_log_id: int
+    last_log_id: int
+    sha256: str
+    archived_at: datetime
+    class Config: from_attributes = True
+
+
+class AuditLogWriter:
+    """
+    Buffers audit entries in memory and writes them with bulk inserts from a background thread,
+    so audit logging adds no commit to the request. Entries logged with `durable=True` are first
+    appended to a per-process journal file and fsynced; journal segments are deleted only after their
+    entries are committed and are replayed at startup if the process died first (at-least-once).
+    Submitting never blocks on the queue: when it is full, non-durable entries are dropped and counted,
+    while durable entries (already on disk) are held in an overflow list for the next flush.
+    """
+
+    def __init__(self, journal_dir: str, batch_size: int, flush_interval: float, max_queue_size: int):
+        self.journal_dir = journal_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue_size)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._journal = None
+        self._journal_counter = 0
+        self._segments: List[str] = []  # Closed journal files awaiting a successful flush
+        self._pending: List[Dict[str, Any]] = []  # Entries from a failed flush, retried first
+        self._overflow: List[Dict[str, Any]] = []  # Durable entries that did not fit in the queue
+        self._dropped = 0
+        self._owner: Optional[str] = None  # "<pid>.<token>", unique per process run
+        self._owner_lock = None
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            os.makedirs(self.journal_dir, exist_ok=True)
+            self._claim_ownership()
+            try:
+                self._replay_journals()
+            except Exception as e:
+                logger.error(f"Audit journal replay failed; remaining journals are retried on the next start: {e}",
+                             exc_info=True)
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        if not self._segments and not self._pending and self._owner_lock is not None:
+            self._owner_lock.close()
+            os.remove(self._lock_path(self._owner))
+            self._owner_lock = None
+
+    def submit(self, entry: Dict[str, Any], durable: bool = False):
+        """
+        Queues an entry without blocking on the queue. `durable=True` journals and fsyncs the entry first,
+        which is disk I/O: async code goes through `AuditLogger.log`, which runs it in the threadpool.
+        """
+        if self._thread is None:
+            self.start()
+        if durable:
+            # Journal and enqueue under one lock, so a rotated segment only holds entries already queued
+            with self._journal_lock:
+                journal = self._open_journal()
+                journal.write(json.dumps(entry) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+                try:
+                    self._queue.put_nowait(entry)
+                except queue.Full:
+                    self._overflow.append(entry)
+        else:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                with self._journal_lock:
+                    self._dropped += 1
+                return
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def _lock_path(self, owner: str) -> str:
+        return os.path.join(self.journal_dir, f"audit-{owner}.lock")
+
+    def _claim_ownership(self):
+        """Holds a lock file for the life of the process; while it is locked, the owner's journals are live."""
+        self._owner = f"{os.getpid()}.{uuid.uuid4().hex[:8]}"
+        self._owner_lock = open(self._lock_path(self._owner), "w")
+        if fcntl is not None:
+            fcntl.flock(self._owner_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _owner_is_alive(self, owner: str) -> bool:
+        if owner == self._owner:
+            return True
+        if fcntl is None:
+            return process_is_alive(int(owner.split(".")[0]))
+        try:
+            lock_file = open(self._lock_path(owner))
+        except FileNotFoundError:
+            return False
+        with lock_file:
+            # The kernel drops the lock when its process exits, so a reused PID cannot keep it alive
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            return False
+
+    def _open_journal(self):
+        if self._journal is None:
+            self._journal_counter += 1
+            path = os.path.join(self.journal_dir, f"audit-{self._owner}-{self._journal_counter}.journal")
+            self._journal = open(path, "a", encoding="utf-8")
+        return self._journal
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+    def flush(self) -> int:
+        """Writes everything buffered so far in one transaction. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._journal_lock:
+                if self._journal is not None:
+                    self._segments.append(self._journal.name)
+                    self._journal.close()
+                    self._journal = None
+                batch, self._overflow = self._overflow, []
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                logger.error(f"Audit queue full: dropped {dropped} non-durable audit entries.")
+            rows = self._pending + batch
+            try:
+                if rows:
+                    self._insert(rows)
+                self._pending = []
+                for segment in self._segments:
+                    os.remove(segment)
+                self._segments = []
+                return len(rows)
+            except Exception as e:
+                self._pending = rows
+                logger.error(f"Audit log flush of {len(rows)} entries failed; will retry: {e}", exc_info=True)
+                return 0
+
+    def _insert(self, rows: List[Dict[str, Any]]):
+        db = SessionLocal()
+        try:
+            for i in range(0, len(rows), self.batch_size):
+                db.execute(insert(AuditLog), [
+                    {**row, "timestamp": datetime.fromisoformat(row["timestamp"])}
+                    for row in rows[i:i + self.batch_size]
+                ])
+            db.commit()
+        finally:
+            db.close()
+
+    def _replay_journals(self):
+        """
+        Inserts entries from journals left behind by processes that exited before flushing them. Each
+        journal is claimed by renaming it to this process's name before it is read, so workers starting
+        together never replay the same file twice; a claim that did not finish is picked up next time.
+        """
+        dead_owners = set()
+        for file_name in sorted(os.listdir(self.journal_dir)):
+            if not file_name.startswith("audit-"):
+                continue
+            if file_name.endswith(".journal"):
+                owner = file_name[len("audit-"):].rsplit("-", 1)[0]
+            elif ".journal.replay-" in file_name:
+                owner = file_name.rsplit(".replay-", 1)[1]
+            elif file_name.endswith(".lock"):
+                owner = file_name[len("audit-"):-len(".lock")]
+            else:
+                continue
+            if self._owner_is_alive(owner):
+                continue  # Owned by a running worker
+            dead_owners.add(owner)
+            if file_name.endswith(".lock"):
+                continue
+
+            path = os.path.join(self.journal_dir, file_name)
+            claimed_path = f"{path.split('.replay-')[0]}.replay-{self._owner}"
+            try:
+                os.rename(path, claimed_path)
+            except FileNotFoundError:
+                continue  # Claimed by another worker
+            rows = []
+            with open(claimed_path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        pass  # Blank or torn last line from a crash mid-write; its request never completed
+            if rows:
+                self._insert(rows)
+                logger.warning(f"Replayed {len(rows)} audit entries from {file_name}.")
+            os.remove(claimed_path)
+
+        for owner in dead_owners:
+            try:
+                os.remove(self._lock_path(owner))
+            except FileNotFoundError:
+                pass
+
+
+def process_is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+audit_writer = AuditLogWriter(journal_dir=settings.AUDIT_JOURNAL_DIR, batch_size=settings.AUDIT_BATCH_SIZE,
+                              flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+                              max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE)
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def archive_audit_logs(db: Session, retention_months: Optional[int] = None,
+                       archive_dir: Optional[str] = None) -> List[AuditArchive]:
+    """
+    Moves every whole month of audit logs older than the retention window into its own gzipped NDJSON
+    file, records it as an AuditArchive, then deletes the archived rows in batches. Each month is bounded
+    by the highest id seen when it was read, so rows written concurrently (e.g. replayed journals) are
+    left for the next run rather than deleted unarchived. Returns the archives created.
+    """
+    retention_months = settings.AUDIT_RETENTION_MONTHS if retention_months is None else retention_months
+    archive_dir = archive_dir or settings.AUDIT_ARCHIVE_DIR
+    batch_size = settings.AUDIT_ARCHIVE_BATCH_SIZE
+    cutoff = add_months(datetime.utcnow().date().replace(day=1), -retention_months)
+    cutoff_time = datetime.combine(cutoff, datetime.min.time())
+
+    oldest = db.query(func.min(AuditLog.timestamp)).filter(AuditLog.timestamp < cutoff_time).scalar()
+    if oldest is None:
+        return []
+    os.makedirs(archive_dir, exist_ok=True)
+
+    archives = []
+    month = oldest.date().replace(day=1)
+    while month < cutoff:
+        month_start = datetime.combine(month, datetime.min.time())
+        month_end = datetime.combine(add_months(month, 1), datetime.min.time())
+        in_month = (AuditLog.timestamp >= month_start, AuditLog.timestamp < month_end)
+        first_id, last_id = db.query(func.min(AuditLog.id), func.max(AuditLog.id)).filter(*in_month).one()
+        if last_id is not None:
+            archives.append(_archive_audit_month(db, month, in_month, first_id, last_id, archive_dir, batch_size))
+        month = add_months(month, 1)
+    return archives
+
+
+def _archive_audit_month(db: Session, month: date, in_month: tuple, first_id: int, last_id: int,
+                         archive_dir: str, batch_size: int) -> AuditArchive:
+    bounded = (*in_month, AuditLog.id <= last_id)
+    file_path = os.path.join(archive_dir, f"audit_logs_{month:%Y_%m}_{uuid.uuid4().hex[:8]}.ndjson.gz")
+    partial_path = file_path + ".part"
+    rows = db.query(AuditLog.__table__).filter(*bounded).order_by(AuditLog.id).execution_options(
+        stream_results=True, yield_per=batch_size)
+
+    # Write to a temporary name and rename once fsynced, so an archive file on disk is always complete
+    row_count = 0
+    with open(partial_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+        for row in rows:
+            record = dict(row._mapping)
+            record["timestamp"] = record["timestamp"].isoformat() if record["timestamp"] else None
+            archive.write((json.dumps(record) + "\n").encode("utf-8"))
+            row_count += 1
+        archive.close()
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(partial_path, file_path)
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as archived:
+        for block in iter(lambda: archived.read(1024 * 1024), b""):
+            digest.update(block)
+
+    record = AuditArchive(month=month, file_path=file_path, row_count=row_count, first_log_id=first_id,
+                          last_log_id=last_id, sha256=digest.hexdigest())
+    db.add(record)
+    db.commit()
+
+    while True:
+        ids = [log_id for log_id, in db.query(AuditLog.id).filter(*bounded).limit(batch_size)]
+        if not ids:
+            break
+        db.query(AuditLog).filter(AuditLog.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+    logger.info(f"Archived {row_count} audit logs for {month:%Y-%m} to {file_path}.")
+    return record
+
+
+class AuditLogger:
+    async def log(
         self,
         user: Optional[User],
         action: str,
         status: str,
         target_type: Optional[str] = None,
         target_id: Optional[str] = None,
-        details: Optional[Dict] = None
+        details: Optional[Dict] = None,
+        durable: bool = False
     ):
-        """Creates a new audit log entry."""
-        log_entry = AuditLog(
-            user_id=user.id if user else None,
-            action=action,
-            status=status,
-            target_type=target_type,
-            target_id=target_id,
-            details=json.dumps(details) if details else None
-        )
-        self.db.add(log_entry)
-        # We don't commit here; the commit will happen at the end of the request lifecycle.
+        """
+        Records an audit entry through `audit_writer`, independent of the request's transaction.
+        Use `durable=True` for compliance-critical actions: the entry is fsynced to the journal first,
+        in the threadpool so the event loop is not blocked.
+        """
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "user_id": user.id if user else None,
+            "action": action,
+            "status": status,
+            "target_type": target_type,
+            "target_id": target_id,
+            "details": json.dumps(details) if details else None
+        }
+        if durable:
+            await run_in_threadpool(audit_writer.submit, entry, True)
+        else:
+            audit_writer.submit(entry)
 
 # --- Audit Logger Dependency ---
-def get_audit_logger(db: Session = DbSession):
+def get_audit_logger():
     """Dependency to provide an AuditLogger instance."""
-    return AuditLogger(db)
+    return AuditLogger()
 
 AuditDep = Depends(get_audit_logger)
 
@@ -1818,51 +3600,21 @@ CurrentPhysician = Depends(get_current_active_physician);
 CurrentSuperuser = Depends(get_current_active_superuser)
 
 
-def generate_prescription_pdf(prescription_data: PrescriptionCreate, physician: Physician,
-                              patient: Patient) -> io.BytesIO:
-    """Generates a professional-looking prescription PDF."""
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    # Header
-    p.setFont("Helvetica-Bold", 16)
-    p.drawString(inch, height - inch, f"Dr. {physician.first_name} {physician.last_name}")
-    p.setFont("Helvetica", 12)
-    p.drawString(inch, height - inch - 0.2 * inch, physician.specialty)
-
-    # Patient Information
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(inch, height - 2 * inch, "Patient Information:")
-    p.setFont("Helvetica", 12)
-    p.drawString(inch, height - 2 * inch - 0.25 * inch, f"Name: {patient.first_name} {patient.last_name}")
-    p.drawString(inch, height - 2 * inch - 0.5 * inch, f"Date of Birth: {patient.date_of_birth.strftime('%Y-%m-%d')}")
-
-    # Prescription Details (Rx)
-    p.setFont("Helvetica-Bold", 24)
-    p.drawString(inch, height - 3 * inch, "Rx")
-    p.line(inch, height - 3 * inch - 0.1 * inch, width - inch, height - 3 * inch - 0.1 * inch)
-
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(inch, height - 3.5 * inch, prescription_data.medication)
-
-    p.setFont("Helvetica", 12)
-    p.drawString(inch, height - 3.8 * inch, f"Dosage: {prescription_data.dosage}")
-    p.drawString(inch, height - 4.1 * inch, f"Frequency: {prescription_data.frequency}")
-    p.drawString(inch, height - 4.4 * inch, f"Duration: {prescription_data.duration}")
-    if prescription_data.notes:
-        p.drawString(inch, height - 4.7 * inch, f"Notes: {prescription_data.notes}")
-
-    # Footer with signature and date
-    signature_line_y = 2 * inch
-    p.line(width - 3.5 * inch, signature_line_y, width - inch, signature_line_y)
-    p.drawString(width - 3.5 * inch, signature_line_y - 0.2 * inch, "Electronic Signature")
-    p.drawString(inch, signature_line_y, f"Date: {datetime.utcnow().strftime('%Y-%m-%d')}")
-
-    p.showPage()
-    p.save()
-    buffer.seek(0)
-    return buffer
+def prescription_pdf_context(prescription_data: PrescriptionCreate, physician: Physician,
+                             patient: Patient) -> Dict[str, Any]:
+    """Collects the fields printed on a prescription into a plain dict for `pdf_renderer`."""
+    return {
+        "physician_name": f"Dr. {physician.first_name} {physician.last_name}",
+        "specialty": physician.specialty,
+        "patient_name": f"{patient.first_name} {patient.last_name}",
+        "date_of_birth": patient.date_of_birth.strftime('%Y-%m-%d'),
+        "medication": prescription_data.medication,
+        "dosage": prescription_data.dosage,
+        "frequency": prescription_data.frequency,
+        "duration": prescription_data.duration,
+        "notes": prescription_data.notes,
+        "date": datetime.utcnow().strftime('%Y-%m-%d'),
+    }
 
 
 def check_feature(feature_name: str):
@@ -1908,51 +3660,70 @@ def check_feature(feature_name: str):
     return Depends(dependency)
 
 
-# --- New PDF Invoice Generation Utility ---
-def generate_invoice_pdf(payment: Payment, user: User, plan: PlanDetail) -> io.BytesIO:
-    """Generates a PDF invoice for a subscription payment."""
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-
-    # Header
-    p.setFont("Helvetica-Bold", 20)
-    p.drawString(inch, height - inch, "INVOICE")
-    p.setFont("Helvetica", 12)
-    p.drawString(width - 3 * inch, height - inch, f"Invoice #: {payment.id[:8]}")
-    p.drawString(width - 3 * inch, height - inch - 0.2 * inch, f"Date: {payment.payment_date.strftime('%Y-%m-%d')}")
-
-    # Billed To
-    p.drawString(inch, height - 2 * inch, "Billed To:")
-    p.drawString(inch, height - 2 * inch - 0.2 * inch, user.email)
-
-    # Line Item Table
-    table_y_start = height - 3 * inch
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(inch, table_y_start, "Description")
-    p.drawString(width - 2.5 * inch, table_y_start, "Amount")
-    p.line(inch, table_y_start - 0.1 * inch, width - inch, table_y_start - 0.1 * inch)
-
-    p.setFont("Helvetica", 12)
-    p.drawString(inch, table_y_start - 0.3 * inch, f"DortMed Subscription - {plan.name} Plan (Monthly)")
-    p.drawString(width - 2.5 * inch, table_y_start - 0.3 * inch, f"{payment.currency} {payment.amount:.2f}")
-
-    # Total
-    total_y = table_y_start - 1 * inch
-    p.line(width - 3 * inch, total_y, width - inch, total_y)
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(width - 3 * inch, total_y + 0.1 * inch, "Total:")
-    p.drawString(width - 2.5 * inch, total_y + 0.1 * inch, f"{payment.currency} {payment.amount:.2f}")
-
-    # Footer
-    p.setFont("Helvetica-Oblique", 10)
-    p.drawString(inch, 1.5 * inch, "Thank you for your business!")
-    p.drawString(inch, 1.3 * inch, "If you have any questions, please contact support@dortmed.com.")
-
-    p.showPage()
-    p.save()
-    buffer.seek(0)
-    return buffer
+# --- PDF Invoice Utility ---
+def invoice_pdf_context(payment: Payment, billed_to: str, plan_name: str) -> Dict[str, Any]:
+    """Collects the fields printed on a subscription invoice into a plain dict for `pdf_renderer`."""
+    return {
+        "invoice_number": payment.id[:8],
+        "date": payment.payment_date.strftime('%Y-%m-%d'),
+        "billed_to": billed_to,
+        "description": f"DortMed Subscription - {plan_name} Plan (Monthly)",
+        "currency": payment.currency,
+        "amount": payment.amount,
+    }
+
+
+def statement_pdf_context(billed_to: str, period: str, payments: List[Payment]) -> Dict[str, Any]:
+    """Collects a user's payments for a period into a plain dict for the statement renderer."""
+    totals: Dict[str, float] = {}
+    for payment in payments:
+        totals[payment.currency] = totals.get(payment.currency, 0.0) + payment.amount
+    return {
+        "billed_to": billed_to,
+        "period": period,
+        "items": [{
+            "date": payment.payment_date.strftime('%Y-%m-%d'),
+            "description": f"Payment {payment.gateway_transaction_id}",
+            "currency": payment.currency,
+            "amount": payment.amount,
+        } for payment in payments],
+        "totals": totals,
+    }
+
+
+async def generate_subscription_invoice(payment_id: str, plan: SubscriptionPlan):
+    """
+    Background job: renders the invoice for a completed payment, uploads it and attaches it to the
+    patient's documents. Runs on its own session because the webhook request has already finished.
+    """
+    db = SessionLocal()
+    try:
+        payment = db.query(Payment).filter(Payment.id == payment_id).first()
+        user = db.query(User).options(joinedload(User.patient_profile)).filter(User.id == payment.user_id).first()
+        plan_details = SUBSCRIPTION_PLANS[plan]
+
+        invoice_bytes = await pdf_renderer.render("invoice", invoice_pdf_context(payment, user.email, plan_details.name))
+        invoice_filename = f"Invoice_{payment.id[:8]}_{user.id[:4]}.pdf"
+        upload_result = await storage_manager.upload_file(
+            file=InMemoryUploadFile(io.BytesIO(invoice_bytes), invoice_filename),
+            user_id=user.id,
+            document_type="invoice"
+        )
+
+        new_invoice_doc = MedicalDocument(
+            id=str(uuid.uuid4()),
+            patient_id=user.patient_profile.id,  # Assuming invoices are tied to patients for now
+            document_type=DocumentType.OTHER,  # Or a new "INVOICE" type if you add it to the Enum
+            file_name=invoice_filename,
+            file_path=upload_result["file_path"],
+            file_url="",
+            description=f"Invoice for {plan_details.name} Subscription"
+        )
+        db.add(new_invoice_doc)
+        db.commit()
+        logger.info(f"Invoice {invoice_filename} generated and saved for user {user.id}")
+    finally:
+        db.close()
 
 
 class HealthStatus(BaseModel):
@@ -2076,17 +3847,17 @@ async def login(
         # --- Initial Validation ---
         if not user:
             # Log the attempt against the email address, even if the user doesn't exist
-            audit.log(None, "USER_LOGIN_FAILURE", "FAILURE", details={"email_attempt": form_data.username, **details})
+            await audit.log(None, "USER_LOGIN_FAILURE", "FAILURE", details={"email_attempt": form_data.username, **details})
             raise HTTPException(status_code=401, detail="Incorrect email or password",
                                 headers={"WWW-Authenticate": "Bearer"})
 
         if not PasswordManager.verify_password(form_data.password, user.hashed_password):
-            audit.log(user, "USER_LOGIN_FAILURE", "FAILURE", details={"reason": "Invalid Password", **details})
+            await audit.log(user, "USER_LOGIN_FAILURE", "FAILURE", details={"reason": "Invalid Password", **details})
             raise HTTPException(status_code=401, detail="Incorrect email or password",
                                 headers={"WWW-Authenticate": "Bearer"})
 
         if not user.is_active:
-            audit.log(user, "USER_LOGIN_FAILURE", "FAILURE", details={"reason": "Inactive User Account", **details})
+            await audit.log(user, "USER_LOGIN_FAILURE", "FAILURE", details={"reason": "Inactive User Account", **details})
             raise HTTPException(status_code=400, detail="User account is inactive.")
 
         # --- Two-Factor Authentication Check ---
@@ -2097,7 +3868,7 @@ async def login(
                 raise HTTPException(status_code=401, detail="2FA_REQUIRED")
 
             if not user.tfa_secret or not tfa_service.verify_otp(user.tfa_secret, otp):
-                audit.log(user, "USER_LOGIN_2FA_FAILURE", "FAILURE", details=details)
+                await audit.log(user, "USER_LOGIN_2FA_FAILURE", "FAILURE", details=details)
                 raise HTTPException(status_code=401, detail="Invalid 2FA code.")
 
         # --- Success Case ---
@@ -2105,9 +3876,9 @@ async def login(
         user.last_login = datetime.utcnow()
         db.flush()  # Ensure last_login time is part of the transaction
 
-        audit.log(user, "USER_LOGIN_SUCCESS", "SUCCESS", details=details)
+        await audit.log(user, "USER_LOGIN_SUCCESS", "SUCCESS", details=details)
 
-        # Commit all changes (last_login and audit log)
+        # Commit the last_login update
         db.commit()
 
         # Generate and return tokens
@@ -2116,10 +3887,9 @@ async def login(
 
         return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
-    except HTTPException as e:
-        # This block catches the raised exceptions, commits the audit log, then re-raises.
-        db.commit()  # Commit the audit log entry for the failure
-        raise e
+    except HTTPException:
+        # Failure audit entries are already queued with the audit writer
+        raise
     except Exception as e:
         # Catch any other unexpected errors
         db.rollback()  # Rollback any unexpected DB changes
@@ -2249,13 +4019,12 @@ async def verify_2fa_after_firebase_login(request: Request,
             raise HTTPException(status_code=401, detail="2FA_REQUIRED")
 
         if not user.tfa_secret or not tfa_service.verify_otp(user.tfa_secret, otp):
-            audit.log(user, "USER_LOGIN_2FA_FAILURE", "FAILURE", details=details)
-            db.commit()
+            await audit.log(user, "USER_LOGIN_2FA_FAILURE", "FAILURE", details=details)
             raise HTTPException(status_code=401, detail="Invalid 2FA code.")
 
     # If we reach here, login is fully successful.
     user.last_login = datetime.utcnow()
-    audit.log(user, "USER_LOGIN_SUCCESS", "SUCCESS", details=details)
+    await audit.log(user, "USER_LOGIN_SUCCESS", "SUCCESS", details=details)
     db.commit()
 
     return {"status": "Login successful"}
@@ -2386,11 +4155,13 @@ async def upload_doc(user: User = CurrentPatient, db: Session = DbSession, type:
 @patient_router.get("/documents", response_model=List[MedicalDocumentResponse])
 async def list_docs(user: User = CurrentPatient, db: Session = DbSession):
     docs = db.query(MedicalDocument).filter(MedicalDocument.patient_id == user.patient_profile.id).all()
-    for doc in docs: doc.file_url = storage_manager.get_download_url(doc.file_path)
+    # Document rows are only written after a successful upload, so the existence probe can be skipped
+    urls = await storage_manager.get_download_urls([doc.file_path for doc in docs], verify_exists=False)
+    for doc in docs: doc.file_url = urls[doc.file_path]
     return docs
 
 
-@patient_router.get("/appointments", response_model=List[AppointmentForPatient])
+@patient_router.get("/appointments", response_model=List[AppointmentForPatient], response_class=FastJSONResponse)
 async def get_patient_appointments(user: User = CurrentPatient, db: Session = DbSession):
     """
     (Patient) Gets a list of all their past and upcoming appointments.
@@ -2401,17 +4172,9 @@ async def get_patient_appointments(user: User = CurrentPatient, db: Session = Db
         Appointment.patient_id == user.patient_profile.id
     ).order_by(Appointment.appointment_time.desc()).all()
 
-    response = []
-    for appt in appointments:
-        physician_profile = PhysicianPublicProfile(
-            **appt.physician.__dict__,
-            email=appt.physician.user.email
-        )
-        response.append(AppointmentForPatient(
-            **appt.__dict__,
-            physician=physician_profile
-        ))
-    return response
+    response = [construct_from_orm(AppointmentForPatient, appt, physician=physician_public_profile(appt.physician))
+                for appt in appointments]
+    return orm_json_response(List[AppointmentForPatient], response, validated=True)
 
 
 @patient_router.post("/documents/upload/ocr", response_model=OCRResult, dependencies=[check_feature("OCR_UPLOAD")])
@@ -2430,8 +4193,9 @@ async def upload_lab_result_for_ocr(
     # `httpx` can handle `UploadFile` objects.
     files = {'file': (file.filename, file.file, file.content_type)}
 
+    OCR_REQUESTS_IN_FLIGHT.inc()
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient() as client, observe_upstream("ocr"):
             response = await client.post(
                 f"{settings.OCR_SERVICE_URL}/ocr/process-lab-result",
                 files=files,
@@ -2444,6 +4208,8 @@ async def upload_lab_result_for_ocr(
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code,
                             detail=f"OCR service error: {e.response.json().get('detail', 'Unknown error')}")
+    finally:
+        OCR_REQUESTS_IN_FLIGHT.dec()
 
     # Here, we just return the data for confirmation. A subsequent request would be
     # needed from the frontend to save this data and the original file.
@@ -2492,12 +4258,83 @@ async def get_dashboard_summary(user: User = CurrentPatient, db: Session = DbSes
             link="/patient/find-doctor"
         ))
 
+    # Alerts from measured vitals, evaluated against the hourly/daily aggregates
+    ai_alerts.extend(evaluate_vital_alerts(db, user.patient_profile.id))
+
     return PatientDashboardSummary(
         upcoming_appointments=upcoming_appointments_query,
         ai_alerts=ai_alerts
     )
 
 
+# Rules over PatientVitalAggregate. "sustained_high" fires when the average is at or above `threshold` in
+# each of the latest `buckets` buckets with data inside `window`; "rising" fires when the average over the
+# latest `window` is `rise` (a fraction) above the window before it and at or above `threshold`.
+VITAL_ALERT_RULES = [
+    {"id": "sustained_high_systolic_bp", "vital_type": "systolic_bp", "kind": "sustained_high", "granularity": "day",
+     "window": timedelta(days=7), "buckets": 3, "threshold": 140.0,
+     "text": "Your systolic blood pressure has averaged {value:.0f} mmHg or more on each of your last {buckets} "
+             "measured days. Consider booking a consultation."},
+    {"id": "sustained_high_diastolic_bp", "vital_type": "diastolic_bp", "kind": "sustained_high", "granularity": "day",
+     "window": timedelta(days=7), "buckets": 3, "threshold": 90.0,
+     "text": "Your diastolic blood pressure has averaged {value:.0f} mmHg or more on each of your last {buckets} "
+             "measured days. Consider booking a consultation."},
+    {"id": "sustained_high_heart_rate", "vital_type": "heart_rate", "kind": "sustained_high", "granularity": "hour",
+     "window": timedelta(hours=24), "buckets": 3, "threshold": 100.0,
+     "text": "Your heart rate has averaged {value:.0f} bpm or more for {buckets} recent hours."},
+    {"id": "rising_blood_glucose", "vital_type": "blood_glucose", "kind": "rising", "granularity": "day",
+     "window": timedelta(days=7), "rise": 0.10, "threshold": 100.0,
+     "text": "Your average blood glucose rose {rise:.0%} this week to {value:.0f} mg/dL. "
+             "Consider discussing it with your doctor."},
+]
+
+
+def evaluate_vital_alerts(db: Session, patient_id: str) -> List[DashboardAlert]:
+    """
+    Evaluates VITAL_ALERT_RULES for one patient with a single indexed read of recent aggregate buckets,
+    so the cost depends on the number of buckets in the rule windows rather than on raw data volume.
+    """
+    now = datetime.utcnow()
+    windows = {}
+    for rule in VITAL_ALERT_RULES:
+        span = rule["window"] * (2 if rule["kind"] == "rising" else 1)
+        key = (rule["vital_type"], rule["granularity"])
+        windows[key] = max(windows.get(key, span), span)
+    aggregates = defaultdict(list)
+    rows = db.query(PatientVitalAggregate).filter(
+        PatientVitalAggregate.patient_id == patient_id,
+        or_(*[and_(PatientVitalAggregate.vital_type == vital_type, PatientVitalAggregate.granularity == granularity,
+                   PatientVitalAggregate.bucket_start >= vital_bucket_start(now - span, granularity))
+              for (vital_type, granularity), span in windows.items()])
+    ).order_by(PatientVitalAggregate.bucket_start.desc()).all()
+    for aggregate in rows:
+        aggregates[(aggregate.vital_type, aggregate.granularity)].append(aggregate)
+
+    alerts = []
+    for rule in VITAL_ALERT_RULES:
+        buckets = aggregates[(rule["vital_type"], rule["granularity"])]
+        window_start = vital_bucket_start(now - rule["window"], rule["granularity"])
+        if rule["kind"] == "sustained_high":
+            latest = [agg for agg in buckets if agg.bucket_start >= window_start][:rule["buckets"]]
+            if len(latest) == rule["buckets"] and all(agg.average >= rule["threshold"] for agg in latest):
+                alerts.append(DashboardAlert(
+                    id=rule["id"], type="warning", link="/patient/find-doctor",
+                    text=rule["text"].format(value=rule["threshold"], buckets=rule["buckets"])))
+        else:
+            recent = [agg for agg in buckets if agg.bucket_start >= window_start]
+            previous = [agg for agg in buckets if agg.bucket_start < window_start]
+            if not recent or not previous:
+                continue
+            recent_avg = sum(agg.value_sum for agg in recent) / sum(agg.count for agg in recent)
+            previous_avg = sum(agg.value_sum for agg in previous) / sum(agg.count for agg in previous)
+            rise = (recent_avg - previous_avg) / previous_avg if previous_avg else 0.0
+            if recent_avg >= rule["threshold"] and rise >= rule["rise"]:
+                alerts.append(DashboardAlert(
+                    id=rule["id"], type="warning", link="/patient/find-doctor",
+                    text=rule["text"].format(value=recent_avg, rise=rise)))
+    return alerts
+
+
 @patient_router.post("/appointments/{appointment_id}/feedback", status_code=status.HTTP_201_CREATED)
 async def submit_appointment_feedback(
         appointment_id: str,
@@ -2536,11 +4373,68 @@ async def submit_appointment_feedback(
     return {"status": "Feedback submitted successfully."}
 
 
+EPOCH = datetime(1970, 1, 1)
+
+
+def downsample_vitals(db: Session, patient_id: str, vital_type: str, start: datetime, end: datetime,
+                      max_points: int) -> PatientVitalsOut:
+    """
+    Series for a time range with at most `max_points` points. Ranges holding more raw points than that
+    are aggregated in the database into equal-width buckets (min/max/avg per bucket), so the cost of
+    the response does not grow with the density of the underlying data.
+    """
+    in_range = (
+        PatientVital.patient_id == patient_id,
+        PatientVital.vital_type == vital_type,
+        PatientVital.timestamp >= start,
+        PatientVital.timestamp < end,
+    )
+    raw = db.query(PatientVital.timestamp, PatientVital.value).filter(*in_range) \
+        .order_by(PatientVital.timestamp).limit(max_points + 1).all()
+    if len(raw) <= max_points:
+        return PatientVitalsOut(vital_type=vital_type,
+                                data_points=[VitalDataPoint(timestamp=t, value=v) for t, v in raw])
+
+    start_epoch = int((start - EPOCH).total_seconds())
+    bucket_seconds = max(1, math.ceil((end - start).total_seconds() / max_points))
+    # Integer arithmetic on both dialects: whole seconds since `start`, truncated to the bucket
+    bucket = (cast(extract("epoch", PatientVital.timestamp), BigInteger) - start_epoch) // bucket_seconds
+    rows = db.query(
+        bucket.label("bucket"), func.avg(PatientVital.value), func.min(PatientVital.value), func.max(PatientVital.value)
+    ).filter(*in_range).group_by(bucket).order_by(bucket).all()
+    return PatientVitalsOut(
+        vital_type=vital_type,
+        bucket_seconds=bucket_seconds,
+        data_points=[
+            VitalDataPoint(timestamp=start + timedelta(seconds=int(index) * bucket_seconds),
+                           value=avg, min=low, max=high)
+            for index, avg, low, high in rows
+        ]
+    )
+
+
 @patient_router.get("/vitals/{vital_type}", response_model=PatientVitalsOut)
-async def get_patient_vitals(vital_type: str, user: User = CurrentPatient, db: Session = DbSession):
+async def get_patient_vitals(
+        vital_type: str,
+        start: Optional[datetime] = Query(None, description="Range start (inclusive); enables downsampling"),
+        end: Optional[datetime] = Query(None, description="Range end (exclusive), defaults to now"),
+        max_points: int = Query(500, ge=10, le=5000),
+        user: User = CurrentPatient,
+        db: Session = DbSession
+):
     """
     Retrieves time-series data for a specific vital sign for the logged-in patient.
+    Without `start`, returns the latest 30 raw points; with a range, returns at most `max_points`
+    points, downsampled to min/max/avg buckets when the range is denser than that.
     """
+    if start:
+        # Clients send ISO strings such as toISOString()'s "...Z"; stored timestamps are naive UTC
+        start = naive_utc(start)
+        end = naive_utc(end) if end else datetime.utcnow()
+        if start >= end:
+            raise HTTPException(status_code=400, detail="start must be before end.")
+        return downsample_vitals(db, user.patient_profile.id, vital_type, start, end, max_points)
+
     # Fetch the last 30 data points for the given vital type
     vitals = db.query(PatientVital).filter(
         PatientVital.patient_id == user.patient_profile.id,
@@ -2559,6 +4453,10 @@ class VitalCreate(BaseModel):
     value: float
     timestamp: Optional[datetime] = None # Allow user to back-date an entry
 
+
+class VitalBatchCreate(BaseModel):
+    points: List[VitalCreate] = Field(..., min_length=1)
+
 @patient_router.post("/vitals", status_code=status.HTTP_201_CREATED)
 async def record_patient_vital(
     vital_data: VitalCreate,
@@ -2566,17 +4464,29 @@ async def record_patient_vital(
     db: Session = DbSession
 ):
     """(Patient) Records a new vital sign measurement."""
-    new_vital = PatientVital(
-        patient_id=user.patient_profile.id,
-        vital_type=vital_data.vital_type,
-        value=vital_data.value,
-        timestamp=vital_data.timestamp or datetime.utcnow()
-    )
-    db.add(new_vital)
+    ingest_vitals(db, user.patient_profile.id, [vital_data.model_dump()])
     db.commit()
     return {"status": "Vital sign recorded successfully."}
 
 
+@patient_router.post("/vitals/batch", status_code=status.HTTP_201_CREATED)
+async def record_patient_vitals_batch(
+    batch: VitalBatchCreate,
+    user: User = CurrentPatient,
+    db: Session = DbSession
+):
+    """
+    (Patient) Bulk ingestion for connected devices: stores up to VITALS_BATCH_MAX_POINTS measurements
+    and their aggregate updates in a single transaction.
+    """
+    if len(batch.points) > settings.VITALS_BATCH_MAX_POINTS:
+        raise HTTPException(status_code=413,
+                            detail=f"At most {settings.VITALS_BATCH_MAX_POINTS} points per request.")
+    count = ingest_vitals(db, user.patient_profile.id, [point.model_dump() for point in batch.points])
+    db.commit()
+    return {"status": "Vital signs recorded successfully.", "count": count}
+
+
 # --- Physician & Appointment Routers ---
 physician_router = APIRouter(prefix="/api/physician", tags=["Physician Portal"],
                              dependencies=[Depends(get_current_active_physician)])
@@ -2602,7 +4512,7 @@ async def get_physician_appointments(user: User = CurrentPhysician, db: Session
         Appointment.physician_id == user.physician_profile.id).all()
 
 
-@physician_router.get("/my-patients", response_model=List[PatientInfoForPhysician])
+@physician_router.get("/my-patients", response_model=List[PatientInfoForPhysician], response_class=FastJSONResponse)
 async def get_my_patients(user: User = CurrentPhysician, db: Session = DbSession):
     """
     (Physician) Gets a list of all unique patients the physician has had an appointment with.
@@ -2619,16 +4529,8 @@ async def get_my_patients(user: User = CurrentPhysician, db: Session = DbSession
 
     patients = db.query(Patient).options(joinedload(Patient.user)).filter(Patient.id.in_(patient_ids_list)).all()
 
-    # Structure the response
-    response = []
-    for patient in patients:
-        response.append(PatientInfoForPhysician(
-            **patient.__dict__,
-            email=patient.user.email,
-            phone_number=patient.user.phone_number
-        ))
-
-    return response
+    response = [construct_from_orm(PatientInfoForPhysician, patient) for patient in patients]
+    return orm_json_response(List[PatientInfoForPhysician], response, validated=True)
 
 
 @physician_router.get("/patients/{patient_id}/full-profile", response_model=PatientFullProfileForPhysician)
@@ -2652,9 +4554,8 @@ async def get_patient_full_profile(request: Request,
     ).first()
 
     if not relationship_exists:
-        audit.log(user, "VIEW_PATIENT_RECORD", "FAILURE", target_type="Patient", target_id=patient_id,
-                  details={"reason": "No Professional Relationship", **details})
-        db.commit()  # Commit the audit log
+        await audit.log(user, "VIEW_PATIENT_RECORD", "FAILURE", target_type="Patient", target_id=patient_id,
+                        details={"reason": "No Professional Relationship", **details}, durable=True)
         raise HTTPException(status_code=403,
                             detail="Access denied. You do not have a professional relationship with this patient.")
 
@@ -2665,19 +4566,20 @@ async def get_patient_full_profile(request: Request,
     ).filter(Patient.id == patient_id).first()
 
     if not patient:
-        audit.log(user, "VIEW_PATIENT_RECORD", "FAILURE", target_type="Patient", target_id=patient_id,
-                  details={"reason": "Patient Not Found", **details})
-        db.commit()  # Commit the audit log
+        await audit.log(user, "VIEW_PATIENT_RECORD", "FAILURE", target_type="Patient", target_id=patient_id,
+                        details={"reason": "Patient Not Found", **details}, durable=True)
         raise HTTPException(status_code=404, detail="Patient not found.")
 
     # 3. Log the successful access
-    audit.log(user, "VIEW_PATIENT_RECORD", "SUCCESS", target_type="Patient", target_id=patient_id, details=details)
-    db.commit()  # Commit the audit log
+    await audit.log(user, "VIEW_PATIENT_RECORD", "SUCCESS", target_type="Patient", target_id=patient_id,
+                    details=details, durable=True)
 
     # 4. Prepare and return the data
     # Generate secure download URLs for the documents
+    urls = await storage_manager.get_download_urls([doc.file_path for doc in patient.documents],
+                                                   verify_exists=False)
     for doc in patient.documents:
-        doc.file_url = storage_manager.get_download_url(doc.file_path)
+        doc.file_url = urls[doc.file_path]
 
     return PatientFullProfileForPhysician(
         **patient.__dict__,
@@ -2702,32 +4604,18 @@ async def create_e_prescription(request: Request,
 
     patient = db.query(Patient).filter(Patient.id == prescription_data.patient_id).first()
     if not patient:
-        audit.log(user, "CREATE_E_PRESCRIPTION", "FAILURE", target_type="Patient",
-                  target_id=prescription_data.patient_id, details={"reason": "Patient Not Found", **details})
-        db.commit()
+        await audit.log(user, "CREATE_E_PRESCRIPTION", "FAILURE", target_type="Patient",
+                        target_id=prescription_data.patient_id, details={"reason": "Patient Not Found", **details},
+                        durable=True)
         raise HTTPException(status_code=404, detail="Patient not found.")
 
     try:
-        # Generate the PDF in memory
-        pdf_buffer = generate_prescription_pdf(prescription_data, user.physician_profile, patient)
+        # Render the PDF off the event loop
+        pdf_bytes = await pdf_renderer.render(
+            "prescription", prescription_pdf_context(prescription_data, user.physician_profile, patient))
 
         pdf_filename = f"Prescription_{prescription_data.medication.replace(' ', '_')}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.pdf"
-
-        # Helper class to adapt BytesIO to the UploadFile interface
-        class InMemoryUploadFile:
-            def __init__(self, file, filename):
-                self.file = file
-                self.filename = filename
-                self.content_type = "application/pdf"
-
-            async def read(self):
-                return self.file.read()
-
-            @property
-            def size(self):
-                return self.file.getbuffer().nbytes
-
-        in_memory_file = InMemoryUploadFile(pdf_buffer, pdf_filename)
+        in_memory_file = InMemoryUploadFile(io.BytesIO(pdf_bytes), pdf_filename)
 
         # Upload the generated PDF to Firebase Storage
         upload_result = await storage_manager.upload_file(
@@ -2747,9 +4635,10 @@ async def create_e_prescription(request: Request,
             description=f"E-Prescription for {prescription_data.medication} by Dr. {user.physician_profile.last_name}"
         )
         db.add(new_document)
-        db.flush()  # Flush to get the new_document.id
+        db.commit()
+        db.refresh(new_document)
 
-        # Log the successful action
+        # Log the successful action once the document is committed
         audit_details = {
             "medication": prescription_data.medication,
             "dosage": prescription_data.dosage,
@@ -2757,24 +4646,19 @@ async def create_e_prescription(request: Request,
             "document_id": new_document.id,
             **details
         }
-        audit.log(
+        await audit.log(
             user, "CREATE_E_PRESCRIPTION", "SUCCESS",
             target_type="Patient", target_id=prescription_data.patient_id,
-            details=audit_details
+            details=audit_details, durable=True
         )
 
-        # Commit all changes (new document and audit log)
-        db.commit()
-        db.refresh(new_document)
-
         return new_document
 
     except Exception as e:
         db.rollback()
         logger.error(f"Failed to create e-prescription for patient {prescription_data.patient_id}: {e}", exc_info=True)
-        audit.log(user, "CREATE_E_PRESCRIPTION", "FAILURE", target_type="Patient",
-                  target_id=prescription_data.patient_id, details={"error": str(e), **details})
-        db.commit()
+        await audit.log(user, "CREATE_E_PRESCRIPTION", "FAILURE", target_type="Patient",
+                        target_id=prescription_data.patient_id, details={"error": str(e), **details}, durable=True)
         raise HTTPException(status_code=500, detail="An error occurred while creating the prescription.")
 
 
@@ -2785,58 +4669,33 @@ async def get_practice_analytics(user: User = CurrentPhysician, db: Session = Db
     """
     physician_id = user.physician_profile.id
 
-    avg_rating_query = db.query(func.avg(AppointmentFeedback.rating)).filter(
-        AppointmentFeedback.physician_id == physician_id
-    ).scalar()
-    patient_satisfaction_score = round(avg_rating_query, 2) if avg_rating_query else 0.0
-    # 1. Total Completed Consultations
-    total_consultations = db.query(Appointment).filter(
-        Appointment.physician_id == physician_id,
-        Appointment.status == AppointmentStatus.COMPLETED
-    ).count()
-
-    # 2. Average Consultation Duration (real calculation)
-    avg_duration_query = db.query(func.avg(Appointment.duration_minutes)).filter(
-        Appointment.physician_id == physician_id,
-        Appointment.status == AppointmentStatus.COMPLETED
-    ).scalar()
-    average_consultation_duration = round(avg_duration_query, 1) if avg_duration_query else 0.0
-
-    # 3. Patient Satisfaction Score (mocked, as we don't have a feedback system)
-    # A real implementation would query a `Feedbacks` table.
-    patient_satisfaction_score = 4.8
-
-    # 4. Monthly Consultation Volume (real calculation for the last 6 months)
-
-    from datetime import date
-    from dateutil.relativedelta import relativedelta
-
-
-    six_months_ago = date.today() - relativedelta(months=5)
-    six_months_ago = six_months_ago.replace(day=1)
-
-
-    monthly_counts = db.query(
-        func.strftime('%Y-%m', Appointment.appointment_time).label('month'),
-        func.count(Appointment.id).label('count')
-    ).filter(
-        Appointment.physician_id == physician_id,
-        Appointment.status == AppointmentStatus.COMPLETED,
-        Appointment.appointment_time >= six_months_ago
-    ).group_by('month').order_by('month').all()
-
-    # Format the data into a dictionary of {MonthName: count}
+    # Single indexed read over the daily rollup, grouped into calendar months
+    year = extract("year", PhysicianDailyStats.day)
+    month = extract("month", PhysicianDailyStats.day)
+    monthly_rows = db.query(
+        year, month,
+        func.sum(PhysicianDailyStats.completed_consultations),
+        func.sum(PhysicianDailyStats.duration_minutes_sum),
+        func.sum(PhysicianDailyStats.rating_sum),
+        func.sum(PhysicianDailyStats.rating_count)
+    ).filter(PhysicianDailyStats.physician_id == physician_id).group_by(year, month).all()
+
+    total_consultations = sum(row[2] or 0 for row in monthly_rows)
+    total_duration = sum(row[3] or 0 for row in monthly_rows)
+    rating_sum = sum(row[4] or 0 for row in monthly_rows)
+    rating_count = sum(row[5] or 0 for row in monthly_rows)
+    average_consultation_duration = round(total_duration / total_consultations, 1) if total_consultations else 0.0
+    patient_satisfaction_score = round(rating_sum / rating_count, 2) if rating_count else 0.0
+
+    # Monthly consultation volume for the last 6 months, oldest first, with empty months as 0
+    counts_by_month = {(int(row[0]), int(row[1])): row[2] or 0 for row in monthly_rows}
+    today = datetime.utcnow()
     monthly_consultations = {}
-    for year_month, count in monthly_counts:
-        month_name = datetime.strptime(year_month, '%Y-%m').strftime('%b')
-        monthly_consultations[month_name] = count
-
-    # Fill in any missing months with 0
-    for i in range(6):
-        month = date.today() - relativedelta(months=i)
-        month_name = month.strftime('%b')
-        if month_name not in monthly_consultations:
-            monthly_consultations[month_name] = 0
+    for months_back in range(5, -1, -1):
+        month_index = today.year * 12 + today.month - 1 - months_back
+        month_year, month_number = divmod(month_index, 12)
+        month_name = datetime(month_year, month_number + 1, 1).strftime('%b')
+        monthly_consultations[month_name] = counts_by_month.get((month_year, month_number + 1), 0)
 
     return PracticeAnalytics(
         total_consultations=total_consultations,
@@ -2847,11 +4706,12 @@ async def get_practice_analytics(user: User = CurrentPhysician, db: Session = Db
 
 
 @physician_router.get("/development/resources", response_model=List[ProfessionalResourceOut])
-async def get_professional_resources(db: Session = DbSession):
+async def get_professional_resources(request: Request, db: Session = DbSession):
     """
     Retrieves all professional development resources.
     """
-    return db.query(ProfessionalResource).all()
+    return response_cache.serve(request, "resources", List[ProfessionalResourceOut],
+                                lambda: db.query(ProfessionalResource).all(), public=False)
 
 
 
@@ -2863,6 +4723,7 @@ async def create_blog_post(post_data: BlogPostCreate, user: User = CurrentSuperu
     db.add(new_post)
     db.commit()
     db.refresh(new_post)
+    response_cache.invalidate("blog")
     return BlogPostOut(**new_post.__dict__, author_email=user.email)
 
 @cms_router.get("/posts", response_model=List[BlogPostOut])
@@ -2881,6 +4742,7 @@ async def update_blog_post(post_id: int, post_data: BlogPostCreate, user: User =
     post.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(post)
+    response_cache.invalidate("blog")
     return BlogPostOut(**post.__dict__, author_email=post.author.email if post.author else "System")
 
 @cms_router.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -2890,16 +4752,58 @@ async def delete_blog_post(post_id: int, db: Session = DbSession):
         raise HTTPException(status_code=404, detail="Post not found.")
     db.delete(post)
     db.commit()
+    response_cache.invalidate("blog")
     return None
 
 # --- New Public Router for Blog Posts ---
 blog_router = APIRouter(prefix="/api/blog", tags=["Blog"])
 
-@blog_router.get("/posts", response_model=List[BlogPostOut])
-async def get_public_blog_posts(db: Session = DbSession):
-    """Public endpoint to fetch all blog posts for the Health Hub."""
-    posts = db.query(BlogPost).options(joinedload(BlogPost.author)).order_by(BlogPost.created_at.desc()).all()
-    return [BlogPostOut(**post.__dict__, author_email=post.author.email if post.author else "System") for post in posts]
+def shorten_excerpt(text: str) -> str:
+    """Trims a database excerpt back to a word boundary when the post is longer than the excerpt."""
+    if len(text) <= BLOG_EXCERPT_LENGTH:
+        return text
+    shortened = text[:BLOG_EXCERPT_LENGTH]
+    if not text[BLOG_EXCERPT_LENGTH].isspace():
+        shortened = shortened.rsplit(" ", 1)[0]  # Drop the word cut off at the limit
+    return shortened.rstrip(" ,.;:") + "..."
+
+
+@blog_router.get("/posts", response_model=PaginatedBlogPosts)
+async def get_public_blog_posts(
+        request: Request,
+        page: int = Query(1, ge=1),
+        size: int = Query(12, ge=1, le=50),
+        db: Session = DbSession
+):
+    """
+    Public endpoint listing Health Hub posts newest first, one page at a time. Only the title, a short
+    excerpt and the author are returned; fetch `/posts/{post_id}` for the full content.
+    """
+    def build():
+        total = db.query(func.count(BlogPost.id)).scalar()
+        posts = db.query(BlogPost).options(
+            defer(BlogPost.content), undefer(BlogPost.excerpt), joinedload(BlogPost.author)
+        ).order_by(BlogPost.created_at.desc(), BlogPost.id.desc()).offset((page - 1) * size).limit(size).all()
+        return PaginatedBlogPosts(
+            total=total, page=page, size=size, pages=math.ceil(total / size) if total else 0,
+            items=[BlogPostSummary(id=post.id, title=post.title, excerpt=shorten_excerpt(post.excerpt or ""),
+                                   author_email=post.author.email if post.author else "System",
+                                   created_at=post.created_at, updated_at=post.updated_at)
+                   for post in posts]
+        )
+    return response_cache.serve(request, "blog", PaginatedBlogPosts, build)
+
+
+@blog_router.get("/posts/{post_id}", response_model=BlogPostOut)
+async def get_public_blog_post(post_id: int, request: Request, db: Session = DbSession):
+    """Public endpoint to fetch one Health Hub post with its full content."""
+    def build():
+        post = db.query(BlogPost).options(joinedload(BlogPost.author)).filter(BlogPost.id == post_id).first()
+        if not post:
+            raise HTTPException(status_code=404, detail="Post not found.")
+        return BlogPostOut(id=post.id, title=post.title, content=post.content, created_at=post.created_at,
+                           updated_at=post.updated_at, author_email=post.author.email if post.author else "System")
+    return response_cache.serve(request, "blog", BlogPostOut, build)
 
 
 
@@ -3055,7 +4959,8 @@ async def cancel_appointment(
     return None
 
 
-@appointment_router.get("/physicians/search/geo", response_model=List[PhysicianPublicProfile])
+@appointment_router.get("/physicians/search/geo", response_model=List[PhysicianPublicProfile],
+                        response_class=FastJSONResponse)
 async def search_physicians_geospatial(
         latitude: float = Query(..., ge=-90, le=90),
         longitude: float = Query(..., ge=-180, le=180),
@@ -3095,25 +5000,13 @@ async def search_physicians_geospatial(
 
     results = query.all()
 
-    # 6. Format the response
+    # 6. Format the response: profiles are built straight from the rows and serialized once
     response_list = []
     for physician, distance in results:
-        schedule = None
-        if physician.availability_schedule:
-            try:
-                schedule = json.loads(physician.availability_schedule)
-            except:
-                schedule = None
-
-        public_profile = PhysicianPublicProfile(
-            **physician.__dict__,
-            email=physician.user.email,
-            availability_schedule=schedule,
-            distance_km=round(distance, 2)  # Add the calculated distance to the response
-        )
-        response_list.append(public_profile)
+        # Add the calculated distance to the response
+        response_list.append(physician_public_profile(physician, distance_km=round(distance, 2)))
 
-    return response_list
+    return orm_json_response(List[PhysicianPublicProfile], response_list, validated=True)
 
 
 # --- Superuser Router ---
@@ -3121,13 +5014,85 @@ admin_router = APIRouter(prefix="/api/admin", tags=["Superuser Portal"],
                          dependencies=[Depends(get_current_active_superuser)])
 
 
+def encode_user_cursor(user: User) -> str:
+    payload = json.dumps([user.created_at.isoformat(), user.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_user_cursor(cursor: str):
+    try:
+        created_at, user_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), user_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def email_prefix_filter(prefix: str):
+    """Case-insensitive `lower(email) LIKE 'prefix%'`, served by the ix_users_email_lower index."""
+    pattern = prefix.lower().replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+    return func.lower(User.email).like(pattern, escape="/")
+
+
+user_count_cache = TTLCache(max_size=256)
+
+
+def count_users(db: Session, role: Optional[UserRole], email_prefix: Optional[str]):
+    """
+    Total for the admin user list, cached briefly per filter. Unfiltered totals on large PostgreSQL
+    tables use the planner's row estimate instead of a full COUNT(*). Returns (total, is_estimate).
+    """
+    cache_key = (role, email_prefix)
+    cached = user_count_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    result = None
+    if not role and not email_prefix and db.bind.dialect.name == "postgresql":
+        estimate = db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'users'")).scalar()
+        if estimate and estimate > settings.USER_COUNT_ESTIMATE_THRESHOLD:
+            result = (int(estimate), True)
+    if result is None:
+        query = db.query(func.count(User.id))
+        if role: query = query.filter(User.role == role)
+        if email_prefix: query = query.filter(email_prefix_filter(email_prefix))
+        result = (query.scalar(), False)
+
+    user_count_cache.set(cache_key, result, settings.USER_COUNT_CACHE_TTL_SECONDS)
+    return result
+
+
 @admin_router.get("/users", response_model=PaginatedUsersResponse)
-async def list_users(db: Session = DbSession, page: int = 1, size: int = 20, role: Optional[UserRole] = None):
+async def list_users(db: Session = DbSession, page: int = Query(1, ge=1), size: int = Query(20, ge=1, le=100),
+                     role: Optional[UserRole] = None,
+                     search: Optional[str] = Query(None, description="Email prefix"),
+                     cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page")):
+    """
+    (Admin) Lists users, newest first. Pages are fetched by keyset on (created_at, id) when `cursor` is
+    given, so deep pages cost the same as the first; `page` alone still works for shallow offsets.
+    """
+    email_prefix = search.strip().lower() if search and search.strip() else None
     query = db.query(User).options(joinedload(User.patient_profile), joinedload(User.physician_profile))
     if role: query = query.filter(User.role == role)
-    total = query.count()
-    users = query.offset((page - 1) * size).limit(size).all()
-    return {"total": total, "page": page, "size": size, "pages": math.ceil(total / size), "items": users}
+    if email_prefix: query = query.filter(email_prefix_filter(email_prefix))
+    query = query.order_by(User.created_at.desc(), User.id.desc())
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_user_cursor(cursor)
+        query = query.filter(or_(
+            User.created_at < cursor_created_at,
+            and_(User.created_at == cursor_created_at, User.id < cursor_id)
+        ))
+    else:
+        query = query.offset((page - 1) * size)
+
+    # Fetch one extra row to learn whether another page exists without counting
+    users = query.limit(size + 1).all()
+    next_cursor = encode_user_cursor(users[size - 1]) if len(users) > size else None
+    users = users[:size]
+
+    total, total_is_estimate = count_users(db, role, email_prefix)
+    return {"total": total, "page": page, "size": size, "pages": math.ceil(total / size), "items": users,
+            "next_cursor": next_cursor, "total_is_estimate": total_is_estimate}
 
 
 @admin_router.get("/physicians/pending-verification", response_model=List[UserAdminView])
@@ -3152,6 +5117,7 @@ async def create_hospital(hospital_data: HospitalCreate, db: Session = DbSession
     db.add(new_hospital)
     db.commit()
     db.refresh(new_hospital)
+    response_cache.invalidate("hospitals")
     return new_hospital
 
 
@@ -3178,6 +5144,7 @@ async def update_hospital(hospital_id: str, update_data: HospitalUpdate, db: Ses
     hospital.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(hospital)
+    response_cache.invalidate("hospitals")
     return hospital
 
 
@@ -3189,28 +5156,56 @@ async def delete_hospital(hospital_id: str, db: Session = DbSession):
         raise HTTPException(status_code=404, detail="Hospital not found.")
     db.delete(hospital)
     db.commit()
+    response_cache.invalidate("hospitals")
     return None
 
 
-@admin_router.get("/audit-logs", response_model=List[AuditLogOut])
+def encode_audit_cursor(log: AuditLog) -> str:
+    payload = json.dumps([log.timestamp.isoformat(), log.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_audit_cursor(cursor: str):
+    try:
+        timestamp, log_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+@admin_router.get("/audit-logs", response_model=AuditLogPage)
 async def get_audit_logs(
         user_id: Optional[str] = None,
         action: Optional[str] = None,
         limit: int = Query(100, ge=1, le=1000),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
         db: Session = DbSession
 ):
     """
-    (Admin) Retrieves audit logs with optional filtering.
+    (Admin) Retrieves audit logs newest first with optional filtering, paged by keyset on
+    (timestamp, id). Months older than the retention window are in the archives, not here.
     """
-    query = db.query(AuditLog).order_by(AuditLog.timestamp.desc())
-
+    query = db.query(AuditLog)
     if user_id:
         query = query.filter(AuditLog.user_id == user_id)
     if action:
         query = query.filter(AuditLog.action == action)
+    if cursor:
+        cursor_timestamp, cursor_id = decode_audit_cursor(cursor)
+        query = query.filter(or_(
+            AuditLog.timestamp < cursor_timestamp,
+            and_(AuditLog.timestamp == cursor_timestamp, AuditLog.id < cursor_id)
+        ))
+
+    logs = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_audit_cursor(logs[limit - 1]) if len(logs) > limit else None
+    return AuditLogPage(items=logs[:limit], next_cursor=next_cursor)
 
-    logs = query.limit(limit).all()
-    return logs
+
+@admin_router.get("/audit-logs/archives", response_model=List[AuditArchiveOut])
+async def list_audit_archives(db: Session = DbSession):
+    """(Admin) Lists the monthly audit log archives written by the scheduler, newest first."""
+    return db.query(AuditArchive).order_by(AuditArchive.month.desc(), AuditArchive.id.desc()).all()
 
 
 @admin_router.get("/feature-flags", response_model=List[FeatureFlagOut])
@@ -3242,46 +5237,20 @@ async def update_feature_flag(flag_name: str, update_data: FeatureFlagUpdate, db
 async def get_dashboard_kpis(db: Session = DbSession):
     """
     (Admin) Retrieves key performance indicators (KPIs) for the entire platform.
-    This endpoint performs real-time database aggregations to provide live data.
+    Values come from the transactionally maintained `PlatformCounter` rows.
     """
 
-    # 1. Calculate Total Active Users
-    total_active_users = db.query(User).filter(User.is_active == True).count()
-
-    # 2. Calculate Total Verified Physicians
-    # This is a more meaningful metric than just total physicians.
-    total_physicians = db.query(Physician).filter(Physician.is_verified == True).count()
-
-    # 3. Calculate Pending Physician Verifications
-    pending_verifications = db.query(Physician).filter(Physician.is_verified == False).count()
-
-    # 4. Calculate Monthly Recurring Revenue (MRR)
-    # This is a complex query that uses a SQL `CASE` statement to assign a monetary
-    # value to each subscription plan and then sums them up.
-    # It only considers subscriptions that are currently active.
-    # The prices are divided by 100 because we stored them in the smallest currency unit (cents/kobo).
-
-    # Define the mapping from enum to price. This ensures a single source of truth.
-    price_case = case(
-        (Subscription.plan == SubscriptionPlan.BASIC, SUBSCRIPTION_PLANS[SubscriptionPlan.BASIC].price_monthly / 100.0),
-        (Subscription.plan == SubscriptionPlan.PREMIUM,
-         SUBSCRIPTION_PLANS[SubscriptionPlan.PREMIUM].price_monthly / 100.0),
-        (Subscription.plan == SubscriptionPlan.ULTIMATE,
-         SUBSCRIPTION_PLANS[SubscriptionPlan.ULTIMATE].price_monthly / 100.0),
-        else_=0.0  # Freemium plans and any others contribute $0 to MRR
-    )
-
-    # Execute the aggregation query in the database
-    # `func.sum` is the SQLAlchemy equivalent of SQL's SUM() function.
-    # The `.scalar()` method is used to get a single value result.
-    calculated_mrr = db.query(func.sum(price_case)).filter(
-        Subscription.is_active == True
-    ).scalar()
+    # Counters are maintained on every write, so this is a single read of a four-row table
+    counters = dict(db.query(PlatformCounter.name, PlatformCounter.value).all())
+    if len(counters) < len(KPI_COUNTER_NAMES):
+        reconcile_platform_counters(db)
+        counters = dict(db.query(PlatformCounter.name, PlatformCounter.value).all())
 
-    # If there are no paying subscribers, the result will be None, so we default to 0.0.
-    monthly_recurring_revenue = calculated_mrr or 0.0
+    total_active_users = int(counters["active_users"])
+    total_physicians = int(counters["verified_physicians"])
+    pending_verifications = int(counters["pending_verifications"])
+    monthly_recurring_revenue = counters["monthly_recurring_revenue"]
 
-    # 5. Return the structured data
     return AdminDashboardKPIs(
         total_active_users=total_active_users,
         total_physicians=total_physicians,
@@ -3297,6 +5266,7 @@ async def add_exercise(name: str = Form(...), description: str = Form(...), targ
                             video_url=video_url)
     db.add(new_exercise);
     db.commit();
+    wellness_catalog.invalidate()
     return {"status": "Exercise added"}
 
 
@@ -3306,34 +5276,82 @@ async def add_supplement(name: str = Form(...), description: str = Form(...), ta
     new_supplement = Supplement(name=name, description=description, target_conditions=target_conditions)
     db.add(new_supplement);
     db.commit();
+    wellness_catalog.invalidate()
     return {"status": "Supplement added"}
 
 
-@admin_router.get("/analytics/user-growth", response_model=UserGrowthData)
-async def get_user_growth_data(db: Session = DbSession):
-    """
-    (Admin) Provides time-series data for new user registrations over the past 30 days.
-    """
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the day/week (ISO, Monday)/month bucket containing `day`."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
 
-    # This query groups users by the date they were created
-    results = db.query(
-        func.date(User.created_at).label('date'),
-        func.count(User.id).label('count')
-    ).filter(
-        User.created_at >= thirty_days_ago
-    ).group_by(func.date(User.created_at)).order_by(func.date(User.created_at)).all()
 
-    # Format the data
-    data_points = [TimeSeriesDataPoint(date=r.date.isoformat(), count=r.count) for r in results]
+def next_bucket(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day + timedelta(days=7)
+    if bucket == "month":
+        return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+    return day + timedelta(days=1)
+
 
-    return UserGrowthData(data=data_points)
+user_growth_cache = TTLCache(max_size=256)
+
+
+@admin_router.get("/analytics/user-growth", response_model=UserGrowthData)
+async def get_user_growth_data(
+        start: Optional[date] = Query(None, description="First day of the range (default: 30 days ago)"),
+        end: Optional[date] = Query(None, description="Last day of the range, inclusive (default: today)"),
+        bucket: str = Query("day", pattern="^(day|week|month)$"),
+        db: Session = DbSession
+):
+    """
+    (Admin) New user registrations per day, week or month over a date range.
+    Daily counts come from a range scan on the `(created_at, id)` index; empty buckets are filled with 0
+    and each (range, bucket) series is cached, for longer when the range is entirely in the past.
+    """
+    today = datetime.utcnow().date()
+    end = end or today
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end.")
+    if (end - start).days > settings.ANALYTICS_MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {settings.ANALYTICS_MAX_RANGE_DAYS} days.")
+
+    cache_key = (start, end, bucket)
+    cached = user_growth_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Portable daily grouping (extract() compiles for both SQLite and PostgreSQL)
+    year, month, day = (extract(part, User.created_at) for part in ("year", "month", "day"))
+    results = db.query(year, month, day, func.count(User.id)).filter(
+        User.created_at >= datetime.combine(start, datetime.min.time()),
+        User.created_at < datetime.combine(end + timedelta(days=1), datetime.min.time())
+    ).group_by(year, month, day).all()
+
+    counts = defaultdict(int)
+    for row_year, row_month, row_day, count in results:
+        counts[bucket_start(date(int(row_year), int(row_month), int(row_day)), bucket)] += count
+
+    data_points = []
+    current = bucket_start(start, bucket)
+    while current <= end:
+        data_points.append(TimeSeriesDataPoint(date=current.isoformat(), count=counts.get(current, 0)))
+        current = next_bucket(current, bucket)
+
+    growth = UserGrowthData(start=start, end=end, bucket=bucket, data=data_points)
+    ttl = settings.ANALYTICS_CACHE_TTL_SECONDS if end >= today else settings.ANALYTICS_HISTORICAL_CACHE_TTL_SECONDS
+    user_growth_cache.set(cache_key, growth, ttl)
+    return growth
 
 
 @admin_router.post("/wellness/meals", status_code=201)
 async def add_meal(meal_data: MealCreate, db: Session = DbSession):
     new_meal = Meal(**meal_data.dict())
-    db.add(new_meal); db.commit(); return {"status": "Meal added"}
+    db.add(new_meal); db.commit(); wellness_catalog.invalidate(); return {"status": "Meal added"}
 
 @admin_router.get("/wellness/meals", response_model=List[MealCreate])
 async def list_meals(db: Session = DbSession):
@@ -3346,7 +5364,7 @@ async def add_meal_plan_template(template_data: MealPlanTemplateCreate, db: Sess
         daily_calorie_target=template_data.daily_calorie_target,
         structure=json.dumps(template_data.structure)
     )
-    db.add(new_template); db.commit(); return {"status": "Template added"}
+    db.add(new_template); db.commit(); wellness_catalog.invalidate(); return {"status": "Template added"}
 
 
 @admin_router.post("/resources", status_code=201)
@@ -3360,6 +5378,7 @@ async def add_professional_resource(
     new_resource = ProfessionalResource(title=title, source=source, resource_type=resource_type, link=link)
     db.add(new_resource);
     db.commit()
+    response_cache.invalidate("resources")
     return {"status": "Resource added"}
 
 
@@ -3376,59 +5395,166 @@ class PaymentLogOut(BaseModel):
 
 
 @admin_router.get("/payments/recent", response_model=List[PaymentLogOut])
-async def get_recent_transactions(limit: int = 50, db: Session = DbSession):
+async def get_recent_transactions(limit: int = Query(50, ge=1, le=500), db: Session = DbSession):
     """
     (Admin) Retrieves a list of the most recent payment transactions across the platform.
     """
-    payments = db.query(Payment).options(
-        joinedload(Payment.subscription).joinedload(Subscription.user)
-    ).order_by(Payment.payment_date.desc()).limit(limit).all()
+    # One joined query; the inner join skips payments from deleted users
+    rows = db.query(Payment, User.email, Subscription.plan).join(Payment.user).outerjoin(
+        Payment.subscription
+    ).order_by(Payment.payment_date.desc(), Payment.id.desc()).limit(limit).all()
 
-    response = []
-    for p in payments:
-        # We need to handle cases where a payment might not be for a subscription
-        # or where the user might have been deleted.
-        user = db.query(User).filter(User.id == p.user_id).first()
-        if not user:
-            continue  # Skip payments from deleted users
-
-        response.append(PaymentLogOut(
-            id=p.gateway_transaction_id,
-            amount=p.amount,
-            currency=p.currency,
-            status=p.status,
-            gateway=p.gateway,
-            payment_date=p.payment_date,
-            user_email=user.email,
-            subscription_plan=p.subscription.plan if p.subscription else None
-        ))
+    return [PaymentLogOut(
+        id=p.gateway_transaction_id,
+        amount=p.amount,
+        currency=p.currency,
+        status=p.status,
+        gateway=p.gateway,
+        payment_date=p.payment_date,
+        user_email=email,
+        subscription_plan=plan
+    ) for p, email, plan in rows]
+
+
+LEDGER_COLUMNS = ["payment_id", "reference", "payment_date", "user_id", "user_email", "amount", "currency",
+                  "status", "gateway", "subscription_plan"]
+
+
+def iter_payment_ledger(export_format: str, start: Optional[datetime], end: Optional[datetime],
+                        payment_status: Optional[str]):
+    """
+    Yields the ledger as CSV or NDJSON text chunks. Rows are streamed from the database in batches
+    (a server-side cursor on PostgreSQL) and written out as they arrive, so memory stays flat.
+    Uses its own session because the response outlives the request's dependencies.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(
+            Payment.id, Payment.gateway_transaction_id, Payment.payment_date, Payment.user_id, User.email,
+            Payment.amount, Payment.currency, Payment.status, Payment.gateway, Subscription.plan
+        ).join(Payment.user).outerjoin(Payment.subscription)
+        if start: query = query.filter(Payment.payment_date >= start)
+        if end: query = query.filter(Payment.payment_date < end)
+        if payment_status: query = query.filter(Payment.status == payment_status)
+        rows = query.order_by(Payment.payment_date, Payment.id).execution_options(
+            stream_results=True, yield_per=settings.LEDGER_EXPORT_BATCH_SIZE)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        if writer:
+            writer.writerow(LEDGER_COLUMNS)
+        for count, row in enumerate(rows, start=1):
+            values = [row[0], row[1], row[2].isoformat() if row[2] else None, row[3], row[4], row[5], row[6],
+                      row[7], row[8].value, row[9].value if row[9] else None]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(LEDGER_COLUMNS, values))) + "\n")
+            if count % settings.LEDGER_EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+@admin_router.get("/payments/export")
+async def export_payment_ledger(
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        start: Optional[datetime] = Query(None, description="Include payments on or after this time"),
+        end: Optional[datetime] = Query(None, description="Include payments before this time"),
+        payment_status: Optional[str] = Query(None, alias="status")
+):
+    """(Admin) Streams the payment ledger for finance reconciliation as NDJSON or CSV."""
+    # Payment dates are stored as naive UTC; bounds may arrive with or without an offset
+    start = naive_utc(start) if start else None
+    end = naive_utc(end) if end else None
+    if start and end and start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end.")
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"payments_{(start or datetime.min).strftime('%Y%m%d')}_{(end or datetime.utcnow()).strftime('%Y%m%d')}.{format}"
+    return StreamingResponse(
+        iter_payment_ledger(format, start, end, payment_status),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
-    return response
+
+# --- Wellness Catalog Cache ---
+class WellnessCatalog:
+    """
+    In-memory snapshot of the wellness catalog (meal plan templates, meals by condition and type,
+    exercises by condition, supplements), so plan generation never touches the database. Loaded at
+    startup, dropped by the admin wellness endpoints, and also rebuilt after WELLNESS_CATALOG_TTL_SECONDS
+    so that other worker processes pick up admin changes.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._loaded_at = 0.0
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or time.monotonic() - self._loaded_at >= self.ttl_seconds:
+                self.load(db)
+            return self._snapshot
+
+    def load(self, db: Session):
+        templates = {}
+        for template in db.query(MealPlanTemplate).all():
+            try:
+                structure = json.loads(template.structure)
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Skipping meal plan template '{template.condition}' with an invalid structure.")
+                continue
+            templates[template.condition] = (template.daily_calorie_target, structure)
+
+        meals = defaultdict(lambda: defaultdict(list))  # condition -> meal type -> meal names
+        for name, meal_type, condition in db.query(Meal.name, Meal.meal_type, Tag.name) \
+                .join(MealTag, MealTag.meal_id == Meal.id).join(Tag, Tag.id == MealTag.tag_id).order_by(Meal.id):
+            meals[condition][meal_type].append(name)
+
+        exercises = defaultdict(list)  # condition -> ExerciseOut, in catalog order
+        exercise_outs = {}
+        for exercise, condition in db.query(Exercise, Tag.name).join(ExerciseTag, ExerciseTag.exercise_id == Exercise.id) \
+                .join(Tag, Tag.id == ExerciseTag.tag_id).order_by(Exercise.id):
+            if exercise.id not in exercise_outs:
+                exercise_outs[exercise.id] = ExerciseOut.model_validate(exercise)
+            exercises[condition].append((exercise.id, exercise_outs[exercise.id]))
+
+        supplements = [{"name": supplement.name, "description": supplement.description}
+                       for supplement in db.query(Supplement).order_by(Supplement.id)]
+
+        self._snapshot = {"templates": templates, "meals": meals, "exercises": exercises, "supplements": supplements}
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self._snapshot = None
+
+
+wellness_catalog = WellnessCatalog(ttl_seconds=settings.WELLNESS_CATALOG_TTL_SECONDS)
 
 
 # --- Real Meal Plan Generation Engine ---
 def generate_real_meal_plan(condition: str, db: Session) -> Optional[MealPlan]:
     """
-    Dynamically generates a 7-day meal plan for a given condition from the database.
+    Dynamically generates a 7-day meal plan for a given condition from the cached wellness catalog.
     """
-    template = db.query(MealPlanTemplate).filter(MealPlanTemplate.condition == condition).first()
+    catalog = wellness_catalog.get(db)
+    template = catalog["templates"].get(condition)
     if not template:
         return None
+    daily_calorie_target, structure = template
 
-    try:
-        structure = json.loads(template.structure)
-    except (json.JSONDecodeError, TypeError):
-        return None
-
-    # Fetch all suitable meals for the given condition from the database
-    suitable_meals_query = db.query(Meal).filter(Meal.suitable_for_conditions.ilike(f"%{condition}%")).all()
-
-    # Organize meals by type for easy lookup
-    meals_by_type = {}
-    for meal in suitable_meals_query:
-        if meal.meal_type not in meals_by_type:
-            meals_by_type[meal.meal_type] = []
-        meals_by_type[meal.meal_type].append(meal.name)
+    # Suitable meals for the condition, already organized by type
+    meals_by_type = catalog["meals"].get(condition.lower(), {})
 
     # Ensure we have meals for all required types in the structure
     for meal_type in structure.keys():
@@ -3449,39 +5575,73 @@ def generate_real_meal_plan(condition: str, db: Session) -> Optional[MealPlan]:
             daily_meals[meal_type] = random.sample(available_meals, k=count)
 
     return MealPlan(
-        condition=template.condition.capitalize(),
-        daily_calorie_target=template.daily_calorie_target,
+        condition=condition.capitalize(),
+        daily_calorie_target=daily_calorie_target,
         meals=daily_meals
     )
 
 hospital_router = APIRouter(prefix="/api/hospitals", tags=["Hospitals"])
 
 
+def hospitals_tagged(kind: str, name: str):
+    """Subquery of hospital ids carrying a tag, resolved through the (kind, name) and (tag_id, hospital_id) indexes."""
+    return select(HospitalTag.hospital_id).join(Tag, Tag.id == HospitalTag.tag_id).where(
+        Tag.kind == kind, Tag.name == name.strip().lower())
+
+
 @hospital_router.get("/search", response_model=List[HospitalOut])
 async def search_hospitals(
+        request: Request,
         query: Optional[str] = Query(None, description="Search by name, city, country, or specialty"),
+        specialty: Optional[str] = Query(None, description="Only hospitals offering this specialty"),
+        service: Optional[str] = Query(None, description="Only hospitals offering this service"),
         db: Session = DbSession
 ):
     """
     (Public) Searches for validated hospitals.
-    Performs a case-insensitive search across multiple relevant fields.
+    Performs a case-insensitive search across name, city and country, or an exact specialty match.
+    Results are cached per query string until the directory changes.
     """
+    def build():
+        search_query = db.query(Hospital).filter(Hospital.is_validated == True)
+
+        if query:
+            search_term = f"%{query.lower()}%"
+            search_query = search_query.filter(
+                or_(
+                    Hospital.name.ilike(search_term),
+                    Hospital.city.ilike(search_term),
+                    Hospital.country.ilike(search_term),
+                    Hospital.id.in_(hospitals_tagged("specialty", query))
+                )
+            )
+        if specialty:
+            search_query = search_query.filter(Hospital.id.in_(hospitals_tagged("specialty", specialty)))
+        if service:
+            search_query = search_query.filter(Hospital.id.in_(hospitals_tagged("service", service)))
 
+        return search_query.all()
+    return response_cache.serve(request, "hospitals", List[HospitalOut], build)
 
-    search_query = db.query(Hospital).filter(Hospital.is_validated == True)
 
-    if query:
-        search_term = f"%{query.lower()}%"
-        search_query = search_query.filter(
-            or_(
-                Hospital.name.ilike(search_term),
-                Hospital.city.ilike(search_term),
-                Hospital.country.ilike(search_term),
-                Hospital.specialties.ilike(search_term)
-            )
-        )
+# --- Local Storage Router ---
+storage_router = APIRouter(prefix="/api/storage", tags=["Storage"])
+
 
-    return search_query.all()
+@storage_router.get("/local/{path:path}")
+async def serve_local_file(path: str, expires: int = Query(...), signature: str = Query(...)):
+    """
+    (Public) Serves a file written by the local storage backend.
+    Access is granted by the signed URL from `get_download_url`, mirroring cloud signed URLs.
+    """
+    if not isinstance(storage_manager, LocalStorageManager):
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not storage_manager.verify_signature(path, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired download link.")
+    full_path = storage_manager.resolve_path(path)
+    if not os.path.isfile(full_path):
+        raise HTTPException(status_code=404, detail="File not found.")
+    return FileResponse(full_path, filename=os.path.basename(path))
 
 
 # --- AI Router ---
@@ -3494,9 +5654,10 @@ MEDICAL_TIPS_DB = [
     {"id": 3, "title": "Incorporate Regular Physical Activity", "content": "Regular physical activity can improve your muscle strength and boost your endurance. Exercise delivers oxygen and nutrients to your tissues and helps your cardiovascular system work more efficiently. And when your heart and lung health improve, you have more energy to tackle daily chores."},
 ]
 @ai_router.get("/medical-tips", response_model=List[Dict])
-async def get_medical_tips():
-    """Returns a list of general medical tips."""
-    return random.sample(MEDICAL_TIPS_DB, len(MEDICAL_TIPS_DB))
+async def get_medical_tips(request: Request):
+    """Returns a list of general medical tips, reshuffled each time the cached response expires."""
+    return response_cache.serve(request, "medical_tips", List[Dict],
+                                lambda: random.sample(MEDICAL_TIPS_DB, len(MEDICAL_TIPS_DB)), public=False)
 
 
 @ai_router.post("/drug-interaction", response_model=List[DrugInteractionResult])
@@ -3704,7 +5865,7 @@ async def get_cardiovascular_risk_prediction(data: RiskPredictionInput):
 
     # 2. Call the AI service
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient() as client, observe_upstream("ai"):
             response = await client.post(
                 f"{settings.AI_SERVICE_URL}/predict/cardiovascular-risk",
                 json=ai_service_input,
@@ -3756,21 +5917,22 @@ async def get_full_wellness_plan(user: User = CurrentPatient, db: Session = DbSe
         meal_plan = generate_real_meal_plan("general_wellness", db)
 
     # --- 3. Fetch REAL Exercise Plan (logic from previous segment is already real) ---
+    catalog = wellness_catalog.get(db)
     exercise_conditions = conditions if conditions else {"general_wellness"}
-    exercise_query = db.query(Exercise).filter(
-        or_(*[Exercise.target_conditions.ilike(f"%{c}%") for c in exercise_conditions])
-    ).limit(3).all()
-    exercise_plan = [ExerciseOut.from_orm(ex) for ex in exercise_query]
+    matching_exercises = {}
+    for condition in exercise_conditions:
+        for exercise_id, exercise_out in catalog["exercises"].get(condition, []):
+            matching_exercises.setdefault(exercise_id, exercise_out)
+    exercise_plan = [matching_exercises[exercise_id] for exercise_id in sorted(matching_exercises)[:3]]
 
     # --- 4. Fetch REAL Supplement Recommendations (logic from previous segment is already real) ---
     supplement_recs = []
     # ... (the existing rule-based logic for supplements is a valid real-system approach)
-    all_supplements = db.query(Supplement).all()
     if "hypertension" in conditions:
-        omega3 = next((s for s in all_supplements if "omega-3" in s.name.lower()), None)
+        omega3 = next((s for s in catalog["supplements"] if "omega-3" in s["name"].lower()), None)
         if omega3:
             supplement_recs.append(SupplementOut(
-                **omega3.__dict__,
+                **omega3,
                 reasoning="Recommended to support cardiovascular health, based on your profile."
             ))
 
@@ -3788,37 +5950,71 @@ chat_router = APIRouter(prefix="/api/chat", tags=["Chat & Messaging"], dependenc
 
 
 @chat_router.get("/conversations", response_model=List[ConversationOut])
-async def get_user_conversations(user: User = CurrentUser, db: Session = DbSession):
+async def get_user_conversations(
+        page: int = Query(1, ge=1),
+        size: int = Query(50, ge=1, le=200),
+        user: User = CurrentUser,
+        db: Session = DbSession
+):
     """
-    Retrieves all conversations for the currently logged-in user.
+    Retrieves a page of conversations for the currently logged-in user, most recently active first.
     A professional relationship (an appointment) must exist to have a conversation.
+    The whole inbox is served by two queries regardless of how many conversations are on the page:
+    one for the conversations with both participants eagerly loaded, and one aggregate for the
+    last message and unread count of each conversation.
     """
     if user.role == UserRole.PATIENT:
-        convos = db.query(Conversation).filter(Conversation.patient_id == user.patient_profile.id).all()
+        participant_filter = Conversation.patient_id == user.patient_profile.id
     elif user.role == UserRole.PHYSICIAN:
-        convos = db.query(Conversation).filter(Conversation.physician_id == user.physician_profile.id).all()
+        participant_filter = Conversation.physician_id == user.physician_profile.id
     else:
         return []  # Superusers do not have conversations
 
-    # We need to manually load and format the related data for the response model
+    # Latest message time per conversation, restricted to this user's conversations
+    last_activity = db.query(
+        Message.conversation_id.label("conversation_id"),
+        func.max(Message.timestamp).label("last_timestamp")
+    ).join(Conversation, Conversation.id == Message.conversation_id).filter(
+        participant_filter
+    ).group_by(Message.conversation_id).subquery()
+
+    activity_order = func.coalesce(last_activity.c.last_timestamp, Conversation.created_at)
+    convos = db.query(Conversation).options(
+        joinedload(Conversation.patient).joinedload(Patient.user),
+        joinedload(Conversation.physician).joinedload(Physician.user)
+    ).outerjoin(
+        last_activity, last_activity.c.conversation_id == Conversation.id
+    ).filter(participant_filter).order_by(
+        activity_order.desc(), Conversation.id.desc()
+    ).offset((page - 1) * size).limit(size).all()
+
+    summaries = get_conversation_summaries(db, [convo.id for convo in convos], user.id)
+
     results = []
     for convo in convos:
-        # Load related patient and physician user data
-        patient_user = db.query(User).filter_by(id=convo.patient.user_id).first()
-        physician_user = db.query(User).filter_by(id=convo.physician.user_id).first()
+        schedule = None
+        if convo.physician.availability_schedule:
+            try:
+                schedule = json.loads(convo.physician.availability_schedule)
+            except (json.JSONDecodeError, TypeError):
+                schedule = None
 
+        summary = summaries.get(convo.id, {})
         results.append({
             "id": convo.id,
-            "patient": {**convo.patient.__dict__, "email": patient_user.email},
-            "physician": {**convo.physician.__dict__, "email": physician_user.email}
+            "patient": {**convo.patient.__dict__, "email": convo.patient.user.email,
+                        "phone_number": convo.patient.user.phone_number},
+            "physician": {**convo.physician.__dict__, "email": convo.physician.user.email,
+                          "availability_schedule": schedule},
+            "last_message": summary.get("last_message"),
+            "unread_count": summary.get("unread_count", 0)
         })
 
     return results
 
 
-@chat_router.get("/conversations/{conversation_id}/messages", response_model=List[MessageOut])
-async def get_conversation_messages(conversation_id: str, user: User = CurrentUser, db: Session = DbSession):
-    """Retrieves all messages from a specific conversation."""
+def get_authorized_conversation(conversation_id: str, user: User, db: Session) -> Conversation:
+    """Fetches a conversation, ensuring the given user is one of its participants."""
     convo = db.query(Conversation).filter(Conversation.id == conversation_id).first()
     if not convo:
         raise HTTPException(status_code=404, detail="Conversation not found.")
@@ -3827,8 +6023,114 @@ async def get_conversation_messages(conversation_id: str, user: User = CurrentUs
     if not ((user.role == UserRole.PATIENT and convo.patient_id == user.patient_profile.id) or \
             (user.role == UserRole.PHYSICIAN and convo.physician_id == user.physician_profile.id)):
         raise HTTPException(status_code=403, detail="Not authorized to view this conversation.")
+    return convo
+
+
+def get_message_cursor(conversation_id: str, message_id: str, db: Session):
+    """Resolves a message id used as a pagination cursor within a conversation."""
+    cursor = db.query(Message.id, Message.timestamp).filter(
+        Message.conversation_id == conversation_id,
+        Message.id == message_id
+    ).first()
+    if not cursor:
+        raise HTTPException(status_code=404, detail="Cursor message not found in this conversation.")
+    return cursor
+
+
+def get_conversation_summaries(db: Session, conversation_ids: List[str], user_id: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Computes the last message and the unread count (messages from the other participant
+    not yet read) for each conversation in a single aggregate query.
+    """
+    if not conversation_ids:
+        return {}
+
+    stats = db.query(
+        Message.conversation_id.label("conversation_id"),
+        func.max(Message.timestamp).label("last_timestamp"),
+        func.sum(case((and_(Message.sender_id != user_id, Message.is_read == False), 1), else_=0)).label("unread_count")
+    ).filter(Message.conversation_id.in_(conversation_ids)).group_by(Message.conversation_id).subquery()
+
+    rows = db.query(stats.c.conversation_id, stats.c.unread_count, Message).join(
+        Message, and_(Message.conversation_id == stats.c.conversation_id,
+                      Message.timestamp == stats.c.last_timestamp)
+    ).order_by(Message.id.desc()).all()
+
+    summaries = {}
+    for conversation_id, unread_count, last_message in rows:
+        # Messages sharing the latest timestamp are tie-broken by id, matching the keyset order
+        if conversation_id not in summaries:
+            summaries[conversation_id] = {"last_message": last_message, "unread_count": int(unread_count or 0)}
+    return summaries
+
+
+@chat_router.get("/conversations/{conversation_id}/messages", response_model=List[MessageOut])
+async def get_conversation_messages(
+        conversation_id: str,
+        before: Optional[str] = Query(None, description="Return messages older than this message id"),
+        after: Optional[str] = Query(None, description="Return messages newer than this message id"),
+        limit: int = Query(50, ge=1, le=200),
+        user: User = CurrentUser,
+        db: Session = DbSession
+):
+    """
+    Retrieves a page of messages from a specific conversation in chronological order.
+    Without a cursor the most recent `limit` messages are returned. Pagination is keyset-based
+    on (timestamp, id) so it is served by the composite conversation/timestamp index.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either 'before' or 'after', not both.")
+
+    get_authorized_conversation(conversation_id, user, db)
+    query = db.query(Message).filter(Message.conversation_id == conversation_id)
+
+    if after:
+        cursor = get_message_cursor(conversation_id, after, db)
+        query = query.filter(or_(
+            Message.timestamp > cursor.timestamp,
+            and_(Message.timestamp == cursor.timestamp, Message.id > cursor.id)
+        ))
+        return query.order_by(Message.timestamp.asc(), Message.id.asc()).limit(limit).all()
+
+    if before:
+        cursor = get_message_cursor(conversation_id, before, db)
+        query = query.filter(or_(
+            Message.timestamp < cursor.timestamp,
+            and_(Message.timestamp == cursor.timestamp, Message.id < cursor.id)
+        ))
+
+    # Walk the index backwards to grab the newest page, then restore chronological order
+    messages = query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit).all()
+    messages.reverse()
+    return messages
+
+
+@chat_router.post("/conversations/{conversation_id}/read", response_model=MarkReadResponse)
+async def mark_conversation_read(
+        conversation_id: str,
+        read_data: MarkReadRequest,
+        user: User = CurrentUser,
+        db: Session = DbSession
+):
+    """
+    Marks every message from the other participant up to and including the given
+    message as read, in a single bulk UPDATE.
+    """
+    get_authorized_conversation(conversation_id, user, db)
+    cursor = get_message_cursor(conversation_id, read_data.up_to_message_id, db)
+
+    updated = db.query(Message).filter(
+        Message.conversation_id == conversation_id,
+        Message.sender_id != user.id,
+        Message.is_read == False,
+        or_(
+            Message.timestamp < cursor.timestamp,
+            and_(Message.timestamp == cursor.timestamp, Message.id <= cursor.id)
+        )
+    ).update({Message.is_read: True}, synchronize_session=False)
+    db.commit()
 
-    return db.query(Message).filter(Message.conversation_id == conversation_id).order_by(Message.timestamp).all()
+    return MarkReadResponse(updated=updated)
 
 
 # --- WebSocket Endpoint ---
@@ -3933,9 +6235,9 @@ payment_router = APIRouter(prefix="/api/payments", tags=["Payments"])
 
 
 @payment_router.get("/plans", response_model=List[PlanDetail])
-async def get_subscription_plans():
+async def get_subscription_plans(request: Request):
     """Lists all available subscription plans."""
-    return list(SUBSCRIPTION_PLANS.values())
+    return response_cache.serve(request, "plans", List[PlanDetail], lambda: list(SUBSCRIPTION_PLANS.values()))
 
 
 @payment_router.post("/initialize/paystack", response_model=PaymentInitializeResponse,
@@ -3977,8 +6279,9 @@ async def initialize_paystack_payment(
 @payment_router.post("/webhooks/paystack")
 async def handle_paystack_webhook(request: Request, db: Session = DbSession):
     """
-    Handles incoming webhook notifications from Paystack.
-    This is the source of truth for successful payments.
+    Receives webhook notifications from Paystack.
+    The verified event is stored and acknowledged immediately; `PaymentEventWorker` does the processing,
+    so response time does not depend on Paystack verification, invoicing or storage.
     """
     body = await request.body()
 
@@ -3988,7 +6291,7 @@ async def handle_paystack_webhook(request: Request, db: Session = DbSession):
         raise HTTPException(status_code=400, detail="Missing signature")
 
     hashed = hmac.new(settings.PAYSTACK_SECRET_KEY.encode('utf-8'), body, hashlib.sha512).hexdigest()
-    if hashed != paystack_signature:
+    if not hmac.compare_digest(hashed, paystack_signature):
         logger.warning("Invalid Paystack webhook signature received.")
         raise HTTPException(status_code=400, detail="Invalid signature")
 
@@ -3998,93 +6301,184 @@ async def handle_paystack_webhook(request: Request, db: Session = DbSession):
     except (json.JSONDecodeError, ValidationError):
         raise HTTPException(status_code=400, detail="Invalid webhook payload")
 
-    # 2. Process the event
-    if event_data.event == "charge.success":
-        reference = event_data.data.reference
-        logger.info(f"Processing successful charge for reference: {reference}")
+    # 2. Persist the event; the unique (event, reference) constraint turns retries into no-ops
+    db.add(PaymentEvent(gateway=PaymentGateway.PAYSTACK, event=event_data.event,
+                        reference=event_data.data.reference, payload=body.decode("utf-8")))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        logger.info(f"Duplicate Paystack {event_data.event} event for {event_data.data.reference}. Ignoring.")
+        return JSONResponse(content={"status": "duplicate"})
 
-        # Verify transaction again with Paystack as a final check
-        verification = await paystack_service.verify_transaction(reference)
-        if verification["data"]["status"] != "success":
-            logger.warning(f"Webhook for {reference} but verification failed.")
-            return JSONResponse(content={"status": "verification_failed"})
+    payment_event_worker.wake()
+    return JSONResponse(content={"status": "received"})
 
-        # Update our database
-        payment = db.query(Payment).filter(Payment.gateway_transaction_id == reference).first()
-        if not payment:
-            logger.error(f"Payment record not found for successful webhook: {reference}")
-            return JSONResponse(content={"status": "payment_not_found"})
 
-        if payment.status == "completed":
-            logger.info(f"Payment {reference} already processed. Ignoring webhook.")
-            return JSONResponse(content={"status": "already_processed"})
+async def process_paystack_event(db: Session, payment_event: PaymentEvent) -> str:
+    """
+    Applies a stored Paystack event. Safe to re-run: completed payments are left untouched.
+    Returns a short outcome string recorded in the logs.
+    """
+    event_data = PaystackWebhookPayload(**json.loads(payment_event.payload))
+    if event_data.event != "charge.success":
+        return "ignored"
+
+    reference = event_data.data.reference
+    logger.info(f"Processing successful charge for reference: {reference}")
+
+    payment = db.query(Payment).filter(Payment.gateway_transaction_id == reference).first()
+    if not payment:
+        logger.error(f"Payment record not found for successful webhook: {reference}")
+        return "payment_not_found"
+
+    if payment.status == "completed":
+        logger.info(f"Payment {reference} already processed. Ignoring event.")
+        return "already_processed"
+
+    # Verify transaction again with Paystack as a final check
+    verification = await paystack_service.verify_transaction(reference)
+    if verification["data"]["status"] != "success":
+        logger.warning(f"Webhook for {reference} but verification failed.")
+        return "verification_failed"
+
+    payment.status = "completed"
+
+    # Update user's subscription
+    user_subscription = db.query(Subscription).filter(Subscription.user_id == payment.user_id).first()
+    if not user_subscription:
+        # This should not happen for a registered user, but handle it gracefully
+        user_subscription = Subscription(user_id=payment.user_id)
+        db.add(user_subscription)
+        db.flush()
 
-        payment.status = "completed"
+    plan_str = verification["data"]["metadata"].get("plan")
+    plan = SubscriptionPlan(plan_str)
 
-        # Update user's subscription
-        user_subscription = db.query(Subscription).filter(Subscription.user_id == payment.user_id).first()
-        if not user_subscription:
-            # This should not happen for a registered user, but handle it gracefully
-            user_subscription = Subscription(user_id=payment.user_id)
-            db.add(user_subscription)
+    user_subscription.plan = plan
+    user_subscription.start_date = datetime.utcnow()
+    # For simplicity, we assume monthly. Production would check metadata.
+    user_subscription.end_date = datetime.utcnow() + timedelta(days=30)
+    user_subscription.is_active = True
 
-        plan_str = verification["data"]["metadata"].get("plan")
-        plan = SubscriptionPlan(plan_str)
+    # Link payment to subscription
+    payment.subscription_id = user_subscription.id
 
-        user_subscription.plan = plan
-        user_subscription.start_date = datetime.utcnow()
-        # For simplicity, we assume monthly. Production would check metadata.
-        user_subscription.end_date = datetime.utcnow() + timedelta(days=30)
-        user_subscription.is_active = True
+    db.commit()
+    logger.info(f"User {payment.user_id} subscription updated to {plan.value}")
 
-        # Link payment to subscription
-        payment.subscription_id = user_subscription.id
+    # Render and store the invoice in the background
+    pdf_renderer.submit(generate_subscription_invoice(payment.id, plan))
 
-        db.commit()
-        logger.info(f"User {payment.user_id} subscription updated to {plan.value}")
-        user = db.query(User).filter(User.id == payment.user_id).first()
-        plan_details = SUBSCRIPTION_PLANS[plan]
+    # You can trigger a background task here to send a confirmation email
+    # background_tasks.add_task(send_payment_success_email, payment.user_id)
+    return "processed"
 
-        invoice_buffer = generate_invoice_pdf(payment, user, plan_details)
-        invoice_filename = f"Invoice_{payment.id[:8]}_{user.id[:4]}.pdf"
 
-        class InMemoryUploadFile:  # Helper class as defined before
-            def __init__(self, file,
-                         filename): self.file = file; self.filename = filename; self.content_type = "application/pdf"
+class PaymentEventWorker:
+    """
+    Background loop that processes stored payment events. Events are claimed with a conditional
+    UPDATE, so several app processes can run workers without handling the same event twice.
+    Failed events are retried with exponential backoff up to PAYMENT_EVENT_MAX_ATTEMPTS times.
+    """
 
-            async def read(self): return self.file.read()
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
 
-            @property
-            def size(self): return self.file.getbuffer().nbytes
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
 
-        in_memory_file = InMemoryUploadFile(invoice_buffer, invoice_filename)
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
 
-        # Upload the generated invoice PDF to Firebase Storage
-        upload_result = await storage_manager.upload_file(
-            file=in_memory_file,
-            user_id=user.id,
-            document_type="invoice"  # Use a new type
-        )
+    def wake(self):
+        self._wakeup.set()
 
-        # Create a database record for this new invoice document
-        new_invoice_doc = MedicalDocument(
-            id=str(uuid.uuid4()),
-            patient_id=user.patient_profile.id,  # Assuming invoices are tied to patients for now
-            document_type=DocumentType.OTHER,  # Or a new "INVOICE" type if you add it to the Enum
-            file_name=invoice_filename,
-            file_path=upload_result["file_path"],
-            file_url="",
-            description=f"Invoice for {plan_details.name} Subscription"
-        )
-        db.add(new_invoice_doc)
-        db.commit()
+    async def _run(self):
+        while True:
+            try:
+                while await self.process_pending():
+                    pass
+            except Exception as e:
+                logger.error(f"Payment event worker error: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.PAYMENT_EVENT_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
 
-        logger.info(f"Invoice {invoice_filename} generated and saved for user {user.id}")
+    @staticmethod
+    def _claimable(now: datetime, stale_before: datetime):
+        due = or_(PaymentEvent.next_attempt_at.is_(None), PaymentEvent.next_attempt_at <= now)
+        return or_(and_(PaymentEvent.status == "pending", due),
+                   and_(PaymentEvent.status == "processing", PaymentEvent.claimed_at < stale_before))
 
-        # You can trigger a background task here to send a confirmation email
-        # background_tasks.add_task(send_payment_success_email, payment.user_id)
+    @staticmethod
+    def retry_delay(attempts: int) -> timedelta:
+        seconds = settings.PAYMENT_EVENT_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+        return timedelta(seconds=min(seconds, settings.PAYMENT_EVENT_RETRY_MAX_SECONDS))
+
+    def _claim(self, db: Session, event_id: str, now: datetime, stale_before: datetime) -> bool:
+        claimed = db.execute(
+            update(PaymentEvent)
+            .where(PaymentEvent.id == event_id, self._claimable(now, stale_before))
+            .values(status="processing", claimed_at=now, attempts=PaymentEvent.attempts + 1)
+        )
+        db.commit()
+        return claimed.rowcount == 1
 
-    return JSONResponse(content={"status": "received"})
+    async def process_pending(self) -> int:
+        """
+        Processes one batch of due events and returns how many succeeded. A batch of only failures
+        returns 0, which ends the drain loop; those events wait out their backoff before the next claim.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            stale_before = now - timedelta(seconds=settings.PAYMENT_EVENT_CLAIM_TIMEOUT_SECONDS)
+            candidate_ids = [event_id for (event_id,) in db.query(PaymentEvent.id).filter(
+                self._claimable(now, stale_before)
+            ).order_by(PaymentEvent.received_at).limit(settings.PAYMENT_EVENT_BATCH_SIZE).all()]
+
+            processed = 0
+            for event_id in candidate_ids:
+                if not self._claim(db, event_id, now, stale_before):
+                    continue  # Another worker got there first
+                payment_event = db.query(PaymentEvent).filter(PaymentEvent.id == event_id).first()
+                try:
+                    outcome = await process_paystack_event(db, payment_event)
+                    payment_event.status = "processed"
+                    payment_event.processed_at = datetime.utcnow()
+                    payment_event.next_attempt_at = None
+                    payment_event.last_error = None
+                    processed += 1
+                    logger.info(f"Payment event {payment_event.id} ({payment_event.reference}): {outcome}")
+                except Exception as e:
+                    db.rollback()
+                    payment_event = db.query(PaymentEvent).filter(PaymentEvent.id == event_id).first()
+                    payment_event.last_error = str(e)
+                    if payment_event.attempts >= settings.PAYMENT_EVENT_MAX_ATTEMPTS:
+                        payment_event.status = "failed"
+                    else:
+                        payment_event.status = "pending"
+                        payment_event.next_attempt_at = datetime.utcnow() + self.retry_delay(payment_event.attempts)
+                    logger.error(f"Payment event {payment_event.id} failed (attempt {payment_event.attempts}): {e}",
+                                 exc_info=True)
+                db.commit()
+            return processed
+        finally:
+            db.close()
+
+
+payment_event_worker = PaymentEventWorker()
 
 
 # --- Telemedicine API Router ---
@@ -4147,6 +6541,7 @@ app.include_router(chat_router)
 app.include_router(hospital_router)
 app.include_router(cms_router)
 app.include_router(blog_router)
+app.include_router(storage_router)
 
 # =================================================================================================
 # XIII. RUN APPLICATION
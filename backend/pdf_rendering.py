@@ -0,0 +1,207 @@
+"""
+PDF rendering for prescriptions, invoices and account statements.
+
+This module deliberately imports nothing from `main` so it can be loaded cheaply inside the
+rendering worker processes. Renderers take plain dicts and return the finished PDF as bytes.
+"""
+import io
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+
+WIDTH, HEIGHT = letter
+FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+SIGNATURE_LINE_Y = 2 * inch
+INVOICE_TABLE_Y = HEIGHT - 3 * inch
+INVOICE_TOTAL_Y = INVOICE_TABLE_Y - 1 * inch
+STATEMENT_TABLE_Y = HEIGHT - 3 * inch
+STATEMENT_ROW_HEIGHT = 0.25 * inch
+STATEMENT_BOTTOM_MARGIN = 1.5 * inch
+
+
+# --- Page Templates ---
+# The static parts of each page are built once per process as a flat list of drawing operations:
+# ("font", name, size), ("text", x, y, string) or ("line", x1, y1, x2, y2).
+@lru_cache(maxsize=None)
+def get_template(name: str) -> tuple:
+    if name == "prescription":
+        return (
+            ("font", "Helvetica-Bold", 12),
+            ("text", inch, HEIGHT - 2 * inch, "Patient Information:"),
+            ("font", "Helvetica-Bold", 24),
+            ("text", inch, HEIGHT - 3 * inch, "Rx"),
+            ("line", inch, HEIGHT - 3 * inch - 0.1 * inch, WIDTH - inch, HEIGHT - 3 * inch - 0.1 * inch),
+            ("font", "Helvetica", 12),
+            ("line", WIDTH - 3.5 * inch, SIGNATURE_LINE_Y, WIDTH - inch, SIGNATURE_LINE_Y),
+            ("text", WIDTH - 3.5 * inch, SIGNATURE_LINE_Y - 0.2 * inch, "Electronic Signature"),
+        )
+    if name == "invoice":
+        return (
+            ("font", "Helvetica-Bold", 20),
+            ("text", inch, HEIGHT - inch, "INVOICE"),
+            ("font", "Helvetica", 12),
+            ("text", inch, HEIGHT - 2 * inch, "Billed To:"),
+            ("font", "Helvetica-Bold", 12),
+            ("text", inch, INVOICE_TABLE_Y, "Description"),
+            ("text", WIDTH - 2.5 * inch, INVOICE_TABLE_Y, "Amount"),
+            ("line", inch, INVOICE_TABLE_Y - 0.1 * inch, WIDTH - inch, INVOICE_TABLE_Y - 0.1 * inch),
+            ("line", WIDTH - 3 * inch, INVOICE_TOTAL_Y, WIDTH - inch, INVOICE_TOTAL_Y),
+            ("font", "Helvetica-Bold", 14),
+            ("text", WIDTH - 3 * inch, INVOICE_TOTAL_Y + 0.1 * inch, "Total:"),
+            ("font", "Helvetica-Oblique", 10),
+            ("text", inch, 1.5 * inch, "Thank you for your business!"),
+            ("text", inch, 1.3 * inch, "If you have any questions, please contact support@dortmed.com."),
+        )
+    if name == "statement":
+        return (
+            ("font", "Helvetica-Bold", 20),
+            ("text", inch, HEIGHT - inch, "STATEMENT"),
+            ("font", "Helvetica", 12),
+            ("text", inch, HEIGHT - 2 * inch, "Account:"),
+            ("font", "Helvetica-Bold", 12),
+            ("text", inch, STATEMENT_TABLE_Y, "Date"),
+            ("text", 2.3 * inch, STATEMENT_TABLE_Y, "Description"),
+            ("text", WIDTH - 2.5 * inch, STATEMENT_TABLE_Y, "Amount"),
+            ("line", inch, STATEMENT_TABLE_Y - 0.1 * inch, WIDTH - inch, STATEMENT_TABLE_Y - 0.1 * inch),
+            ("font", "Helvetica-Oblique", 10),
+            ("text", inch, 1.3 * inch, "If you have any questions, please contact support@dortmed.com."),
+        )
+    raise ValueError(f"Unknown PDF template: {name}")
+
+
+def draw_template(p: canvas.Canvas, name: str):
+    for op in get_template(name):
+        if op[0] == "font":
+            p.setFont(op[1], op[2])
+        elif op[0] == "text":
+            p.drawString(op[1], op[2], op[3])
+        else:
+            p.line(*op[1:])
+
+
+def new_canvas(buffer: io.BytesIO) -> canvas.Canvas:
+    return canvas.Canvas(buffer, pagesize=letter)
+
+
+def finish(p: canvas.Canvas, buffer: io.BytesIO) -> bytes:
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+# --- Renderers ---
+def render_prescription_pdf(context: dict) -> bytes:
+    """Renders a prescription from the dict built by `prescription_pdf_context`."""
+    buffer = io.BytesIO()
+    p = new_canvas(buffer)
+    draw_template(p, "prescription")
+
+    # Header
+    p.setFont("Helvetica-Bold", 16)
+    p.drawString(inch, HEIGHT - inch, context["physician_name"])
+    p.setFont("Helvetica", 12)
+    p.drawString(inch, HEIGHT - inch - 0.2 * inch, context["specialty"])
+
+    # Patient Information
+    p.drawString(inch, HEIGHT - 2 * inch - 0.25 * inch, f"Name: {context['patient_name']}")
+    p.drawString(inch, HEIGHT - 2 * inch - 0.5 * inch, f"Date of Birth: {context['date_of_birth']}")
+
+    # Prescription Details (Rx)
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(inch, HEIGHT - 3.5 * inch, context["medication"])
+    p.setFont("Helvetica", 12)
+    p.drawString(inch, HEIGHT - 3.8 * inch, f"Dosage: {context['dosage']}")
+    p.drawString(inch, HEIGHT - 4.1 * inch, f"Frequency: {context['frequency']}")
+    p.drawString(inch, HEIGHT - 4.4 * inch, f"Duration: {context['duration']}")
+    if context.get("notes"):
+        p.drawString(inch, HEIGHT - 4.7 * inch, f"Notes: {context['notes']}")
+
+    # Footer date
+    p.drawString(inch, SIGNATURE_LINE_Y, f"Date: {context['date']}")
+    return finish(p, buffer)
+
+
+def render_invoice_pdf(context: dict) -> bytes:
+    """Renders a subscription invoice from the dict built by `invoice_pdf_context`."""
+    buffer = io.BytesIO()
+    p = new_canvas(buffer)
+    draw_template(p, "invoice")
+
+    # Header
+    p.setFont("Helvetica", 12)
+    p.drawString(WIDTH - 3 * inch, HEIGHT - inch, f"Invoice #: {context['invoice_number']}")
+    p.drawString(WIDTH - 3 * inch, HEIGHT - inch - 0.2 * inch, f"Date: {context['date']}")
+
+    # Billed To
+    p.drawString(inch, HEIGHT - 2 * inch - 0.2 * inch, context["billed_to"])
+
+    # Line Item
+    amount = f"{context['currency']} {context['amount']:.2f}"
+    p.drawString(inch, INVOICE_TABLE_Y - 0.3 * inch, context["description"])
+    p.drawString(WIDTH - 2.5 * inch, INVOICE_TABLE_Y - 0.3 * inch, amount)
+
+    # Total
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(WIDTH - 2.5 * inch, INVOICE_TOTAL_Y + 0.1 * inch, amount)
+    return finish(p, buffer)
+
+
+def render_statement_pdf(context: dict) -> bytes:
+    """
+    Renders a periodic account statement from the dict built by `statement_pdf_context`.
+    Line items continue on new pages when they run past the bottom margin.
+    """
+    buffer = io.BytesIO()
+    p = new_canvas(buffer)
+
+    def start_page():
+        draw_template(p, "statement")
+        p.setFont("Helvetica", 12)
+        p.drawString(WIDTH - 3.5 * inch, HEIGHT - inch, f"Period: {context['period']}")
+        p.drawString(inch, HEIGHT - 2 * inch - 0.2 * inch, context["billed_to"])
+        return STATEMENT_TABLE_Y - 0.3 * inch
+
+    y = start_page()
+    for item in context["items"]:
+        if y < STATEMENT_BOTTOM_MARGIN:
+            p.showPage()
+            y = start_page()
+        p.drawString(inch, y, item["date"])
+        p.drawString(2.3 * inch, y, item["description"])
+        p.drawString(WIDTH - 2.5 * inch, y, f"{item['currency']} {item['amount']:.2f}")
+        y -= STATEMENT_ROW_HEIGHT
+
+    # Totals, one line per currency
+    if y - STATEMENT_ROW_HEIGHT * (len(context["totals"]) + 1) < STATEMENT_BOTTOM_MARGIN:
+        p.showPage()
+        y = start_page()
+    y -= STATEMENT_ROW_HEIGHT
+    p.line(WIDTH - 3 * inch, y + STATEMENT_ROW_HEIGHT * 0.6, WIDTH - inch, y + STATEMENT_ROW_HEIGHT * 0.6)
+    p.setFont("Helvetica-Bold", 14)
+    for currency, total in sorted(context["totals"].items()):
+        p.drawString(WIDTH - 3.5 * inch, y, "Total:")
+        p.drawString(WIDTH - 2.5 * inch, y, f"{currency} {total:.2f}")
+        y -= STATEMENT_ROW_HEIGHT
+    return finish(p, buffer)
+
+
+RENDERERS = {
+    "prescription": render_prescription_pdf,
+    "invoice": render_invoice_pdf,
+    "statement": render_statement_pdf,
+}
+
+
+def render(kind: str, context: dict) -> bytes:
+    return RENDERERS[kind](context)
+
+
+def init_worker():
+    """Process pool initializer: loads font metrics and builds the page templates up front."""
+    for font_name in FONTS:
+        pdfmetrics.getFont(font_name)
+    for template_name in RENDERERS:
+        get_template(template_name)
@@ -12,7 +12,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from main import (
     Appointment, User, NotificationService, get_db, AppSettings,
-    Subscription, FCMDevice, Base
+    Subscription, FCMDevice, Base, track_queries, reconcile_platform_counters, archive_audit_logs
 )
 
 # Load settings to get the database URL
@@ -31,8 +31,52 @@ notification_service = NotificationService()
 def send_appointment_reminders():
     """
     This is the main function that will be run on a schedule.
-    It finds upcoming appointments and sends reminders.
+    It finds upcoming appointments and sends reminders, reporting the SQL
+    activity of the run so per-row query patterns are easy to spot.
+    """
+    with track_queries() as query_stats:
+        _send_appointment_reminders()
+    print(f"Reminder job issued {query_stats.count} queries in {query_stats.total_time:.4f}s.")
+    for fingerprint, count in query_stats.repeated_statements(settings.SQL_REPEATED_STATEMENT_THRESHOLD)[:3]:
+        print(f"  Repeated {count}x: {fingerprint[:200]}")
+
+
+def reconcile_kpi_counters():
+    """
+    Recomputes the admin dashboard KPI counters from the source tables and corrects any drift
+    left by writes that bypassed the ORM (raw SQL, manual fixes, failed deployments).
+    """
+    db = SessionLocal()
+    try:
+        drift = reconcile_platform_counters(db)
+        if drift:
+            print(f"[{datetime.now()}] KPI counters corrected: {drift}")
+        else:
+            print(f"[{datetime.now()}] KPI counters are consistent.")
+    finally:
+        db.close()
+
+
+def archive_old_audit_logs():
+    """
+    Moves audit log months older than AUDIT_RETENTION_MONTHS into compressed NDJSON files,
+    keeping the audit_logs table (and its indexes) bounded to the retention window.
     """
+    db = SessionLocal()
+    try:
+        archives = archive_audit_logs(db)
+        for archive in archives:
+            print(f"[{datetime.now()}] Archived {archive.row_count} audit logs for {archive.month:%Y-%m} "
+                  f"to {archive.file_path}.")
+        if not archives:
+            print(f"[{datetime.now()}] No audit logs past the retention window.")
+    except Exception as e:
+        print(f"An error occurred during the audit archival job: {e}")
+    finally:
+        db.close()
+
+
+def _send_appointment_reminders():
     db = SessionLocal()
     print(f"[{datetime.now()}] Running appointment reminder job...")
 
@@ -110,6 +154,12 @@ if __name__ == "__main__":
     # Schedule the job to run once every hour, at the start of the hour.
     scheduler.add_job(send_appointment_reminders, 'cron', hour='*')
 
+    # Reconcile the dashboard KPI counters once a day, off-peak.
+    scheduler.add_job(reconcile_kpi_counters, 'cron', hour=3, minute=30)
+
+    # Archive audit logs that have aged out of the retention window, early on the first of each month.
+    scheduler.add_job(archive_old_audit_logs, 'cron', day=1, hour=4)
+
     # You could also run it more frequently, e.g., every 5 minutes:
     # scheduler.add_job(send_appointment_reminders, 'interval', minutes=5)
 
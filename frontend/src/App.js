@@ -16,6 +16,7 @@ const FeaturesPage = lazy(() => import('./pages/public/FeaturesPage'));
 const PricingPage = lazy(() => import('./pages/public/PricingPage'));
 const GlobalNetworkPage = lazy(() => import('./pages/public/GlobalNetworkPage'));
 const BlogPage = lazy(() => import('./pages/public/BlogPage'));
+const BlogPostPage = lazy(() => import('./pages/public/BlogPostPage'));
 const ContactPage = lazy(() => import('./pages/public/ContactPage'));
 const CareersPage = lazy(() => import('./pages/public/CareersPage'));
 const PressPage = lazy(() => import('./pages/public/PressPage'));
@@ -105,6 +106,7 @@ function App() {
                   <Route path="/pricing" element={<PricingPage />} />
                   <Route path="/network" element={<GlobalNetworkPage />} />
                   <Route path="/blog" element={<BlogPage />} />
+                  <Route path="/blog/:postId" element={<BlogPostPage />} />
                   <Route path="/contact" element={<ContactPage />} />
 
 
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import toast from 'react-hot-toast';
 import { adminService } from '../../services/api';
 import AnimatedWrapper from '../../components/common/AnimatedWrapper';
+import Button from '../../components/common/Button';
 
 const LogEntry = ({ log }) => {
     const statusColor = log.status === 'SUCCESS' ? 'text-green-500' : 'text-red-500';
@@ -25,29 +26,37 @@ const LogEntry = ({ log }) => {
 
 const AuditTrailPage = () => {
     const [logs, setLogs] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [filters, setFilters] = useState({ user_id: '', action: '' });
 
-    useEffect(() => {
-        const fetchLogs = async () => {
-            setLoading(true);
-            try {
-                const params = {
-                    user_id: filters.user_id || undefined,
-                    action: filters.action || undefined,
-                    limit: 200,
-                };
-                const response = await adminService.getAuditLogs(params);
-                setLogs(response.data);
-            } catch (error) {
-                toast.error("Could not fetch audit logs.");
-            } finally {
-                setLoading(false);
-            }
+    const fetchLogs = async (cursor) => {
+        const params = {
+            user_id: filters.user_id || undefined,
+            action: filters.action || undefined,
+            limit: 200,
+            cursor: cursor || undefined,
         };
-        fetchLogs();
+        const response = await adminService.getAuditLogs(params);
+        setLogs(prev => cursor ? [...prev, ...response.data.items] : response.data.items);
+        setNextCursor(response.data.next_cursor);
+    };
+
+    useEffect(() => {
+        setLoading(true);
+        fetchLogs(null)
+            .catch(() => toast.error("Could not fetch audit logs."))
+            .finally(() => setLoading(false));
     }, [filters]);
 
+    const handleLoadMore = () => {
+        setLoadingMore(true);
+        fetchLogs(nextCursor)
+            .catch(() => toast.error("Could not fetch more audit logs."))
+            .finally(() => setLoadingMore(false));
+    };
+
     const handleFilterChange = (e) => {
         setFilters(prev => ({ ...prev, [e.target.name]: e.target.value }));
     };
@@ -98,6 +107,14 @@ const AuditTrailPage = () => {
                     </table>
                 </div>
             </div>
+
+            {!loading && nextCursor && (
+                <div className="flex justify-center mt-6">
+                    <Button variant="secondary" isLoading={loadingMore} onClick={handleLoadMore}>
+                        Load older entries
+                    </Button>
+                </div>
+            )}
         </AnimatedWrapper>
     );
 };
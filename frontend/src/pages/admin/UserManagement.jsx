@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback, useMemo } from 'react';
+import React, { useState, useEffect, useCallback, useMemo, useRef } from 'react';
 import { adminService } from '../../services/api';
 import toast from 'react-hot-toast';
 import AnimatedWrapper from '../../components/common/AnimatedWrapper';
@@ -86,6 +86,8 @@ const UserManagement = () => {
     const [selectedUser, setSelectedUser] = useState(null);
 
     const debouncedSearch = useDebounce(filters.search, 500); // 500ms delay
+    // Keyset cursors by page number, so paging forward never asks the server for a deep offset
+    const pageCursors = useRef({});
 
     const fetchUsers = useCallback(async (appliedFilters) => {
         setLoading(true);
@@ -94,9 +96,11 @@ const UserManagement = () => {
                 page: appliedFilters.page,
                 size: appliedFilters.size,
                 role: appliedFilters.role || undefined,
-                search: appliedFilters.search || undefined, // Add search to backend if supported
+                search: appliedFilters.search || undefined, // Email prefix
+                cursor: pageCursors.current[appliedFilters.page],
             };
             const response = await adminService.listUsers(params);
+            pageCursors.current[appliedFilters.page + 1] = response.data.next_cursor || undefined;
             setUsers(response.data.items);
             setPagination({
                 total: response.data.total,
@@ -111,6 +115,11 @@ const UserManagement = () => {
         }
     }, []);
 
+    useEffect(() => {
+        // Cursors belong to one filter combination
+        pageCursors.current = {};
+    }, [filters.role, debouncedSearch]);
+
     useEffect(() => {
         // Trigger fetch when page, role, or debounced search term changes
         fetchUsers({ ...filters, search: debouncedSearch });
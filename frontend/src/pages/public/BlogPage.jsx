@@ -9,7 +9,7 @@ const BlogCard = ({ post }) => (
     <Link to={`/blog/${post.id}`} className="block group">
         <div className="bg-white dark:bg-gray-800 p-6 rounded-lg shadow-lg hover:shadow-xl transition-shadow duration-300">
             <h2 className="text-xl font-bold text-dortmed-700 dark:text-dortmed-300 group-hover:underline">{post.title}</h2>
-            <p className="mt-4 text-gray-600 dark:text-gray-400 line-clamp-3">{post.content}</p>
+            <p className="mt-4 text-gray-600 dark:text-gray-400 line-clamp-3">{post.excerpt}</p>
             <span className="mt-4 inline-block text-sm font-semibold text-dortmed-600">Read More &rarr;</span>
         </div>
     </Link>
@@ -17,14 +17,17 @@ const BlogCard = ({ post }) => (
 
 const BlogPage = () => {
     const [posts, setPosts] = useState([]);
+    const [page, setPage] = useState(1);
+    const [pages, setPages] = useState(0);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
         const fetchPosts = async () => {
             setLoading(true);
             try {
-                const response = await blogService.getPublicPosts(); // Use the new public blog service
-                setPosts(response.data);
+                const response = await blogService.getPublicPosts({ page, size: 12 }); // Summaries only
+                setPosts(response.data.items);
+                setPages(response.data.pages);
             } catch (error) {
                 toast.error("Could not load health articles.");
             } finally {
@@ -32,7 +35,7 @@ const BlogPage = () => {
             }
         };
         fetchPosts();
-    }, []);
+    }, [page]);
 
     return (
         <AnimatedWrapper>
@@ -48,6 +51,20 @@ const BlogPage = () => {
                     <div className="mt-16 grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
                         {loading ? <p>Loading articles...</p> : posts.map(post => <BlogCard key={post.id} post={post} />)}
                     </div>
+
+                    {pages > 1 && (
+                        <div className="mt-12 flex justify-center items-center space-x-4">
+                            <button onClick={() => setPage(p => p - 1)} disabled={page <= 1 || loading}
+                                    className="px-4 py-2 rounded-md bg-white dark:bg-gray-700 shadow disabled:opacity-50">
+                                &larr; Newer
+                            </button>
+                            <span className="text-sm text-gray-600 dark:text-gray-400">Page {page} of {pages}</span>
+                            <button onClick={() => setPage(p => p + 1)} disabled={page >= pages || loading}
+                                    className="px-4 py-2 rounded-md bg-white dark:bg-gray-700 shadow disabled:opacity-50">
+                                Older &rarr;
+                            </button>
+                        </div>
+                    )}
                 </div>
             </div>
         </AnimatedWrapper>
@@ -0,0 +1,51 @@
+import React, { useState, useEffect } from 'react';
+import { Link, useParams } from 'react-router-dom';
+import toast from 'react-hot-toast';
+import AnimatedWrapper from '../../components/common/AnimatedWrapper';
+import { blogService } from '../../services/api';
+
+const BlogPostPage = () => {
+    const { postId } = useParams();
+    const [post, setPost] = useState(null);
+    const [loading, setLoading] = useState(true);
+
+    useEffect(() => {
+        const fetchPost = async () => {
+            setLoading(true);
+            try {
+                const response = await blogService.getPublicPost(postId);
+                setPost(response.data);
+            } catch (error) {
+                toast.error("Could not load this article.");
+            } finally {
+                setLoading(false);
+            }
+        };
+        fetchPost();
+    }, [postId]);
+
+    return (
+        <AnimatedWrapper>
+            <div className="py-20 bg-gray-50 dark:bg-gray-800">
+                <div className="container mx-auto px-6 max-w-3xl">
+                    <Link to="/blog" className="text-sm font-semibold text-dortmed-600 hover:underline">&larr; Back to Health Hub</Link>
+                    {loading ? (
+                        <p className="mt-8">Loading article...</p>
+                    ) : post ? (
+                        <article className="mt-8 bg-white dark:bg-gray-900 p-8 rounded-lg shadow-lg">
+                            <h1 className="text-3xl font-extrabold text-gray-900 dark:text-white">{post.title}</h1>
+                            <p className="mt-2 text-sm text-gray-500">
+                                {post.author_email} &middot; {new Date(post.created_at).toLocaleDateString()}
+                            </p>
+                            <div className="mt-8 text-gray-700 dark:text-gray-300 whitespace-pre-line">{post.content}</div>
+                        </article>
+                    ) : (
+                        <p className="mt-8">Article not found.</p>
+                    )}
+                </div>
+            </div>
+        </AnimatedWrapper>
+    );
+};
+
+export default BlogPostPage;
\ No newline at end of file
@@ -51,8 +51,9 @@ export const patientService = {
     }),
     getDashboardSummary: () => api.get('/patient/dashboard-summary'),
     submitFeedback: (appointmentId, data) => api.post(`/patient/appointments/${appointmentId}/feedback`, data),
-    getVitals: (vitalType) => api.get(`/patient/vitals/${vitalType}`),
+    getVitals: (vitalType, params) => api.get(`/patient/vitals/${vitalType}`, { params }),
     recordVital: (data) => api.post('/patient/vitals', data),
+    recordVitalsBatch: (points) => api.post('/patient/vitals/batch', { points }),
 };
 export const physicianService = {
     getProfile: () => api.get('/physician/profile'),
@@ -105,7 +106,8 @@ export const settingsService = {
 
 export const chatService = {
   getConversations: () => api.get('/chat/conversations'),
-  getMessages: (conversationId) => api.get(`/chat/conversations/${conversationId}/messages`),
+  getMessages: (conversationId, params) => api.get(`/chat/conversations/${conversationId}/messages`, { params }),
+  markRead: (conversationId, upToMessageId) => api.post(`/chat/conversations/${conversationId}/read`, { up_to_message_id: upToMessageId }),
 };
 export const hospitalService = {
   search: (query) => api.get('/hospitals/search', { params: { query } }),
@@ -125,7 +127,8 @@ export const adminCmsService = {
     deletePost: (id) => api.delete(`/admin/cms/posts/${id}`),
 };
 export const blogService = {
-    getPublicPosts: () => api.get('/blog/posts'),
+    getPublicPosts: (params) => api.get('/blog/posts', { params }),
+    getPublicPost: (id) => api.get(`/blog/posts/${id}`),
 };
 export const systemService = {
     getHealth: () => api.get('/health'),
@@ -1,8 +1,13 @@
 import pytesseract
+import asyncio
+import os
 import re
 import io
+import time
 from PIL import Image
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from prometheus_client import CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess, CONTENT_TYPE_LATEST
 
 app = FastAPI(
     title="DortMed OCR Service",
@@ -10,6 +15,48 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Tesseract is CPU bound, so only a bounded number of images are processed at once;
+# the rest wait their turn and show up as queue depth.
+OCR_MAX_CONCURRENCY = int(os.getenv("OCR_MAX_CONCURRENCY", os.cpu_count() or 1))
+ocr_slots = asyncio.Semaphore(OCR_MAX_CONCURRENCY)
+
+# --- Prometheus Metrics ---
+HTTP_REQUEST_LATENCY = Histogram(
+    "ocr_http_request_duration_seconds", "HTTP request latency by route template.", ["method", "route", "status"])
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "ocr_http_requests_in_progress", "HTTP requests currently being served.", ["method"],
+    multiprocess_mode="livesum")
+OCR_QUEUE_DEPTH = Gauge("ocr_queue_depth", "Images waiting for a free OCR slot.", multiprocess_mode="livesum")
+OCR_PROCESSING_LATENCY = Histogram(
+    "ocr_processing_duration_seconds", "Time spent preprocessing and running Tesseract on an image.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    HTTP_REQUESTS_IN_PROGRESS.labels(method=request.method).inc()
+    start_time = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=request.method).dec()
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_LATENCY.labels(method=request.method, route=route, status=str(status_code)).observe(
+            time.perf_counter() - start_time)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint. Aggregates every gunicorn worker when PROMETHEUS_MULTIPROC_DIR is set."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 
 # --- OCR Processing and Parsing Logic ---
 
@@ -23,6 +70,16 @@ def preprocess_image(image_bytes: bytes) -> Image:
     return image
 
 
+def run_ocr(image_bytes: bytes) -> str:
+    """Preprocesses the image and runs Tesseract on it. Blocking; call from a worker thread."""
+    # 1. Preprocess the image for better accuracy
+    processed_image = preprocess_image(image_bytes)
+
+    # 2. Perform OCR using Tesseract
+    # The `config` parameter can be used to improve accuracy, e.g., by specifying language or page segmentation mode.
+    return pytesseract.image_to_string(processed_image)
+
+
 def extract_structured_data(text: str) -> dict:
     """
     Uses regular expressions and keyword matching to find common lab results.
@@ -68,12 +125,17 @@ async def process_lab_result(file: UploadFile = File(...)):
     image_bytes = await file.read()
 
     try:
-        # 1. Preprocess the image for better accuracy
-        processed_image = preprocess_image(image_bytes)
-
-        # 2. Perform OCR using Tesseract
-        # The `config` parameter can be used to improve accuracy, e.g., by specifying language or page segmentation mode.
-        extracted_text = pytesseract.image_to_string(processed_image)
+        OCR_QUEUE_DEPTH.inc()
+        try:
+            await ocr_slots.acquire()
+        finally:
+            OCR_QUEUE_DEPTH.dec()
+        try:
+            # 1 & 2. Preprocess the image and perform OCR off the event loop.
+            with OCR_PROCESSING_LATENCY.time():
+                extracted_text = await run_in_threadpool(run_ocr, image_bytes)
+        finally:
+            ocr_slots.release()
 
         # 3. Parse the raw text to find structured data
         structured_data = extract_structured_data(extracted_text)